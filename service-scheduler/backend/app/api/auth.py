@@ -5,8 +5,12 @@ from sqlalchemy import select
 from datetime import timedelta
 from app.database import get_db
 from app.models.user import User
-from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
-from app.auth.security import verify_password, get_password_hash, create_access_token, create_token_payload
+from app.schemas.user import UserCreate, UserResponse, UserLogin, Token, RefreshRequest
+from app.auth.security import verify_password_async, get_password_hash_async, create_access_token, create_token_payload
+from app.services.refresh_tokens import (
+    issue_refresh_token, purge_refresh_tokens, rotate_refresh_token, revoke_refresh_token
+)
+from app.tasks import post_commit
 from app.config import settings
 import logging
 
@@ -14,6 +18,35 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
+async def issue_tokens(db: AsyncSession, user: User) -> Token:
+    """Issue an access token and a new refresh token, and commit the latter.
+
+    The user's expired refresh tokens are purged on the post-commit queue.
+    """
+    access_token_expires = timedelta(minutes=settings.jwt_access_token_expire_minutes)
+    token_payload = create_token_payload(
+        user_id=str(user.id),
+        email=user.email,
+        role=user.role.value
+    )
+    access_token = create_access_token(
+        data=token_payload,
+        expires_delta=access_token_expires
+    )
+    refresh_token = await issue_refresh_token(db, user.id)
+    await db.commit()
+    
+    await post_commit.enqueue(purge_refresh_tokens, user.id)
+    
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        expires_in=settings.jwt_access_token_expire_minutes * 60,
+        refresh_token=refresh_token,
+        user=UserResponse.model_validate(user)
+    )
+
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
@@ -34,7 +67,7 @@ async def register(
             )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         
         new_user = User(
             email=user_data.email,
@@ -76,7 +109,7 @@ async def login(
         user = result.scalar_one_or_none()
         
         # Verify user and password
-        if not user or not verify_password(user_credentials.password, user.password_hash):
+        if not user or not await verify_password_async(user_credentials.password, user.password_hash):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
@@ -89,31 +122,17 @@ async def login(
                 detail="Inactive user"
             )
         
-        # Create access token
-        access_token_expires = timedelta(minutes=settings.jwt_access_token_expire_minutes)
-        token_payload = create_token_payload(
-            user_id=str(user.id),
-            email=user.email,
-            role=user.role.value
-        )
-        access_token = create_access_token(
-            data=token_payload,
-            expires_delta=access_token_expires
-        )
+        token = await issue_tokens(db, user)
         
         logger.info(f"User logged in: {user.email}")
         
-        return Token(
-            access_token=access_token,
-            token_type="bearer",
-            expires_in=settings.jwt_access_token_expire_minutes * 60,
-            user=UserResponse.model_validate(user)
-        )
+        return token
         
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Login error: {e}")
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Authentication failed"
@@ -128,3 +147,54 @@ async def login_for_access_token(
     """OAuth2 compatible token endpoint."""
     user_credentials = UserLogin(email=form_data.username, password=form_data.password)
     return await login(user_credentials, db)
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(
+    refresh_data: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Exchange a refresh token for a new access token and refresh token."""
+    try:
+        # One indexed statement; no password hashing
+        user = await rotate_refresh_token(db, refresh_data.refresh_token)
+        
+        if not user or not user.is_active:
+            # Keep the consumed token (or a reuse revocation) either way
+            await db.commit()
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        return await issue_tokens(db, user)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Token refresh error: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Token refresh failed"
+        )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    refresh_data: RefreshRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """Revoke a refresh token so it can no longer be exchanged."""
+    try:
+        await revoke_refresh_token(db, refresh_data.refresh_token)
+        await db.commit()
+        
+    except Exception as e:
+        logger.error(f"Logout error: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Logout failed"
+        )
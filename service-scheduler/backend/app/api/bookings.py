@@ -1,19 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, delete
-from sqlalchemy.orm import selectinload
-from typing import List
+from sqlalchemy import select, delete
+from pydantic import TypeAdapter
+from typing import List, Optional
 from app.database import get_db
 from app.models.user import User
-from app.models.slot import Slot
 from app.models.booking import Booking, BookingStatus
-from app.schemas.booking import BookingCreate, BookingResponse, BookingWithDetails
-from app.auth.dependencies import get_current_active_user, get_current_admin_user
+from app.schemas.booking import (
+    BookingCreate, BookingResponse, BookingWithDetails, BulkBookingCreate, BulkBookingItem, BulkBookingResult
+)
+from app.schemas.slot import SlotResponse
+from app.schemas.user import UserResponse
+from app.auth.dependencies import get_current_active_user, get_current_admin_user, get_read_db
+from app.pagination import NEXT_CURSOR_HEADER, keyset_condition, next_cursor
+from app.cache.slots import invalidate_slot_cache
+from app.services.booking_claims import (
+    ClaimFailure, claim_slot, claim_slots, diagnose_claim_failure, release_booking
+)
+from app.services.projections import booking_with_details_query, build_models
+from app.services.waitlist import waitlist_promoter
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
+CLAIM_FAILURE_DETAILS = {
+    ClaimFailure.SLOT_NOT_FOUND: "Slot not found",
+    ClaimFailure.SLOT_UNAVAILABLE: "Slot is not available",
+    ClaimFailure.ALREADY_BOOKED: "You already have an active booking for this slot",
+}
+
+booking_list_adapter = TypeAdapter(List[BookingWithDetails])
+
+# Nested models filled from the "slot__" and "user__" columns of booking_with_details_query
+BOOKING_DETAIL_MODELS = {"slot": SlotResponse, "user": UserResponse}
+
+
+def booking_page_response(rows: list, limit: int) -> Response:
+    """Serialize a page of projected booking rows straight to JSON."""
+    body = booking_list_adapter.dump_json(
+        build_models(BookingWithDetails, rows, BOOKING_DETAIL_MODELS)
+    )
+    cursor_token = next_cursor(rows, limit, "booked_at")
+    headers = {NEXT_CURSOR_HEADER: cursor_token} if cursor_token else None
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
 async def create_booking(
@@ -23,52 +54,37 @@ async def create_booking(
 ):
     """Create a new booking (claim a slot)."""
     try:
-        # Check if slot exists and is available
-        result = await db.execute(
-            select(Slot).where(Slot.id == booking_data.slot_id)
+        new_booking = await claim_slot(
+            db,
+            slot_id=booking_data.slot_id,
+            user_id=current_user.id,
+            notes=booking_data.notes
         )
-        slot = result.scalar_one_or_none()
-        
-        if not slot:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Slot not found"
-            )
-        
-        if not slot.is_available or slot.is_full:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Slot is not available"
-            )
         
-        # Check if user already has a booking for this slot
-        result = await db.execute(
-            select(Booking).where(
-                and_(
-                    Booking.slot_id == booking_data.slot_id,
-                    Booking.user_id == current_user.id,
-                    Booking.status == BookingStatus.ACTIVE
+        if new_booking is None:
+            failure = await diagnose_claim_failure(db, booking_data.slot_id, current_user.id)
+            await db.rollback()
+            
+            if failure == ClaimFailure.SLOT_NOT_FOUND:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Slot not found"
                 )
-            )
-        )
-        existing_booking = result.scalar_one_or_none()
-        
-        if existing_booking:
+            
+            if failure == ClaimFailure.ALREADY_BOOKED:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="You already have an active booking for this slot"
+                )
+            
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="You already have an active booking for this slot"
+                detail="Slot is not available"
             )
         
-        # Create new booking
-        new_booking = Booking(
-            slot_id=booking_data.slot_id,
-            user_id=current_user.id,
-            notes=booking_data.notes
-        )
-        
-        db.add(new_booking)
         await db.commit()
-        await db.refresh(new_booking)
+        
+        await invalidate_slot_cache()
         
         logger.info(f"New booking created by {current_user.email}: {new_booking.id}")
         return new_booking
@@ -84,30 +100,99 @@ async def create_booking(
         )
 
 
+@router.post("/bulk", response_model=BulkBookingResult)
+async def create_bookings_bulk(
+    booking_data: BulkBookingCreate,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Book several slots in one transaction, reporting the outcome per slot."""
+    slot_ids = list(dict.fromkeys(booking_data.slot_ids))
+    try:
+        outcomes = await claim_slots(
+            db,
+            slot_ids=slot_ids,
+            user_id=current_user.id,
+            notes=booking_data.notes,
+            all_or_nothing=booking_data.all_or_nothing
+        )
+        
+        failed = any(isinstance(outcome, ClaimFailure) for outcome in outcomes.values())
+        committed = not (booking_data.all_or_nothing and failed)
+        if committed:
+            await db.commit()
+            # Failed claims are outcomes too; they changed nothing
+            if any(isinstance(outcome, Booking) for outcome in outcomes.values()):
+                await invalidate_slot_cache()
+        else:
+            await db.rollback()
+        
+        results = []
+        for slot_id in slot_ids:
+            outcome = outcomes.get(slot_id)
+            if isinstance(outcome, Booking) and committed:
+                results.append(BulkBookingItem(
+                    slot_id=slot_id,
+                    booked=True,
+                    booking=BookingResponse.model_validate(outcome)
+                ))
+            elif isinstance(outcome, ClaimFailure):
+                results.append(BulkBookingItem(
+                    slot_id=slot_id,
+                    booked=False,
+                    detail=CLAIM_FAILURE_DETAILS[outcome]
+                ))
+            else:
+                results.append(BulkBookingItem(
+                    slot_id=slot_id,
+                    booked=False,
+                    detail="Not booked because another slot could not be booked"
+                ))
+        
+        booked = sum(1 for item in results if item.booked)
+        logger.info(f"Bulk booking by {current_user.email}: {booked} of {len(slot_ids)} slots booked")
+        
+        return BulkBookingResult(
+            booked=booked,
+            failed=len(results) - booked,
+            results=results
+        )
+        
+    except Exception as e:
+        logger.error(f"Bulk booking error: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Bulk booking failed"
+        )
+
+
 @router.get("/my", response_model=List[BookingWithDetails])
 async def get_my_bookings(
     skip: int = Query(0, ge=0, description="Number of bookings to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of bookings to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; replaces skip"),
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get current user's bookings."""
     try:
-        result = await db.execute(
-            select(Booking)
-            .options(
-                selectinload(Booking.slot).selectinload(Slot.creator),
-                selectinload(Booking.user)
-            )
+        query = (
+            booking_with_details_query()
             .where(Booking.user_id == current_user.id)
-            .order_by(Booking.booked_at.desc())
-            .offset(skip)
+            .order_by(Booking.booked_at.desc(), Booking.id.desc())
             .limit(limit)
         )
-        bookings = result.scalars().all()
+        if cursor:
+            query = query.where(keyset_condition(Booking.booked_at, Booking.id, cursor, descending=True))
+        else:
+            query = query.offset(skip)
         
-        return bookings
+        result = await db.execute(query)
+        return booking_page_response(result.all(), limit)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting user bookings: {e}")
         raise HTTPException(
@@ -120,25 +205,27 @@ async def get_my_bookings(
 async def get_all_bookings(
     skip: int = Query(0, ge=0, description="Number of bookings to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of bookings to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; replaces skip"),
     current_user: User = Depends(get_current_admin_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get all bookings (Admin only)."""
     try:
-        result = await db.execute(
-            select(Booking)
-            .options(
-                selectinload(Booking.slot).selectinload(Slot.creator),
-                selectinload(Booking.user)
-            )
-            .order_by(Booking.booked_at.desc())
-            .offset(skip)
+        query = (
+            booking_with_details_query()
+            .order_by(Booking.booked_at.desc(), Booking.id.desc())
             .limit(limit)
         )
-        bookings = result.scalars().all()
+        if cursor:
+            query = query.where(keyset_condition(Booking.booked_at, Booking.id, cursor, descending=True))
+        else:
+            query = query.offset(skip)
         
-        return bookings
+        result = await db.execute(query)
+        return booking_page_response(result.all(), limit)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting all bookings: {e}")
         raise HTTPException(
@@ -151,34 +238,30 @@ async def get_all_bookings(
 async def get_booking(
     booking_id: str,
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific booking by ID."""
     try:
+        # Booking, slot and user come back together in one round trip
         result = await db.execute(
-            select(Booking)
-            .options(
-                selectinload(Booking.slot).selectinload(Slot.creator),
-                selectinload(Booking.user)
-            )
-            .where(Booking.id == booking_id)
+            booking_with_details_query().where(Booking.id == booking_id)
         )
-        booking = result.scalar_one_or_none()
+        row = result.one_or_none()
         
-        if not booking:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Booking not found"
             )
         
         # Check permissions
-        if current_user.role.value != "admin" and booking.user_id != current_user.id:
+        if current_user.role.value != "admin" and row.user_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions"
             )
         
-        return booking
+        return build_models(BookingWithDetails, [row], BOOKING_DETAIL_MODELS)[0]
         
     except HTTPException:
         raise
@@ -222,10 +305,18 @@ async def cancel_booking(
                 detail="Booking is already cancelled"
             )
         
-        # Cancel the booking
-        booking.cancel()
+        # Cancel the booking and free its spot
+        if not await release_booking(db, booking.id):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Booking is already cancelled"
+            )
         await db.commit()
         
+        await invalidate_slot_cache()
+        waitlist_promoter.wake()
+        
         logger.info(f"Booking cancelled by {current_user.email}: {booking.id}")
         
     except HTTPException:
@@ -0,0 +1,168 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+from datetime import datetime, date
+from typing import Any, AsyncIterator, List
+from uuid import UUID
+from app.database import ReplicaSessionLocal
+from app.models.user import User
+from app.models.slot import Slot
+from app.models.booking import Booking
+from app.auth.dependencies import get_current_stream_admin_user
+import csv
+import enum
+import io
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/exports", tags=["exports"])
+
+# Rows fetched per server-side cursor round trip (and flushed per chunk)
+EXPORT_BATCH_SIZE = 1000
+
+# Leading characters that make spreadsheets read a cell as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Titles and descriptions are user input; keep them as text
+        return "'" + value
+    return value
+
+
+def _encode_ndjson(columns: List[str], rows: list) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default) + "\n"
+        for row in rows
+    )
+
+
+def _encode_csv(rows: list) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+async def _stream_rows(query: Select, export_format: ExportFormat) -> AsyncIterator[str]:
+    """Stream a query through a server-side cursor, one encoded chunk per batch.
+
+    Uses its own session so the cursor stays open for the whole response, and
+    only ever holds one batch of rows in memory. Exports are bulk reads, so
+    they go to the read replica when one is configured.
+    """
+    columns = [column.name for column in query.selected_columns]
+    if export_format == ExportFormat.CSV:
+        yield _encode_csv([columns])
+
+    async with ReplicaSessionLocal() as session:
+        try:
+            result = await session.stream(
+                query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+            )
+            async for rows in result.partitions():
+                if export_format == ExportFormat.CSV:
+                    yield _encode_csv(rows)
+                else:
+                    yield _encode_ndjson(columns, rows)
+        except Exception as e:
+            # Headers are already sent, so the client sees a truncated body
+            logger.error(f"Export stream error: {e}")
+            raise
+
+
+def _export_response(query: Select, export_format: ExportFormat, name: str) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%d%H%M%S}.{export_format.value}"
+    return StreamingResponse(
+        _stream_rows(query, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/bookings")
+async def export_bookings(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="ndjson or csv"),
+    current_user: User = Depends(get_current_stream_admin_user)
+):
+    """Stream all bookings with slot and user columns (Admin only)."""
+    query = (
+        select(
+            Booking.id,
+            Booking.status,
+            Booking.notes,
+            Booking.booked_at,
+            Booking.cancelled_at,
+            Booking.slot_id,
+            Slot.title.label("slot_title"),
+            Slot.start_time.label("slot_start_time"),
+            Slot.end_time.label("slot_end_time"),
+            Booking.user_id,
+            User.email.label("user_email"),
+            User.first_name.label("user_first_name"),
+            User.last_name.label("user_last_name")
+        )
+        .join(Slot, Slot.id == Booking.slot_id)
+        .join(User, User.id == Booking.user_id)
+        .order_by(Booking.booked_at, Booking.id)
+    )
+    logger.info(f"Bookings export ({export_format.value}) started by {current_user.email}")
+    return _export_response(query, export_format, "bookings")
+
+
+@router.get("/slots")
+async def export_slots(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="ndjson or csv"),
+    current_user: User = Depends(get_current_stream_admin_user)
+):
+    """Stream all slots with creator columns (Admin only)."""
+    query = (
+        select(
+            Slot.id,
+            Slot.title,
+            Slot.description,
+            Slot.start_time,
+            Slot.end_time,
+            Slot.is_available,
+            Slot.max_participants,
+            Slot.current_participants,
+            Slot.created_by,
+            User.email.label("creator_email"),
+            Slot.created_at,
+            Slot.updated_at
+        )
+        .join(User, User.id == Slot.created_by)
+        .order_by(Slot.start_time, Slot.id)
+    )
+    logger.info(f"Slots export ({export_format.value}) started by {current_user.email}")
+    return _export_response(query, export_format, "slots")
@@ -1,19 +1,96 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, insert, and_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import selectinload
+from pydantic import TypeAdapter
 from typing import List, Optional
 from datetime import datetime
+from uuid import UUID
 from app.database import get_db
 from app.models.user import User, UserRole
 from app.models.slot import Slot
-from app.schemas.slot import SlotCreate, SlotUpdate, SlotResponse, SlotWithCreator
-from app.auth.dependencies import get_current_admin_user, get_current_active_user
+from app.schemas.slot import (
+    SlotCreate, SlotSeriesCreate, SlotUpdate, SlotResponse, SlotWithCreator, CalendarGranularity, SlotCalendarBucket
+)
+from app.schemas.user import StreamToken, UserResponse
+from app.auth.dependencies import (
+    get_current_admin_user, get_current_active_user, get_current_event_stream_user, get_read_db
+)
+from app.services.slot_conflicts import find_conflicts, is_overlap_violation
+from app.services.slot_series import SeriesError, check_no_self_overlap, expand_series
+from app.services.slot_calendar import CalendarError, calendar_query
+from app.services.slot_search import search_condition, search_rank
+from app.services.waitlist import waitlist_promoter
+from app.services.projections import slot_with_creator_query, build_models
+from app.pagination import NEXT_CURSOR_HEADER, keyset_condition, next_cursor
+from app.conditional import CACHE_CONTROL, weak_etag, etag_matches, not_modified
+from app.realtime import slot_event_stream
+from app.auth.security import create_stream_token
+from app.config import settings
+from app.cache.slots import (
+    CachedPage, get_slot_cache_version, get_cached_slot_page, store_slot_page, invalidate_slot_cache
+)
 import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/slots", tags=["slots"])
 
+slot_list_adapter = TypeAdapter(List[SlotWithCreator])
+
+
+def slot_page_response(page: CachedPage) -> Response:
+    """Build the response for an already serialized page of slots."""
+    headers = {"ETag": page.etag, "Cache-Control": CACHE_CONTROL}
+    if page.next_cursor:
+        headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return Response(content=page.body, media_type="application/json", headers=headers)
+
+
+def filter_slot_page(
+    query,
+    skip: int,
+    limit: int,
+    cursor: Optional[str],
+    available_only: bool,
+    start_date: Optional[datetime],
+    end_date: Optional[datetime],
+    search: Optional[str] = None
+):
+    """Restrict a slot query to one page of the listing."""
+    conditions = []
+    
+    if search:
+        conditions.append(search_condition(search))
+    
+    if available_only:
+        conditions.append(Slot.is_available == True)
+        conditions.append(Slot.current_participants < Slot.max_participants)
+    
+    if start_date:
+        conditions.append(Slot.start_time >= start_date)
+        
+    if end_date:
+        conditions.append(Slot.end_time <= end_date)
+    
+    if cursor:
+        conditions.append(keyset_condition(Slot.start_time, Slot.id, cursor))
+    
+    if conditions:
+        query = query.where(and_(*conditions))
+    
+    # Order by start time, with id as tiebreaker for stable keyset pages;
+    # search results put the best matches first and page with skip
+    if search:
+        query = query.order_by(search_rank(search).desc(), Slot.start_time, Slot.id)
+    else:
+        query = query.order_by(Slot.start_time, Slot.id)
+    query = query.limit(limit)
+    if not cursor:
+        query = query.offset(skip)
+    return query
+
 
 @router.post("/", response_model=SlotResponse, status_code=status.HTTP_201_CREATED)
 async def create_slot(
@@ -34,32 +111,13 @@ async def create_slot(
         print(my_secret)
 
         # Check for conflicting slots
-        result = await db.execute(
-            select(Slot).where(
-                and_(
-                    Slot.created_by == current_user.id,
-                    or_(
-                        and_(
-                            Slot.start_time <= slot_data.start_time,
-                            Slot.end_time > slot_data.start_time
-                        ),
-                        and_(
-                            Slot.start_time < slot_data.end_time,
-                            Slot.end_time >= slot_data.end_time
-                        ),
-                        and_(
-                            Slot.start_time >= slot_data.start_time,
-                            Slot.end_time <= slot_data.end_time
-                        )
-                    )
-                )
-            )
+        conflicts = await find_conflicts(
+            db, current_user.id, [(slot_data.start_time, slot_data.end_time)]
         )
-        conflicting_slot = result.scalar_one_or_none()
         
-        if conflicting_slot:
+        if conflicts:
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
+                status_code=status.HTTP_409_CONFLICT,
                 detail="Time slot conflicts with existing slot"
             )
         
@@ -74,9 +132,21 @@ async def create_slot(
         )
         
         db.add(new_slot)
-        await db.commit()
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            # A concurrent request created an overlapping slot after the check
+            await db.rollback()
+            if not is_overlap_violation(e):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Time slot conflicts with existing slot"
+            )
         await db.refresh(new_slot)
         
+        await invalidate_slot_cache()
+        
         logger.info(f"New slot created by {current_user.email}: {new_slot.id}")
         return new_slot
         
@@ -91,43 +161,156 @@ async def create_slot(
         )
 
 
+@router.post("/series", response_model=List[SlotResponse], status_code=status.HTTP_201_CREATED)
+async def create_slot_series(
+    series: SlotSeriesCreate,
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Create a recurring series of slots in one transaction (Admin only)."""
+    try:
+        try:
+            intervals = expand_series(series)
+            check_no_self_overlap(intervals)
+        except SeriesError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        # Check the whole batch for conflicting slots in one query
+        conflicts = await find_conflicts(db, current_user.id, intervals)
+        
+        if conflicts:
+            first = conflicts[0]
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=(
+                    f"{len({c.index for c in conflicts})} of {len(intervals)} slots conflict with "
+                    f"existing slots, first at {intervals[first.index][0].isoformat()}"
+                )
+            )
+        
+        # Insert all slots with a single multi-row INSERT ... RETURNING
+        try:
+            result = await db.execute(
+                insert(Slot).returning(Slot),
+                [
+                    {
+                        "title": series.title,
+                        "description": series.description,
+                        "start_time": start_time,
+                        "end_time": end_time,
+                        "max_participants": series.max_participants,
+                        "created_by": current_user.id,
+                    }
+                    for start_time, end_time in intervals
+                ]
+            )
+            new_slots = result.scalars().all()
+            await db.commit()
+        except IntegrityError as e:
+            # A concurrent request created an overlapping slot after the check
+            await db.rollback()
+            if not is_overlap_violation(e):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Slot series conflicts with an existing slot"
+            )
+        
+        await invalidate_slot_cache()
+        
+        logger.info(f"Slot series of {len(new_slots)} created by {current_user.email}")
+        return new_slots
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Slot series creation error: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Slot series creation failed"
+        )
+
+
 @router.get("/", response_model=List[SlotWithCreator])
 async def get_slots(
     skip: int = Query(0, ge=0, description="Number of slots to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of slots to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header; replaces skip"),
     available_only: bool = Query(False, description="Return only available slots"),
     start_date: Optional[datetime] = Query(None, description="Filter slots starting from this date"),
     end_date: Optional[datetime] = Query(None, description="Filter slots ending before this date"),
+    search: Optional[str] = Query(
+        None, max_length=200, description="Words in the title or description, the last one may be partial"
+    ),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get list of slots with optional filters."""
     try:
-        query = select(Slot).options(selectinload(Slot.creator))
-        
-        # Apply filters
-        conditions = []
+        if search and cursor:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Search results are ranked; page them with skip instead of cursor"
+            )
         
-        if available_only:
-            conditions.append(Slot.is_available == True)
+        page_filters = {
+            "skip": skip,
+            "limit": limit,
+            "cursor": cursor,
+            "available_only": available_only,
+            "start_date": start_date,
+            "end_date": end_date,
+            "search": search,
+        }
         
-        if start_date:
-            conditions.append(Slot.start_time >= start_date)
-            
-        if end_date:
-            conditions.append(Slot.end_time <= end_date)
+        # Every user sees the same pages, so they are shared through Redis.
+        # A user pinned after their own write bypasses the cache both ways:
+        # a page another user read from a lagging replica may miss that write
+        pinned = db.info.get("pinned")
+        cache_version = None if pinned else await get_slot_cache_version()
+        if cache_version is not None:
+            cached_page = await get_cached_slot_page(cache_version, page_filters)
+            if cached_page:
+                if etag_matches(if_none_match, cached_page.etag):
+                    return not_modified(cached_page.etag)
+                return slot_page_response(cached_page)
         
-        if conditions:
-            query = query.where(and_(*conditions))
+        # Revalidate with a two-column query before loading slots and creators
+        if if_none_match:
+            result = await db.execute(
+                filter_slot_page(select(Slot.id, Slot.updated_at), **page_filters)
+            )
+            etag = weak_etag(result.all())
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
         
-        # Order by start time
-        query = query.order_by(Slot.start_time).offset(skip).limit(limit)
+        # Project just the response columns; rows skip ORM hydration entirely
+        result = await db.execute(
+            filter_slot_page(slot_with_creator_query(), **page_filters)
+        )
+        rows = result.all()
         
-        result = await db.execute(query)
-        slots = result.scalars().all()
+        page = CachedPage(
+            body=slot_list_adapter.dump_json(
+                build_models(SlotWithCreator, rows, {"creator": UserResponse})
+            ),
+            next_cursor=None if search else next_cursor(rows, limit, "start_time"),
+            etag=weak_etag((row.id, row.updated_at) for row in rows)
+        )
+        # Replica pages are shared too: one that lags behind a version bump
+        # lives for at most slot_cache_ttl_seconds
+        if cache_version is not None:
+            await store_slot_page(cache_version, page_filters, page)
         
-        return slots
+        return slot_page_response(page)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting slots: {e}")
         raise HTTPException(
@@ -136,14 +319,83 @@ async def get_slots(
         )
 
 
+@router.get("/calendar", response_model=List[SlotCalendarBucket])
+async def get_slot_calendar(
+    start_date: datetime = Query(..., description="Start of the range (inclusive)"),
+    end_date: datetime = Query(..., description="End of the range (exclusive)"),
+    granularity: CalendarGranularity = Query(CalendarGranularity.DAY, description="Bucket size"),
+    timezone: str = Query("UTC", description="IANA time zone whose days and hours the buckets follow"),
+    created_by: Optional[UUID] = Query(None, description="Only count slots created by this user"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get per-day or per-hour slot occupancy for a date range."""
+    try:
+        try:
+            query = calendar_query(start_date, end_date, granularity, timezone, created_by)
+        except CalendarError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        # One grouped query; periods without slots are left out
+        result = await db.execute(query)
+        return result.mappings().all()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting slot calendar: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve slot calendar"
+        )
+
+
+@router.post("/events/token", response_model=StreamToken)
+async def create_slot_events_token(
+    current_user: User = Depends(get_current_active_user)
+):
+    """Issue a short-lived token that opens the slot event stream."""
+    return StreamToken(
+        token=create_stream_token(str(current_user.id)),
+        expires_in=settings.slot_events_token_seconds
+    )
+
+
+@router.get("/events")
+async def stream_slot_events(
+    current_user: User = Depends(get_current_event_stream_user)
+):
+    """Stream slot changes (bookings, edits, deletions) as server-sent events."""
+    return StreamingResponse(
+        slot_event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/{slot_id}", response_model=SlotWithCreator)
 async def get_slot(
     slot_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get a specific slot by ID."""
     try:
+        if if_none_match:
+            result = await db.execute(
+                select(Slot.id, Slot.updated_at).where(Slot.id == slot_id)
+            )
+            row = result.one_or_none()
+            if row:
+                etag = weak_etag([row])
+                if etag_matches(if_none_match, etag):
+                    return not_modified(etag)
+        
         result = await db.execute(
             select(Slot)
             .options(selectinload(Slot.creator))
@@ -157,6 +409,8 @@ async def get_slot(
                 detail="Slot not found"
             )
         
+        response.headers["ETag"] = weak_etag([(slot.id, slot.updated_at)])
+        response.headers["Cache-Control"] = CACHE_CONTROL
         return slot
         
     except HTTPException:
@@ -191,6 +445,7 @@ async def update_slot(
         
         # Update fields
         update_data = slot_update.model_dump(exclude_unset=True)
+        had_room = slot.is_available and not slot.is_full
         for field, value in update_data.items():
             setattr(slot, field, value)
         
@@ -201,9 +456,30 @@ async def update_slot(
                 detail="End time must be after start time"
             )
         
-        await db.commit()
+        if slot.max_participants < slot.current_participants:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Slot already has {slot.current_participants} participants"
+            )
+        
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            if not is_overlap_violation(e):
+                raise
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Time slot conflicts with existing slot"
+            )
         await db.refresh(slot)
         
+        await invalidate_slot_cache()
+        # Claims gate on is_available and current < max, so raising capacity
+        # or reopening the slot is enough to let the promoter book waiters
+        if not had_room and slot.is_available and not slot.is_full:
+            waitlist_promoter.wake()
+        
         logger.info(f"Slot updated by {current_user.email}: {slot.id}")
         return slot
         
@@ -240,6 +516,8 @@ async def delete_slot(
         await db.delete(slot)
         await db.commit()
         
+        await invalidate_slot_cache()
+        
         logger.info(f"Slot deleted by {current_user.email}: {slot.id}")
         
     except HTTPException:
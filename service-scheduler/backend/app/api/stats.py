@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+from app.models.user import User
+from app.schemas.stats import StatsGranularity, UtilizationStats
+from app.auth.dependencies import get_current_admin_user, get_read_db
+from app.services.utilization import StatsError, utilization_query
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/utilization", response_model=List[UtilizationStats])
+async def get_utilization(
+    start_date: date = Query(..., description="First day of the range (UTC)"),
+    end_date: date = Query(..., description="Day after the range (exclusive)"),
+    granularity: StatsGranularity = Query(StatsGranularity.DAY, description="Period size"),
+    created_by: Optional[UUID] = Query(None, description="Only this creator's slots"),
+    current_user: User = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get slot utilization per creator and day or week (Admin only)."""
+    try:
+        try:
+            query = utilization_query(start_date, end_date, granularity, created_by)
+        except StatsError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        # Precomputed daily rows; up to utilization_refresh_seconds behind
+        result = await db.execute(query)
+        return result.mappings().all()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting utilization stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve utilization stats"
+        )
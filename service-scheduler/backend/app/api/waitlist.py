@@ -0,0 +1,169 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, update
+from typing import List
+from app.database import get_db
+from app.models.user import User
+from app.models.slot import Slot
+from app.models.booking import Booking, BookingStatus
+from app.models.waitlist import WaitlistEntry, WaitlistStatus
+from app.schemas.waitlist import WaitlistJoin, WaitlistEntryResponse
+from app.auth.dependencies import get_current_active_user, get_read_db
+from app.services.waitlist import waitlist_entries_query, waitlist_promoter
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/waitlist", tags=["waitlist"])
+
+
+@router.post("/", response_model=WaitlistEntryResponse, status_code=status.HTTP_201_CREATED)
+async def join_waitlist(
+    entry_data: WaitlistJoin,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Queue for a full slot; the booking is made when a spot frees up."""
+    try:
+        result = await db.execute(
+            select(Slot.is_available, Slot.current_participants, Slot.max_participants)
+            .where(Slot.id == entry_data.slot_id)
+        )
+        slot = result.one_or_none()
+        
+        if not slot:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Slot not found"
+            )
+        
+        if slot.is_available and slot.current_participants < slot.max_participants:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Slot has free spots; book it directly"
+            )
+        
+        result = await db.execute(
+            select(Booking.id).where(
+                Booking.slot_id == entry_data.slot_id,
+                Booking.user_id == current_user.id,
+                Booking.status == BookingStatus.ACTIVE
+            )
+        )
+        if result.first() is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You already have an active booking for this slot"
+            )
+        
+        entry = WaitlistEntry(
+            slot_id=entry_data.slot_id,
+            user_id=current_user.id,
+            notes=entry_data.notes
+        )
+        db.add(entry)
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="You are already on the waitlist for this slot"
+            )
+        
+        # A spot may have freed up since the check above
+        waitlist_promoter.wake()
+        
+        result = await db.execute(
+            waitlist_entries_query().where(WaitlistEntry.id == entry.id)
+        )
+        
+        logger.info(f"Waitlist joined by {current_user.email}: {entry.id}")
+        return result.mappings().one()
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Waitlist join error: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to join waitlist"
+        )
+
+
+@router.get("/my", response_model=List[WaitlistEntryResponse])
+async def get_my_waitlist(
+    limit: int = Query(100, ge=1, le=100, description="Number of entries to return"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Get the current user's waitlist entries, newest first."""
+    try:
+        result = await db.execute(
+            waitlist_entries_query()
+            .where(WaitlistEntry.user_id == current_user.id)
+            .order_by(WaitlistEntry.created_at.desc(), WaitlistEntry.id.desc())
+            .limit(limit)
+        )
+        return result.mappings().all()
+        
+    except Exception as e:
+        logger.error(f"Error getting waitlist entries: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve waitlist entries"
+        )
+
+
+@router.delete("/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def leave_waitlist(
+    entry_id: str,
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Leave a slot's waitlist."""
+    try:
+        result = await db.execute(
+            select(WaitlistEntry.user_id, WaitlistEntry.status).where(WaitlistEntry.id == entry_id)
+        )
+        entry = result.one_or_none()
+        
+        if not entry:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Waitlist entry not found"
+            )
+        
+        # Check permissions
+        if current_user.role.value != "admin" and entry.user_id != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions"
+            )
+        
+        # Guarded on status: the promoter may have booked it meanwhile
+        result = await db.execute(
+            update(WaitlistEntry)
+            .where(WaitlistEntry.id == entry_id, WaitlistEntry.status == WaitlistStatus.WAITING)
+            .values(status=WaitlistStatus.CANCELLED)
+        )
+        if result.rowcount == 0:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Waitlist entry is no longer waiting"
+            )
+        await db.commit()
+        
+        logger.info(f"Waitlist left by {current_user.email}: {entry_id}")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Waitlist leave error: {e}")
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to leave waitlist"
+        )
@@ -1,48 +1,149 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from app.database import get_db
+from app.database import AsyncSessionLocal, ReplicaSessionLocal, replica_engine, get_db
 from app.models.user import User, UserRole
-from app.auth.security import verify_token
+from app.auth.security import verify_stream_token, verify_token
+from app.auth.user_cache import cache_user, get_cached_user
+from app.cache.recent_writes import has_recent_write
 from app.schemas.user import TokenData
 from typing import Optional
+from uuid import UUID
 import logging
 
 logger = logging.getLogger(__name__)
 
 # Security scheme
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get current authenticated user."""
+    user = await authenticate_token(credentials.credentials, db)
+    # Lets the request middleware pin this user's reads after a write
+    request.state.user_id = user.id
+    return user
+
+
+async def get_read_db(
+    current_user: User = Depends(get_current_user)
+) -> AsyncSession:
+    """Dependency to get a session for GET handlers.
+
+    Uses the read replica, except for users who wrote within the last
+    read_your_writes_seconds: they read from the primary so their own
+    changes are visible despite replication lag. Such sessions are marked
+    ``pinned``, since what they read is not what other users would see yet.
+    """
+    pinned = replica_engine is not None and await has_recent_write(current_user.id)
+    use_replica = replica_engine is not None and not pinned
+    session_factory = ReplicaSessionLocal if use_replica else AsyncSessionLocal
+    async with session_factory() as session:
+        session.info["replica"] = use_replica
+        session.info["pinned"] = pinned
+        try:
+            yield session
+        except Exception as e:
+            logger.error(f"Read session error: {e}")
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
+
+
+async def get_current_stream_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> User:
+    """Get current user for a long-lived streaming response.
+
+    Uses its own short session rather than get_db, which would stay open
+    (and hold a pooled connection) for as long as the stream runs.
+    """
+    async with AsyncSessionLocal() as db:
+        return await authenticate_token(credentials.credentials, db)
+
+
+async def get_current_event_stream_user(
+    token: Optional[str] = Query(
+        None, description="Stream token from POST /slots/events/token, for EventSource"
+    ),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> User:
+    """Get current user for the server-sent slot event stream.
+
+    Like get_current_stream_user, but EventSource cannot set headers, so it
+    also accepts a stream token in the query string. Stream tokens expire
+    within slot_events_token_seconds and are good for nothing else, so the
+    URLs that end up in access logs and browser history carry no bearer token.
+    """
+    if credentials:
+        async with AsyncSessionLocal() as db:
+            return await authenticate_token(credentials.credentials, db)
+    
+    user_id = verify_stream_token(token) if token else None
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    async with AsyncSessionLocal() as db:
+        return await load_active_user(user_id, db)
+
+
+async def get_current_stream_admin_user(
+    current_user: User = Depends(get_current_stream_user)
+) -> User:
+    """Get current admin user for a long-lived streaming response."""
+    if current_user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return current_user
+
+
+async def authenticate_token(token: str, db: AsyncSession) -> User:
+    """Resolve a bearer token to its active user."""
+    token_data = verify_token(token)
+    if token_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return await load_active_user(token_data.user_id, db)
+
+
+async def load_active_user(user_id: UUID, db: AsyncSession) -> User:
+    """Load an authenticated user, from the cache when possible."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    # Get user from the cache, falling back to the database
     try:
-        token_data = verify_token(credentials.credentials)
-        if token_data is None:
-            raise credentials_exception
-            
-    except Exception:
-        raise credentials_exception
-    
-    # Get user from database
-    try:
-        result = await db.execute(
-            select(User).where(User.id == token_data.user_id)
-        )
-        user = result.scalar_one_or_none()
+        user = get_cached_user(user_id)
         
         if user is None:
-            raise credentials_exception
+            result = await db.execute(
+                select(User).where(User.id == user_id)
+            )
+            user = result.scalar_one_or_none()
+            
+            if user is None:
+                raise credentials_exception
+            
+            cache_user(user)
             
         if not user.is_active:
             raise HTTPException(
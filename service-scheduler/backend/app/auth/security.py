@@ -1,16 +1,78 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Optional
+from uuid import UUID
 from app.config import settings
 from app.schemas.user import TokenData
+from app.auth.token_cache import get_verified_token, cache_verified_token
+import asyncio
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# "type" claim of tokens that only open the slot event stream
+STREAM_TOKEN_TYPE = "slot_events"
+
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so a small thread pool keeps it off the event loop.
+# The semaphore caps concurrent hashes and makes the backlog measurable.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.password_hash_concurrency,
+    thread_name_prefix="password-hash"
+)
+_hash_slots = asyncio.Semaphore(settings.password_hash_concurrency)
+
+
+class PasswordHashMetrics:
+    """Counters for the password hashing pool."""
+
+    def __init__(self):
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.queue_seconds_total = 0.0
+        self.queue_seconds_max = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": settings.password_hash_concurrency,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+            "queue_seconds_avg": self.queue_seconds_total / self.completed if self.completed else 0.0,
+            "queue_seconds_max": self.queue_seconds_max,
+        }
+
+
+hash_metrics = PasswordHashMetrics()
+
+
+async def _run_hashing(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a blocking hash function in the pool once a slot is free."""
+    queued_at = time.perf_counter()
+    hash_metrics.waiting += 1
+    try:
+        await _hash_slots.acquire()
+    finally:
+        hash_metrics.waiting -= 1
+
+    queue_seconds = time.perf_counter() - queued_at
+    hash_metrics.running += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_slots.release()
+        hash_metrics.running -= 1
+        hash_metrics.completed += 1
+        hash_metrics.queue_seconds_total += queue_seconds
+        hash_metrics.queue_seconds_max = max(hash_metrics.queue_seconds_max, queue_seconds)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash."""
@@ -30,6 +92,16 @@ def get_password_hash(password: str) -> str:
         raise
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate a password hash without blocking the event loop."""
+    return await _run_hashing(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
@@ -54,7 +126,15 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 
 def verify_token(token: str) -> Optional[TokenData]:
-    """Verify and decode JWT token."""
+    """Verify and decode JWT token.
+
+    Tokens verified before are answered from the token cache until they
+    expire, skipping the signature check and claim parsing.
+    """
+    cached = get_verified_token(token)
+    if cached is not None:
+        return cached
+    
     try:
         payload = jwt.decode(
             token, 
@@ -66,10 +146,14 @@ def verify_token(token: str) -> Optional[TokenData]:
         email: str = payload.get("email")
         role: str = payload.get("role")
         
-        if user_id is None or email is None:
+        # Stream tokens travel in URLs, so they must never work as bearer tokens
+        if user_id is None or email is None or payload.get("type") != "access_token":
             return None
             
         token_data = TokenData(user_id=user_id, email=email, role=role)
+        # jwt.decode rejects expired tokens, so exp is present and in the future
+        if "exp" in payload:
+            cache_verified_token(token, token_data, payload["exp"])
         return token_data
         
     except JWTError as e:
@@ -80,6 +164,30 @@ def verify_token(token: str) -> Optional[TokenData]:
         return None
 
 
+def create_stream_token(user_id: str) -> str:
+    """Create a short-lived token that can only open the slot event stream."""
+    return create_access_token(
+        data={"sub": str(user_id), "type": STREAM_TOKEN_TYPE},
+        expires_delta=timedelta(seconds=settings.slot_events_token_seconds)
+    )
+
+
+def verify_stream_token(token: str) -> Optional[UUID]:
+    """Return the user id of a valid stream token, or None."""
+    try:
+        payload = jwt.decode(
+            token,
+            settings.jwt_secret_key,
+            algorithms=[settings.jwt_algorithm]
+        )
+        if payload.get("type") != STREAM_TOKEN_TYPE or payload.get("sub") is None:
+            return None
+        return UUID(payload["sub"])
+    except (JWTError, ValueError) as e:
+        logger.error(f"Stream token verification error: {e}")
+        return None
+
+
 def create_token_payload(user_id: str, email: str, role: str) -> dict:
     """Create token payload with user information."""
     return {
@@ -0,0 +1,40 @@
+from typing import Optional
+from app.cache.ttl import TTLCache
+from app.config import settings
+from app.schemas.user import TokenData
+import hashlib
+import time
+
+# Verified access tokens, held until their exp. Entries are shared between
+# requests, so callers must treat the TokenData as read-only.
+token_cache = TTLCache(
+    maxsize=settings.token_cache_max_size,
+    ttl=settings.jwt_access_token_expire_minutes * 60
+)
+
+
+def _cache_key(token: str) -> bytes:
+    # The signing secret and algorithm are part of the key, so a rotated
+    # secret never matches tokens verified under the old one
+    digest = hashlib.sha256()
+    digest.update(settings.jwt_algorithm.encode())
+    digest.update(b"\0")
+    digest.update(settings.jwt_secret_key.encode())
+    digest.update(b"\0")
+    digest.update(token.encode())
+    return digest.digest()
+
+
+def get_verified_token(token: str) -> Optional[TokenData]:
+    """Return the TokenData of a token verified earlier, or None on a miss."""
+    return token_cache.get(_cache_key(token))
+
+
+def cache_verified_token(token: str, token_data: TokenData, expires_at: float) -> None:
+    """Remember a verified token until ``expires_at`` (a Unix timestamp)."""
+    token_cache.set(_cache_key(token), token_data, ttl=expires_at - time.time())
+
+
+def purge_verified_tokens() -> None:
+    """Forget every verified token, e.g. after rotating the signing secret."""
+    token_cache.clear()
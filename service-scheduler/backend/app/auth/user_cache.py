@@ -0,0 +1,77 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from typing import Optional
+from uuid import UUID
+from app.cache.ttl import TTLCache
+from app.config import settings
+from app.models.user import User
+
+# Columns kept for authenticated users; the password hash is left out on purpose
+_CACHED_COLUMNS = [
+    column.key for column in User.__table__.columns if column.key != "password_hash"
+]
+
+# Channel the notify_user_change trigger publishes changed user ids to
+# (see hasura/init.sql)
+USER_CHANNEL = "user_changes"
+
+user_cache = TTLCache(
+    maxsize=settings.user_cache_max_size,
+    ttl=settings.user_cache_ttl_seconds
+)
+
+
+def cache_user(user: User) -> None:
+    """Remember the column values of a freshly loaded user."""
+    user_cache.set(user.id, {key: getattr(user, key) for key in _CACHED_COLUMNS})
+
+
+def get_cached_user(user_id: UUID) -> Optional[User]:
+    """Return a detached copy of a cached user, or None on a miss.
+
+    Every hit builds a new instance, so requests never share ORM state.
+    Attributes that were not cached (password hash, relationships) raise
+    instead of lazy loading.
+    """
+    data = user_cache.get(user_id)
+    if data is None:
+        return None
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_user(user_id: UUID) -> None:
+    user_cache.invalidate(user_id)
+
+
+def on_user_change(payload: str) -> None:
+    """Drop a user changed by any process, including Core and external writes.
+
+    Wired to USER_CHANNEL on the slot event listener in main.py. While that
+    listener is down, and for a read that loaded the row just before the
+    change, a cached user can be up to ``user_cache_ttl_seconds`` old; after
+    a reconnect the whole cache is cleared instead.
+    """
+    invalidate_user(UUID(payload))
+
+
+# The ORM hooks drop the user in this process as soon as the session
+# commits, before the notification comes back
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _track_changed_user(mapper, connection, target: User) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_user_ids", set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    for user_id in session.info.pop("changed_user_ids", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session: Session) -> None:
+    session.info.pop("changed_user_ids", None)
@@ -0,0 +1,47 @@
+from redis.exceptions import RedisError
+from uuid import UUID
+from app.cache.redis import get_redis, mark_redis_down
+from app.cache.ttl import TTLCache
+from app.config import settings
+
+# Users who wrote within the read-your-writes window. The local copy answers
+# repeat reads on this replica without a Redis call; Redis carries the pin to
+# the other API replicas.
+_local_pins = TTLCache(
+    maxsize=settings.user_cache_max_size,
+    ttl=settings.read_your_writes_seconds
+)
+
+
+def _pin_key(user_id: UUID) -> str:
+    return f"ryw:{user_id}"
+
+
+async def mark_recent_write(user_id: UUID) -> None:
+    """Pin a user's reads to the primary for the read-your-writes window."""
+    _local_pins.set(user_id, True)
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(_pin_key(user_id), 1, px=int(settings.read_your_writes_seconds * 1000))
+    except RedisError as e:
+        mark_redis_down(e)
+
+
+async def has_recent_write(user_id: UUID) -> bool:
+    """Return True while a user's reads must still go to the primary.
+
+    When Redis is down only writes made through this replica are known, so a
+    user switching API replicas may briefly read from a lagging database.
+    """
+    if _local_pins.get(user_id):
+        return True
+    redis = get_redis()
+    if redis is None:
+        return False
+    try:
+        return bool(await redis.exists(_pin_key(user_id)))
+    except RedisError as e:
+        mark_redis_down(e)
+        return False
@@ -0,0 +1,43 @@
+from redis import asyncio as aioredis
+from typing import Optional
+from app.config import settings
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# How long to stop calling Redis after it fails, so requests fall back to
+# Postgres instead of each waiting on a dead connection
+_RETRY_AFTER_SECONDS = 5.0
+
+_client: Optional[aioredis.Redis] = None
+_down_until = 0.0
+
+
+def get_redis() -> Optional[aioredis.Redis]:
+    """Return the shared Redis client, or None while Redis is unavailable."""
+    global _client
+    if time.monotonic() < _down_until:
+        return None
+    if _client is None:
+        _client = aioredis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        )
+    return _client
+
+
+def mark_redis_down(error: Exception) -> None:
+    """Skip Redis for a short while after a failed call."""
+    global _down_until
+    if time.monotonic() >= _down_until:
+        logger.warning(f"Redis unavailable, bypassing for {_RETRY_AFTER_SECONDS:.0f}s: {error}")
+    _down_until = time.monotonic() + _RETRY_AFTER_SECONDS
+
+
+async def close_redis() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
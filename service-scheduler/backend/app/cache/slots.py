@@ -0,0 +1,112 @@
+from redis.exceptions import RedisError
+from typing import NamedTuple, Optional
+from app.cache.redis import get_redis, mark_redis_down
+from app.config import settings
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bumped on every slot or booking write; page keys embed it, so one INCR
+# retires every cached page across all replicas
+VERSION_KEY = "slots:version"
+
+
+class SlotCacheMetrics:
+    """Page lookups served from Redis versus rebuilt from Postgres."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+
+slot_cache_metrics = SlotCacheMetrics()
+
+
+class CachedPage(NamedTuple):
+    body: bytes
+    next_cursor: Optional[str]
+    etag: str
+
+
+def _redis_failed(error: RedisError) -> None:
+    slot_cache_metrics.errors += 1
+    mark_redis_down(error)
+
+
+def _page_key(version: int, params: dict) -> str:
+    digest = hashlib.sha256(
+        json.dumps(params, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"slots:list:{version}:{digest}"
+
+
+async def get_slot_cache_version() -> Optional[int]:
+    """Return the current cache version, or None if caching is unavailable."""
+    if not settings.slot_cache_enabled:
+        return None
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        return int(await redis.get(VERSION_KEY) or 0)
+    except RedisError as e:
+        _redis_failed(e)
+        return None
+
+
+async def get_cached_slot_page(version: int, params: dict) -> Optional[CachedPage]:
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        cached = await redis.hgetall(_page_key(version, params))
+    except RedisError as e:
+        _redis_failed(e)
+        slot_cache_metrics.misses += 1
+        return None
+    if b"etag" not in cached:
+        # Missing, or written before pages carried their ETag
+        slot_cache_metrics.misses += 1
+        return None
+    slot_cache_metrics.hits += 1
+    cursor = cached.get(b"next_cursor") or None
+    return CachedPage(
+        body=cached[b"body"],
+        next_cursor=cursor.decode() if cursor else None,
+        etag=cached[b"etag"].decode()
+    )
+
+
+async def store_slot_page(version: int, params: dict, page: CachedPage) -> None:
+    redis = get_redis()
+    if redis is None:
+        return
+    key = _page_key(version, params)
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={
+                "body": page.body,
+                "next_cursor": page.next_cursor or "",
+                "etag": page.etag,
+            })
+            pipe.expire(key, settings.slot_cache_ttl_seconds)
+            await pipe.execute()
+    except RedisError as e:
+        _redis_failed(e)
+
+
+async def invalidate_slot_cache() -> None:
+    """Retire all cached slot pages after a slot or booking write."""
+    if not settings.slot_cache_enabled:
+        return
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.incr(VERSION_KEY)
+    except RedisError as e:
+        _redis_failed(e)
+        logger.error(f"Slot cache invalidation failed, pages may be stale for up to {settings.slot_cache_ttl_seconds}s: {e}")
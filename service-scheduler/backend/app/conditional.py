@@ -0,0 +1,42 @@
+from fastapi import Response, status
+from datetime import datetime
+from typing import Iterable, Optional, Tuple
+from uuid import UUID
+import hashlib
+
+# Clients may keep a copy but must revalidate it with If-None-Match on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(rows: Iterable[Tuple[UUID, Optional[datetime]]]) -> str:
+    """Build a weak ETag from the (id, updated_at) pairs of the rows in a response.
+
+    Every slot write bumps ``updated_at`` and the ids pin down which rows are on
+    the page, so the tag can be computed from a two-column query without loading
+    or serializing the rows themselves.
+    """
+    digest = hashlib.md5()
+    for row_id, updated_at in rows:
+        digest.update(f"{row_id}:{updated_at.isoformat() if updated_at else ''};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Apply the weak comparison of RFC 9110 to an If-None-Match header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Answer a conditional request whose representation has not changed."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
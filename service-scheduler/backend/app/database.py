@@ -1,18 +1,34 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy import text
 from app.config import settings
+from app.instrumentation import TimedQueuePool, instrument_engine
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def make_engine(url: str):
+    """Create an instrumented async engine with the shared pool settings."""
+    new_engine = create_async_engine(
+        url,
+        echo=settings.environment == "development",
+        pool_pre_ping=True,
+        poolclass=TimedQueuePool,
+        pool_size=20,
+        max_overflow=0,
+        connect_args={
+            # Tells the participant-count trigger in hasura/init.sql that this
+            # client maintains slot counters itself (see app/services/booking_claims.py)
+            "server_settings": {"scheduler.app_managed_counts": "on"}
+        }
+    )
+    instrument_engine(new_engine.sync_engine)
+    return new_engine
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.environment == "development",
-    pool_pre_ping=True,
-    pool_size=20,
-    max_overflow=0
-)
+engine = make_engine(settings.database_url)
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -21,6 +37,15 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False
 )
 
+# Read replica engine and session factory; fall back to the primary when no
+# replica is configured
+replica_engine = make_engine(settings.database_replica_url) if settings.database_replica_url else None
+ReplicaSessionLocal = async_sessionmaker(
+    replica_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+) if replica_engine is not None else AsyncSessionLocal
+
 
 class Base(DeclarativeBase):
     pass
@@ -43,5 +68,7 @@ async def init_db():
     """Initialize database tables."""
     async with engine.begin() as conn:
         # Import all models here to ensure they are registered
-        from app.models import user, slot, booking
+        from app.models import user, slot, booking, waitlist, refresh_token, stats
+        # GiST indexes over UUID columns (no_overlapping_creator_slots) need btree_gist
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
         await conn.run_sync(Base.metadata.create_all)
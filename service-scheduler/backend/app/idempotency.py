@@ -0,0 +1,261 @@
+from redis.exceptions import RedisError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing import List, Optional, Tuple
+from app.auth.security import verify_token
+from app.cache.redis import get_redis, mark_redis_down
+from app.config import settings
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Methods a retried request could repeat a write with
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# Statuses whose response is stored and replayed besides successes: a body
+# that fails validation fails it again. Anything else may change with time
+# (400 for a full slot or an existing booking, 401, 403, 409, 429), so the
+# key is released and a retry runs the request again.
+_STORED_STATUSES = {422}
+
+# Response headers kept with a stored response; the rest are per-request
+_STORED_HEADERS = {b"content-type", b"location", b"etag", b"x-next-cursor"}
+
+_POLL_SECONDS = 0.05
+
+# Deletes the in-progress marker only if this request still owns it, so a
+# request that outlived its lock never clears a successor's
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class IdempotencyMetrics:
+    """Keyed requests executed versus answered from a stored response."""
+
+    def __init__(self):
+        self.executed = 0
+        self.replayed = 0
+        self.conflicts = 0
+
+
+idempotency_metrics = IdempotencyMetrics()
+
+
+def _record_key(user_id: str, key: str) -> str:
+    return f"idempotency:{user_id}:{hashlib.sha256(key.encode()).hexdigest()}"
+
+
+def _fingerprint(scope: Scope, body: bytes) -> str:
+    digest = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _bearer_user_id(headers: Headers) -> Optional[str]:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    token_data = verify_token(token)
+    return token_data.user_id if token_data else None
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+class IdempotencyMiddleware:
+    """Replays the stored response of a repeated ``Idempotency-Key``.
+
+    Applies to authenticated requests with unsafe methods that send the
+    header. Keys are scoped per user. The first request claims the key in
+    Redis with ``SET NX``. A 2xx or 422 response is then kept for
+    ``idempotency_ttl_seconds``; after any other status the key is released
+    so the request can be retried. A replay is answered from Redis alone,
+    without touching the database. A duplicate that arrives while the first
+    request is still running waits for its response, for up to
+    ``idempotency_wait_seconds``, and gets 409 after that. Reusing a key for
+    a different request gets 422. While Redis is unavailable, requests run
+    without idempotency rather than fail.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in UNSAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            response = JSONResponse(
+                {"detail": f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"},
+                status_code=400
+            )
+            await response(scope, receive, send)
+            return
+
+        # Unauthenticated requests are left for the endpoint to reject
+        user_id = _bearer_user_id(headers)
+        redis = get_redis()
+        if user_id is None or redis is None:
+            await self.app(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        replay_receive = _replaying(body, receive)
+        record_key = _record_key(user_id, key)
+        fingerprint = _fingerprint(scope, body)
+        marker = json.dumps({"state": "pending", "fingerprint": fingerprint, "owner": uuid.uuid4().hex})
+
+        try:
+            record = await self._claim(redis, record_key, marker, fingerprint)
+        except RedisError as e:
+            mark_redis_down(e)
+            await self.app(scope, replay_receive, send)
+            return
+
+        if record is not None:
+            if record["fingerprint"] != fingerprint:
+                response = JSONResponse(
+                    {"detail": "Idempotency-Key was already used for a different request"},
+                    status_code=422
+                )
+            elif record["state"] == "pending":
+                idempotency_metrics.conflicts += 1
+                response = JSONResponse(
+                    {"detail": "A request with this Idempotency-Key is still in progress"},
+                    status_code=409
+                )
+            else:
+                idempotency_metrics.replayed += 1
+                await _replay(record, send)
+                return
+            await response(scope, replay_receive, send)
+            return
+
+        idempotency_metrics.executed += 1
+        await self._execute(scope, replay_receive, send, redis, record_key, marker, fingerprint)
+
+    async def _claim(self, redis, record_key: str, marker: str, fingerprint: str) -> Optional[dict]:
+        """Claim the key, or return the record of the request that holds it.
+
+        Waits while another request holds it in progress, and claims it after
+        all if that request fails; returns the pending record on timeout.
+        """
+        deadline = time.monotonic() + settings.idempotency_wait_seconds
+        while True:
+            if await redis.set(record_key, marker, nx=True, px=settings.idempotency_lock_seconds * 1000):
+                return None
+            raw = await redis.get(record_key)
+            if raw is None:
+                # Released by a failed request: try to claim it again
+                continue
+            record = json.loads(raw)
+            if record["state"] != "pending" or record["fingerprint"] != fingerprint:
+                return record
+            if time.monotonic() >= deadline:
+                return record
+            await asyncio.sleep(_POLL_SECONDS)
+
+    async def _execute(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        redis,
+        record_key: str,
+        marker: str,
+        fingerprint: str
+    ) -> None:
+        status_code = 500
+        stored_headers: List[Tuple[str, str]] = []
+        chunks: List[bytes] = []
+
+        async def capture(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                stored_headers.extend(
+                    (name.decode("latin-1"), value.decode("latin-1"))
+                    for name, value in message.get("headers", [])
+                    if name.lower() in _STORED_HEADERS
+                )
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        completed = False
+        try:
+            await self.app(scope, receive, capture)
+            completed = True
+        finally:
+            try:
+                if completed and (200 <= status_code < 300 or status_code in _STORED_STATUSES):
+                    record = {
+                        "state": "done",
+                        "fingerprint": fingerprint,
+                        "status": status_code,
+                        "headers": stored_headers,
+                        "body": base64.b64encode(b"".join(chunks)).decode()
+                    }
+                    await redis.set(record_key, json.dumps(record), px=settings.idempotency_ttl_seconds * 1000)
+                else:
+                    # The outcome may differ on a retry, so free the key for it
+                    await redis.eval(_RELEASE_SCRIPT, 1, record_key, marker)
+            except RedisError as e:
+                mark_redis_down(e)
+                logger.error(f"Storing idempotent response failed, key stays locked up to "
+                             f"{settings.idempotency_lock_seconds}s: {e}")
+
+
+def _replaying(body: bytes, receive: Receive) -> Receive:
+    """Hand the already read body to the app, then pass the client through."""
+    sent = False
+
+    async def replay() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return replay
+
+
+async def _replay(record: dict, send: Send) -> None:
+    body = base64.b64decode(record["body"])
+    headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in record["headers"]]
+    headers.append((b"content-length", str(len(body)).encode()))
+    headers.append((REPLAYED_HEADER.lower().encode(), b"true"))
+    await send({"type": "http.response.start", "status": record["status"], "headers": headers})
+    await send({"type": "http.response.body", "body": body})
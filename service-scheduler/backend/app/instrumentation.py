@@ -0,0 +1,97 @@
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import Optional
+import time
+
+
+class RequestTiming:
+    """Where one request spent its time: SQL, waiting for a connection, the rest."""
+
+    __slots__ = ("started", "db_queries", "db_seconds", "pool_checkouts", "pool_wait_seconds")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.pool_checkouts = 0
+        self.pool_wait_seconds = 0.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self, total_seconds: float) -> str:
+        """Format as a Server-Timing header value (durations in milliseconds)."""
+        app_seconds = max(total_seconds - self.db_seconds - self.pool_wait_seconds, 0.0)
+        return ", ".join([
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.db_queries} queries"',
+            f'pool;dur={self.pool_wait_seconds * 1000:.1f};desc="{self.pool_checkouts} checkouts"',
+            f"app;dur={app_seconds * 1000:.1f}",
+            f"total;dur={total_seconds * 1000:.1f}",
+        ])
+
+    def log_summary(self) -> str:
+        return (
+            f"db={self.db_queries}q/{self.db_seconds * 1000:.1f}ms "
+            f"pool={self.pool_checkouts}x/{self.pool_wait_seconds * 1000:.1f}ms"
+        )
+
+
+class DatabaseMetrics:
+    """Process-wide totals of the same measurements, for /metrics."""
+
+    def __init__(self):
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.pool_checkouts = 0
+        self.pool_wait_seconds = 0.0
+
+
+db_metrics = DatabaseMetrics()
+
+
+# Timing of the request being handled. The object is shared, not copied, so
+# work in child tasks and SQLAlchemy's greenlets is charged to the same request.
+_current_timing: ContextVar[Optional[RequestTiming]] = ContextVar("request_timing", default=None)
+
+
+def start_request_timing() -> RequestTiming:
+    timing = RequestTiming()
+    _current_timing.set(timing)
+    return timing
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Connection pool that charges checkout waits to the current request."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started
+            db_metrics.pool_checkouts += 1
+            db_metrics.pool_wait_seconds += waited
+            timing = _current_timing.get()
+            if timing is not None:
+                timing.pool_checkouts += 1
+                timing.pool_wait_seconds += waited
+
+
+def instrument_engine(sync_engine: Engine) -> None:
+    """Count statements and sum their time for the request that runs them."""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _finish_query(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info.pop("query_started")
+        db_metrics.queries += 1
+        db_metrics.query_seconds += duration
+        timing = _current_timing.get()
+        if timing is not None:
+            timing.db_queries += 1
+            timing.db_seconds += duration
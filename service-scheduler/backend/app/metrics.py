@@ -0,0 +1,213 @@
+from fastapi import Request
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from app.config import settings
+from app.database import engine
+from app.instrumentation import db_metrics
+from app.auth.security import hash_metrics
+from app.auth.user_cache import user_cache
+from app.auth.token_cache import token_cache
+from app.cache.slots import slot_cache_metrics
+from app.idempotency import idempotency_metrics
+from app.realtime import slot_events
+from app.tasks import post_commit
+
+# Prometheus text exposition format, rendered in-process so every replica can
+# be scraped without a client library or a sidecar
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Request latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for requests that matched no route, so scanners probing random
+# paths cannot grow the series without bound
+UNMATCHED_ROUTE = "unmatched"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _sample(name: str, value: float, labels: Optional[Dict[str, str]] = None) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+        return f"{name}{{{rendered}}} {value}"
+    return f"{name} {value}"
+
+
+def _metric(name: str, kind: str, documentation: str, samples: Iterable[str]) -> List[str]:
+    return [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}", *samples]
+
+
+def _task_samples(name: str, counts: Dict[str, int]) -> List[str]:
+    return [_sample(name, count, {"task": task}) for task, count in sorted(counts.items())]
+
+
+class Histogram:
+    """Cumulative histogram keyed by a fixed tuple of label values."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # label values -> (per-bucket counts with a final +Inf slot, sum, count)
+        self._series: Dict[Tuple[str, ...], List] = {}
+
+    def observe(self, label_values: Tuple[str, ...], value: float) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        samples = []
+        for label_values, (counts, total, count) in sorted(self._series.items()):
+            labels = dict(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                samples.append(_sample(f"{self.name}_bucket", cumulative, {**labels, "le": str(bound)}))
+            samples.append(_sample(f"{self.name}_bucket", count, {**labels, "le": "+Inf"}))
+            samples.append(_sample(f"{self.name}_sum", total, labels))
+            samples.append(_sample(f"{self.name}_count", count, labels))
+        return _metric(self.name, "histogram", self.documentation, samples)
+
+
+class HttpMetrics:
+    """Request latency per route and the number of requests being handled."""
+
+    def __init__(self):
+        self.in_flight: Dict[str, int] = {}
+        self.latency = Histogram(
+            "scheduler_http_request_duration_seconds",
+            "Time to produce response headers, by route template.",
+            ("method", "route", "status"),
+            LATENCY_BUCKETS
+        )
+
+    def request_started(self, request: Request) -> None:
+        self.in_flight[request.method] = self.in_flight.get(request.method, 0) + 1
+
+    def request_finished(self, request: Request, status_code: int, seconds: float) -> None:
+        self.in_flight[request.method] -= 1
+        route = request.scope.get("route")
+        self.latency.observe(
+            (request.method, getattr(route, "path", UNMATCHED_ROUTE), str(status_code)),
+            seconds
+        )
+
+    def render(self) -> List[str]:
+        return [
+            *self.latency.render(),
+            *_metric(
+                "scheduler_http_requests_in_flight", "gauge",
+                "Requests currently being handled.",
+                [_sample("scheduler_http_requests_in_flight", count, {"method": method})
+                 for method, count in sorted(self.in_flight.items())]
+            ),
+        ]
+
+
+http_metrics = HttpMetrics()
+
+
+def render_metrics() -> str:
+    """Render every process metric in the Prometheus text format."""
+    pool = engine.pool
+    user_stats = user_cache.stats()
+    token_stats = token_cache.stats()
+    slot_lookups = slot_cache_metrics.hits + slot_cache_metrics.misses
+    task_metrics = post_commit.metrics
+
+    lines = [
+        *http_metrics.render(),
+
+        # Database pool and statements (app/instrumentation.py)
+        *_metric("scheduler_db_pool_size", "gauge", "Configured pool size.",
+                 [_sample("scheduler_db_pool_size", pool.size())]),
+        *_metric("scheduler_db_pool_checked_out", "gauge", "Connections currently in use.",
+                 [_sample("scheduler_db_pool_checked_out", pool.checkedout())]),
+        *_metric("scheduler_db_pool_connections", "gauge", "Connections currently open.",
+                 [_sample("scheduler_db_pool_connections", pool.checkedin() + pool.checkedout())]),
+        # SQLAlchemy counts overflow from -pool_size while the pool fills up
+        *_metric("scheduler_db_pool_overflow", "gauge", "Connections open beyond the pool size.",
+                 [_sample("scheduler_db_pool_overflow", max(pool.overflow(), 0))]),
+        *_metric("scheduler_db_pool_checkouts_total", "counter", "Connections handed out by the pool.",
+                 [_sample("scheduler_db_pool_checkouts_total", db_metrics.pool_checkouts)]),
+        *_metric("scheduler_db_pool_wait_seconds_total", "counter",
+                 "Time spent acquiring pooled connections (queueing or connecting).",
+                 [_sample("scheduler_db_pool_wait_seconds_total", db_metrics.pool_wait_seconds)]),
+        *_metric("scheduler_db_queries_total", "counter", "SQL statements executed.",
+                 [_sample("scheduler_db_queries_total", db_metrics.queries)]),
+        *_metric("scheduler_db_query_seconds_total", "counter", "Time spent executing SQL statements.",
+                 [_sample("scheduler_db_query_seconds_total", db_metrics.query_seconds)]),
+
+        # Password hashing pool (app/auth/security.py)
+        *_metric("scheduler_password_hash_waiting", "gauge", "Hash operations queued for a worker.",
+                 [_sample("scheduler_password_hash_waiting", hash_metrics.waiting)]),
+        *_metric("scheduler_password_hash_running", "gauge", "Hash operations running.",
+                 [_sample("scheduler_password_hash_running", hash_metrics.running)]),
+        *_metric("scheduler_password_hash_completed_total", "counter", "Hash operations completed.",
+                 [_sample("scheduler_password_hash_completed_total", hash_metrics.completed)]),
+        *_metric("scheduler_password_hash_queue_seconds_total", "counter", "Time hash operations spent queued.",
+                 [_sample("scheduler_password_hash_queue_seconds_total", hash_metrics.queue_seconds_total)]),
+
+        # Caches
+        *_metric("scheduler_cache_hits_total", "counter", "Cache lookups answered from the cache.", [
+            _sample("scheduler_cache_hits_total", user_stats["hits"], {"cache": "users"}),
+            _sample("scheduler_cache_hits_total", token_stats["hits"], {"cache": "tokens"}),
+            _sample("scheduler_cache_hits_total", slot_cache_metrics.hits, {"cache": "slot_pages"}),
+        ]),
+        *_metric("scheduler_cache_misses_total", "counter", "Cache lookups that fell through.", [
+            _sample("scheduler_cache_misses_total", user_stats["misses"], {"cache": "users"}),
+            _sample("scheduler_cache_misses_total", token_stats["misses"], {"cache": "tokens"}),
+            _sample("scheduler_cache_misses_total", slot_cache_metrics.misses, {"cache": "slot_pages"}),
+        ]),
+        *_metric("scheduler_cache_hit_ratio", "gauge", "Hits over lookups since process start.", [
+            _sample("scheduler_cache_hit_ratio", user_stats["hit_ratio"], {"cache": "users"}),
+            _sample("scheduler_cache_hit_ratio", token_stats["hit_ratio"], {"cache": "tokens"}),
+            _sample(
+                "scheduler_cache_hit_ratio",
+                slot_cache_metrics.hits / slot_lookups if slot_lookups else 0.0,
+                {"cache": "slot_pages"}
+            ),
+        ]),
+        *_metric("scheduler_cache_entries", "gauge", "Entries held by in-process caches.", [
+            _sample("scheduler_cache_entries", user_stats["size"], {"cache": "users"}),
+            _sample("scheduler_cache_entries", token_stats["size"], {"cache": "tokens"}),
+        ]),
+        *_metric("scheduler_slot_cache_errors_total", "counter", "Redis errors in the slot page cache.",
+                 [_sample("scheduler_slot_cache_errors_total", slot_cache_metrics.errors)]),
+
+        # Idempotency keys (app/idempotency.py)
+        *_metric("scheduler_idempotent_requests_total", "counter", "Requests sent with an Idempotency-Key.", [
+            _sample("scheduler_idempotent_requests_total", idempotency_metrics.executed, {"outcome": "executed"}),
+            _sample("scheduler_idempotent_requests_total", idempotency_metrics.replayed, {"outcome": "replayed"}),
+            _sample("scheduler_idempotent_requests_total", idempotency_metrics.conflicts, {"outcome": "conflict"}),
+        ]),
+
+        # Live slot events (app/realtime.py)
+        *_metric("scheduler_slot_event_subscribers", "gauge", "Open slot event streams.",
+                 [_sample("scheduler_slot_event_subscribers", slot_events.subscriber_count)]),
+
+        # Post-commit task queue (app/tasks.py)
+        *_metric("scheduler_task_queue_depth", "gauge", "Jobs waiting for a worker.",
+                 [_sample("scheduler_task_queue_depth", post_commit.depth)]),
+        *_metric("scheduler_task_queue_capacity", "gauge", "Jobs the queue holds before running them inline.",
+                 [_sample("scheduler_task_queue_capacity", settings.task_queue_max_size)]),
+        *_metric("scheduler_task_queue_running", "gauge", "Jobs running, retry backoff included.",
+                 [_sample("scheduler_task_queue_running", task_metrics.running)]),
+        *_metric("scheduler_tasks_completed_total", "counter", "Jobs that succeeded.",
+                 _task_samples("scheduler_tasks_completed_total", task_metrics.completed)),
+        *_metric("scheduler_tasks_failed_total", "counter", "Jobs that failed on their last attempt.",
+                 _task_samples("scheduler_tasks_failed_total", task_metrics.failed)),
+        *_metric("scheduler_task_retries_total", "counter", "Failed attempts that were retried.",
+                 _task_samples("scheduler_task_retries_total", task_metrics.retries)),
+        *_metric("scheduler_tasks_inline_total", "counter",
+                 "Jobs run in the request because the queue was full or stopped.",
+                 _task_samples("scheduler_tasks_inline_total", task_metrics.inline)),
+    ]
+    return "\n".join(lines) + "\n"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Text, DateTime, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Column, Text, DateTime, ForeignKey, Enum, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -26,6 +26,8 @@ class Booking(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint("slot_id", "user_id", name="unique_slot_user_booking"),
+        Index("idx_bookings_booked_at_id", "booked_at", "id"),
+        Index("idx_bookings_user_booked_at_id", "user_id", "booked_at", "id"),
     )
 
     # Relationships
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.database import Base
+import uuid
+import enum
+
+
+class RevocationReason(str, enum.Enum):
+    # Exchanged for a new token; presenting it again means it was copied
+    ROTATED = "rotated"
+    LOGGED_OUT = "logged_out"
+    # Revoked with the rest of its user's sessions after a rotated token was reused
+    REUSE_DETECTED = "reuse_detected"
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    # SHA-256 of the token; the token itself is only ever held by the client
+    token_hash = Column(String(64), unique=True, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set when the token is rotated or the session logs out
+    revoked_at = Column(DateTime(timezone=True))
+    revoked_reason = Column(Enum(RevocationReason))
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, expires_at={self.expires_at})>"
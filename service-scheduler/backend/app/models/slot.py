@@ -1,7 +1,7 @@
-from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, ForeignKey, CheckConstraint
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, Boolean, DateTime, Integer, ForeignKey, CheckConstraint, Index, Computed, DDL, event
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR, ExcludeConstraint
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from app.database import Base
 import uuid
 
@@ -20,11 +20,33 @@ class Slot(Base):
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Stemmed title (weight A) and description (B) for ranked matches, plus
+    # unstemmed words so prefix queries match what the user actually typed.
+    # Deferred: only the search filter reads it, never the ORM entity.
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+            "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True
+        )
+    ))
 
     # Constraints
     __table_args__ = (
         CheckConstraint("end_time > start_time", name="valid_time_range"),
         CheckConstraint("current_participants <= max_participants", name="valid_participants"),
+        Index("idx_slots_start_time_id", "start_time", "id"),
+        # No two slots of one creator overlap; its GiST index also answers
+        # the overlap checks in app/services/slot_conflicts.py (needs btree_gist for the UUID)
+        ExcludeConstraint(
+            (created_by, "="),
+            (func.tstzrange(start_time, end_time), "&&"),
+            name="no_overlapping_creator_slots",
+            using="gist"
+        ),
+        Index("idx_slots_search_vector", "search_vector", postgresql_using="gin"),
     )
 
     # Relationships
@@ -41,3 +63,35 @@ class Slot(Base):
 
     def __repr__(self):
         return f"<Slot(id={self.id}, title={self.title}, start_time={self.start_time})>"
+
+
+# Slot change notifications for app/realtime.py, mirroring hasura/init.sql for
+# databases whose tables are created by init_db
+event.listen(Slot.__table__, "after_create", DDL("""
+    CREATE OR REPLACE FUNCTION notify_slot_change()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        changed RECORD;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            changed := OLD;
+        ELSE
+            changed := NEW;
+        END IF;
+
+        PERFORM pg_notify('slot_changes', json_build_object(
+            'op', lower(TG_OP),
+            'id', changed.id,
+            'is_available', changed.is_available,
+            'current_participants', changed.current_participants,
+            'max_participants', changed.max_participants
+        )::text);
+        RETURN NULL;
+    END;
+    $$ language 'plpgsql'
+"""))
+event.listen(Slot.__table__, "after_create", DDL("""
+    CREATE TRIGGER notify_slot_change_trigger
+        AFTER INSERT OR UPDATE OR DELETE ON slots
+        FOR EACH ROW EXECUTE FUNCTION notify_slot_change()
+"""))
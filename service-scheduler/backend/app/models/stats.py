@@ -0,0 +1,54 @@
+from sqlalchemy import Table, Column, MetaData, Date, BigInteger, DDL, event
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.booking import Booking
+
+# Per-creator, per-day utilization, refreshed on a schedule by
+# app/services/utilization.py. Kept out of Base.metadata: create_all must not
+# create it as a table; the DDL below (mirroring hasura/init.sql) builds it
+# once the tables it reads exist.
+slot_utilization_daily = Table(
+    "slot_utilization_daily",
+    MetaData(),
+    Column("created_by", UUID(as_uuid=True), nullable=False),
+    Column("day", Date, nullable=False),
+    Column("slots_offered", BigInteger, nullable=False),
+    Column("spots_offered", BigInteger, nullable=False),
+    Column("spots_filled", BigInteger, nullable=False),
+    Column("unavailable_slots", BigInteger, nullable=False),
+    Column("bookings", BigInteger, nullable=False),
+    Column("cancellations", BigInteger, nullable=False),
+)
+
+# Days are UTC. The status is compared case-insensitively because init.sql
+# labels the enum 'cancelled' while create_all uses the member name.
+event.listen(Booking.__table__, "after_create", DDL("""
+    CREATE MATERIALIZED VIEW slot_utilization_daily AS
+    SELECT
+        s.created_by,
+        (s.start_time AT TIME ZONE 'UTC')::date AS day,
+        count(*) AS slots_offered,
+        sum(s.max_participants) AS spots_offered,
+        sum(s.current_participants) AS spots_filled,
+        count(*) FILTER (
+            WHERE NOT s.is_available OR s.current_participants >= s.max_participants
+        ) AS unavailable_slots,
+        coalesce(sum(b.bookings), 0) AS bookings,
+        coalesce(sum(b.cancellations), 0) AS cancellations
+    FROM slots s
+    LEFT JOIN (
+        SELECT
+            slot_id,
+            count(*) AS bookings,
+            count(*) FILTER (WHERE lower(status::text) = 'cancelled') AS cancellations
+        FROM bookings
+        GROUP BY slot_id
+    ) b ON b.slot_id = s.id
+    GROUP BY s.created_by, (s.start_time AT TIME ZONE 'UTC')::date
+"""))
+# The unique index is what allows REFRESH ... CONCURRENTLY
+event.listen(Booking.__table__, "after_create", DDL(
+    "CREATE UNIQUE INDEX idx_slot_utilization_daily_creator_day ON slot_utilization_daily (created_by, day)"
+))
+event.listen(Booking.__table__, "after_create", DDL(
+    "CREATE INDEX idx_slot_utilization_daily_day ON slot_utilization_daily (day)"
+))
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, DDL, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -35,3 +35,21 @@ class User(Base):
 
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, role={self.role})>"
+
+
+# User change notifications for app/auth/user_cache.py, mirroring
+# hasura/init.sql for databases whose tables are created by init_db
+event.listen(User.__table__, "after_create", DDL("""
+    CREATE OR REPLACE FUNCTION notify_user_change()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        PERFORM pg_notify('user_changes', OLD.id::text);
+        RETURN NULL;
+    END;
+    $$ language 'plpgsql'
+"""))
+event.listen(User.__table__, "after_create", DDL("""
+    CREATE TRIGGER notify_user_change_trigger
+        AFTER UPDATE OR DELETE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_user_change()
+"""))
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Text, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.database import Base
+import uuid
+import enum
+
+
+class WaitlistStatus(str, enum.Enum):
+    WAITING = "waiting"
+    PROMOTED = "promoted"
+    CANCELLED = "cancelled"
+
+
+class WaitlistEntry(Base):
+    __tablename__ = "waitlist_entries"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    slot_id = Column(UUID(as_uuid=True), ForeignKey("slots.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(Enum(WaitlistStatus), nullable=False, default=WaitlistStatus.WAITING)
+    notes = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    promoted_at = Column(DateTime(timezone=True))
+    # Booking created on promotion
+    booking_id = Column(UUID(as_uuid=True), ForeignKey("bookings.id", ondelete="SET NULL"))
+
+    # Constraints
+    __table_args__ = (
+        # One place in the queue per user and slot
+        Index(
+            "unique_waiting_slot_user",
+            "slot_id", "user_id",
+            unique=True,
+            postgresql_where=(status == WaitlistStatus.WAITING)
+        ),
+        # Queue order per slot, for positions and for the promoter
+        Index(
+            "idx_waitlist_waiting_slot_created",
+            "slot_id", "created_at", "id",
+            postgresql_where=(status == WaitlistStatus.WAITING)
+        ),
+    )
+
+    def __repr__(self):
+        return f"<WaitlistEntry(id={self.id}, slot_id={self.slot_id}, user_id={self.user_id}, status={self.status})>"
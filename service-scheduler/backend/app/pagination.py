@@ -0,0 +1,50 @@
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from datetime import datetime
+from typing import Any, Optional, Tuple
+from uuid import UUID
+import base64
+import json
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime, row_id: UUID) -> str:
+    """Encode the keyset position of a row as an opaque cursor token."""
+    raw = json.dumps([sort_value.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor token back into its (sort value, id) position."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), UUID(row_id)
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_condition(sort_column: Any, id_column: Any, cursor: str, descending: bool = False):
+    """Build the row-value comparison selecting rows after the cursor position.
+
+    Matches an ``ORDER BY sort_column, id_column`` (both ascending or both
+    descending) so the composite index can seek straight to the page start.
+    """
+    sort_value, row_id = decode_cursor(cursor)
+    position = tuple_(sort_column, id_column)
+    if descending:
+        return position < tuple_(sort_value, row_id)
+    return position > tuple_(sort_value, row_id)
+
+
+def next_cursor(rows: list, limit: int, sort_attr: str) -> Optional[str]:
+    """Return the cursor for the page after ``rows``, or None on the last page."""
+    if len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(getattr(last, sort_attr), last.id)
@@ -0,0 +1,170 @@
+from sqlalchemy.engine import make_url
+from typing import AsyncIterator, Callable, Dict, Optional, Set, Tuple
+from app.config import settings
+import asyncio
+import asyncpg
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Channel the notify_slot_change trigger publishes to (see hasura/init.sql)
+SLOT_CHANNEL = "slot_changes"
+
+# Sent to subscribers that may have missed changes; they should refetch
+RESYNC_EVENT = "event: resync\ndata: {}\n\n"
+
+_RECONNECT_MIN_SECONDS = 1.0
+_RECONNECT_MAX_SECONDS = 30.0
+
+
+class Subscription:
+    """Bounded queue of slot change payloads for one connected client.
+
+    A client that cannot keep up loses its backlog and gets a single resync
+    event instead, so a slow reader never holds memory for the whole process.
+    """
+
+    def __init__(self, maxsize: int):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self._resync = False
+
+    def push(self, payload: str) -> None:
+        try:
+            self._queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            self._resync = True
+
+    def request_resync(self) -> None:
+        self._resync = True
+        try:
+            # Wake a waiting reader; a full queue means nobody is waiting
+            self._queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+    async def next_event(self) -> str:
+        """Wait for the next change, formatted as a server-sent event."""
+        payload = await self._queue.get()
+        if self._resync:
+            self._resync = False
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            return RESYNC_EVENT
+        return f"event: slot\ndata: {payload}\n\n"
+
+
+class SlotEventBroker:
+    """Fans Postgres slot notifications out to the clients of this process.
+
+    One dedicated connection LISTENs on the slot channel no matter how many
+    clients are subscribed. It sits outside the SQLAlchemy pool so it never
+    takes a connection away from requests, and reconnects with backoff if it
+    drops. Other channels can share the connection through ``listen``.
+    """
+
+    def __init__(self):
+        self._subscriptions: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        # channel -> (payload handler, called after a reconnect that may have lost payloads)
+        self._channels: Dict[str, Tuple[Callable[[str], None], Callable[[], None]]] = {}
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self) -> Subscription:
+        subscription = Subscription(settings.slot_events_queue_size)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def publish(self, payload: str) -> None:
+        for subscription in self._subscriptions:
+            subscription.push(payload)
+
+    def listen(self, channel: str, on_payload: Callable[[str], None], on_missed: Callable[[], None]) -> None:
+        """Also deliver ``channel`` notifications; call before ``start``."""
+        self._channels[channel] = (on_payload, on_missed)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.publish(payload)
+
+    def _on_channel_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self._channels[channel][0](payload)
+        except Exception as e:
+            logger.error(f"Handling a '{channel}' notification failed: {e}")
+
+    async def _listen(self) -> None:
+        dsn = make_url(settings.database_url).set(drivername="postgresql")
+        delay = _RECONNECT_MIN_SECONDS
+        first_attempt = True
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(SLOT_CHANNEL, self._on_notify)
+                for channel in self._channels:
+                    await connection.add_listener(channel, self._on_channel_notify)
+                logger.info(f"Listening for slot changes on '{SLOT_CHANNEL}'")
+
+                # Changes made while we were disconnected were never delivered
+                if not first_attempt:
+                    for subscription in self._subscriptions:
+                        subscription.request_resync()
+                    for _, on_missed in self._channels.values():
+                        on_missed()
+                first_attempt = False
+                delay = _RECONNECT_MIN_SECONDS
+
+                await lost.wait()
+                logger.warning("Slot change listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                first_attempt = False
+                logger.error(f"Slot change listener failed, retrying in {delay:.0f}s: {e}")
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, _RECONNECT_MAX_SECONDS)
+
+
+slot_events = SlotEventBroker()
+
+
+async def slot_event_stream() -> AsyncIterator[str]:
+    """Yield server-sent slot change events until the client goes away."""
+    subscription = slot_events.subscribe()
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                yield await asyncio.wait_for(
+                    subscription.next_event(),
+                    timeout=settings.slot_events_keepalive_seconds
+                )
+            except asyncio.TimeoutError:
+                # Comment line that keeps proxies from closing an idle stream
+                yield ": keepalive\n\n"
+    finally:
+        slot_events.unsubscribe(subscription)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
@@ -18,6 +18,11 @@ class BookingCreate(BookingBase):
     slot_id: UUID
 
 
+class BulkBookingCreate(BookingBase):
+    slot_ids: List[UUID] = Field(..., min_length=1, max_length=50)
+    all_or_nothing: bool = Field(False, description="Book nothing unless every slot can be booked")
+
+
 class BookingUpdate(BaseModel):
     notes: Optional[str] = None
     status: Optional[BookingStatus] = None
@@ -35,6 +40,19 @@ class BookingResponse(BookingBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class BulkBookingItem(BaseModel):
+    slot_id: UUID
+    booked: bool
+    booking: Optional[BookingResponse] = None
+    detail: Optional[str] = None
+
+
+class BulkBookingResult(BaseModel):
+    booked: int
+    failed: int
+    results: List[BulkBookingItem]
+
+
 class BookingWithDetails(BookingResponse):
     slot: "SlotResponse"
     user: "UserResponse"
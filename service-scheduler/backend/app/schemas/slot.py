@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
+from typing import List, Optional
+from datetime import date, datetime, time
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import enum
 
 
 class SlotBase(BaseModel):
@@ -25,6 +27,53 @@ class SlotUpdate(BaseModel):
     is_available: Optional[bool] = None
 
 
+class SlotSeriesCreate(BaseModel):
+    """Weekly recurrence expanded into individual slots on the server."""
+    title: str = Field(..., min_length=1, max_length=255)
+    description: Optional[str] = None
+    max_participants: int = Field(default=1, ge=1, le=100)
+    weekdays: List[int] = Field(..., min_length=1, description="ISO weekdays, 1 = Monday ... 7 = Sunday")
+    start_times: List[time] = Field(..., min_length=1, description="Local start times on each weekday")
+    duration_minutes: int = Field(..., ge=1, le=24 * 60)
+    starts_on: date
+    until: Optional[date] = Field(None, description="Last date (inclusive) to generate slots on")
+    count: Optional[int] = Field(None, ge=1, description="Number of slots to generate")
+    timezone: str = Field("UTC", description="IANA time zone the dates and times are in")
+
+    @field_validator("weekdays")
+    @classmethod
+    def validate_weekdays(cls, weekdays: List[int]) -> List[int]:
+        if any(day < 1 or day > 7 for day in weekdays):
+            raise ValueError("Weekdays must be between 1 (Monday) and 7 (Sunday)")
+        return sorted(set(weekdays))
+
+    @field_validator("start_times")
+    @classmethod
+    def validate_start_times(cls, start_times: List[time]) -> List[time]:
+        # An offset would conflict with the series' time zone, so refuse it
+        # rather than pick one
+        if any(start.tzinfo is not None for start in start_times):
+            raise ValueError("Start times must not carry an offset; set timezone instead")
+        return start_times
+
+    @field_validator("timezone")
+    @classmethod
+    def validate_timezone(cls, timezone: str) -> str:
+        try:
+            ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown time zone: {timezone}")
+        return timezone
+
+    @model_validator(mode="after")
+    def validate_end(self) -> "SlotSeriesCreate":
+        if (self.until is None) == (self.count is None):
+            raise ValueError("Provide exactly one of until or count")
+        if self.until is not None and self.until < self.starts_on:
+            raise ValueError("until must not be before starts_on")
+        return self
+
+
 class SlotResponse(SlotBase):
     id: UUID
     is_available: bool
@@ -38,6 +87,19 @@ class SlotResponse(SlotBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class CalendarGranularity(str, enum.Enum):
+    DAY = "day"
+    HOUR = "hour"
+
+
+class SlotCalendarBucket(BaseModel):
+    """Occupancy of the slots starting within one day or hour."""
+    period_start: datetime
+    slot_count: int
+    free_spots: int
+    first_available: Optional[datetime] = Field(None, description="Earliest slot in the period that can still be booked")
+
+
 class SlotWithCreator(SlotResponse):
     creator: "UserResponse"
 
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import date
+from uuid import UUID
+import enum
+
+
+class StatsGranularity(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+
+
+class UtilizationStats(BaseModel):
+    """Utilization of one creator's slots starting within one day or week."""
+    created_by: UUID
+    period_start: date
+    slots_offered: int
+    spots_offered: int
+    spots_filled: int
+    bookings: int
+    cancellations: int
+    fill_rate: float
+    cancellation_rate: float
+    no_availability_ratio: float
@@ -48,9 +48,19 @@ class Token(BaseModel):
     access_token: str
     token_type: str
     expires_in: int
+    refresh_token: Optional[str] = None
     user: UserResponse
 
 
+class StreamToken(BaseModel):
+    token: str
+    expires_in: int
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(..., min_length=1, max_length=128)
+
+
 class TokenData(BaseModel):
     user_id: Optional[UUID] = None
     email: Optional[str] = None
@@ -0,0 +1,30 @@
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
+from datetime import datetime
+from uuid import UUID
+from enum import Enum
+
+
+class WaitlistStatus(str, Enum):
+    WAITING = "waiting"
+    PROMOTED = "promoted"
+    CANCELLED = "cancelled"
+
+
+class WaitlistJoin(BaseModel):
+    slot_id: UUID
+    notes: Optional[str] = None
+
+
+class WaitlistEntryResponse(BaseModel):
+    id: UUID
+    slot_id: UUID
+    user_id: UUID
+    status: WaitlistStatus
+    notes: Optional[str] = None
+    created_at: datetime
+    promoted_at: Optional[datetime] = None
+    booking_id: Optional[UUID] = Field(None, description="Booking made when the entry was promoted")
+    position: Optional[int] = Field(None, description="1-based place in the slot's queue while waiting")
+
+    model_config = ConfigDict(from_attributes=True)
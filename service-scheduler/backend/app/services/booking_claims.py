@@ -0,0 +1,246 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, literal, Text
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert, UUID as PG_UUID
+from typing import Dict, List, Optional, Union
+from uuid import UUID
+from app.models.slot import Slot
+from app.models.booking import Booking, BookingStatus
+import uuid
+import enum
+
+
+class ClaimFailure(str, enum.Enum):
+    SLOT_NOT_FOUND = "slot_not_found"
+    SLOT_UNAVAILABLE = "slot_unavailable"
+    ALREADY_BOOKED = "already_booked"
+
+
+async def claim_slot(
+    db: AsyncSession,
+    slot_id: UUID,
+    user_id: UUID,
+    notes: Optional[str] = None
+) -> Optional[Booking]:
+    """Claim a spot on a slot in a single statement.
+
+    The slot row is updated only while it is open (``is_available``, which
+    only admins set), has capacity and the user holds no
+    active booking on it; the booking is inserted from that update's RETURNING,
+    so the capacity check, counter increment and insert happen atomically under
+    the slot's row lock. A previously cancelled booking for the same user and
+    slot is reactivated instead of violating ``unique_slot_user_booking``.
+
+    Returns the booking, or None if nothing was claimed. The caller owns the
+    transaction and must roll back on None, since a lost race on the unique
+    constraint can leave the counter incremented without a booking row.
+    """
+    already_booked = (
+        select(Booking.id)
+        .where(
+            Booking.slot_id == slot_id,
+            Booking.user_id == user_id,
+            Booking.status == BookingStatus.ACTIVE
+        )
+        .exists()
+    )
+    claimed = (
+        update(Slot)
+        .where(
+            Slot.id == slot_id,
+            Slot.is_available.is_(True),
+            Slot.current_participants < Slot.max_participants,
+            ~already_booked
+        )
+        .values(current_participants=Slot.current_participants + 1)
+        .returning(Slot.id)
+        .cte("claimed")
+    )
+    insert_booking = (
+        pg_insert(Booking)
+        .from_select(
+            ["id", "slot_id", "user_id", "status", "notes"],
+            select(
+                literal(uuid.uuid4(), PG_UUID(as_uuid=True)),
+                claimed.c.id,
+                literal(user_id, PG_UUID(as_uuid=True)),
+                literal(BookingStatus.ACTIVE, Booking.status.type),
+                literal(notes, Text)
+            )
+        )
+        .add_cte(claimed)
+    )
+    insert_booking = insert_booking.on_conflict_do_update(
+        constraint="unique_slot_user_booking",
+        set_={
+            "status": BookingStatus.ACTIVE,
+            "notes": insert_booking.excluded.notes,
+            "booked_at": insert_booking.excluded.booked_at,
+            "cancelled_at": None
+        },
+        where=Booking.status == BookingStatus.CANCELLED
+    ).returning(Booking)
+
+    result = await db.execute(
+        select(Booking)
+        .from_statement(insert_booking)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def claim_slots(
+    db: AsyncSession,
+    slot_ids: List[UUID],
+    user_id: UUID,
+    notes: Optional[str] = None,
+    all_or_nothing: bool = False
+) -> Dict[UUID, Union[Booking, ClaimFailure]]:
+    """Claim spots on several slots with a constant number of statements.
+
+    All slots are locked and validated in one ``SELECT ... FOR UPDATE`` (in
+    id order, so concurrent bulk claims cannot deadlock), then the counters
+    are bumped with one UPDATE and the bookings written with one multi-row
+    INSERT. With ``all_or_nothing`` nothing is written unless every slot can
+    be claimed. The caller owns the transaction.
+
+    Returns the booking or failure reason for each requested slot id.
+    """
+    already_booked = (
+        select(Booking.id)
+        .where(
+            Booking.slot_id == Slot.id,
+            Booking.user_id == user_id,
+            Booking.status == BookingStatus.ACTIVE
+        )
+        .exists()
+    )
+    result = await db.execute(
+        select(
+            Slot.id,
+            Slot.is_available,
+            Slot.current_participants,
+            Slot.max_participants,
+            already_booked.label("already_booked")
+        )
+        .where(Slot.id.in_(slot_ids))
+        .order_by(Slot.id)
+        .with_for_update(of=Slot)
+    )
+    slots = {row.id: row for row in result.all()}
+
+    outcomes: Dict[UUID, Union[Booking, ClaimFailure]] = {}
+    claimable: List[UUID] = []
+    for slot_id in slot_ids:
+        slot = slots.get(slot_id)
+        if slot is None:
+            outcomes[slot_id] = ClaimFailure.SLOT_NOT_FOUND
+        elif slot.already_booked:
+            outcomes[slot_id] = ClaimFailure.ALREADY_BOOKED
+        elif not slot.is_available or slot.current_participants >= slot.max_participants:
+            outcomes[slot_id] = ClaimFailure.SLOT_UNAVAILABLE
+        else:
+            claimable.append(slot_id)
+
+    if not claimable or (all_or_nothing and outcomes):
+        return outcomes
+
+    await db.execute(
+        update(Slot)
+        .where(Slot.id.in_(claimable))
+        .values(current_participants=Slot.current_participants + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+    insert_bookings = pg_insert(Booking).values([
+        {
+            "id": uuid.uuid4(),
+            "slot_id": slot_id,
+            "user_id": user_id,
+            "status": BookingStatus.ACTIVE,
+            "notes": notes,
+        }
+        for slot_id in claimable
+    ])
+    insert_bookings = insert_bookings.on_conflict_do_update(
+        constraint="unique_slot_user_booking",
+        set_={
+            "status": BookingStatus.ACTIVE,
+            "notes": insert_bookings.excluded.notes,
+            "booked_at": func.now(),
+            "cancelled_at": None
+        },
+        where=Booking.status == BookingStatus.CANCELLED
+    ).returning(Booking)
+    result = await db.execute(
+        select(Booking)
+        .from_statement(insert_bookings)
+        .execution_options(populate_existing=True)
+    )
+    for booking in result.scalars().all():
+        outcomes[booking.slot_id] = booking
+
+    # A concurrent single claim by the same user can win the unique constraint
+    # between our lock and insert; give those counter bumps back
+    lost = [slot_id for slot_id in claimable if slot_id not in outcomes]
+    if lost:
+        await db.execute(
+            update(Slot)
+            .where(Slot.id.in_(lost))
+            .values(current_participants=Slot.current_participants - 1)
+            .execution_options(synchronize_session=False)
+        )
+        for slot_id in lost:
+            outcomes[slot_id] = ClaimFailure.ALREADY_BOOKED
+
+    return outcomes
+
+
+async def diagnose_claim_failure(
+    db: AsyncSession,
+    slot_id: UUID,
+    user_id: UUID
+) -> ClaimFailure:
+    """Work out why ``claim_slot`` claimed nothing (failure path only)."""
+    result = await db.execute(
+        select(Slot.is_available, Slot.current_participants, Slot.max_participants)
+        .where(Slot.id == slot_id)
+    )
+    slot = result.one_or_none()
+    if slot is None:
+        return ClaimFailure.SLOT_NOT_FOUND
+
+    result = await db.execute(
+        select(Booking.id).where(
+            Booking.slot_id == slot_id,
+            Booking.user_id == user_id,
+            Booking.status == BookingStatus.ACTIVE
+        )
+    )
+    if result.first() is not None:
+        return ClaimFailure.ALREADY_BOOKED
+
+    return ClaimFailure.SLOT_UNAVAILABLE
+
+
+async def release_booking(db: AsyncSession, booking_id: UUID) -> bool:
+    """Cancel an active booking and free its spot in a single statement.
+
+    Returns False if the booking was not active (e.g. a concurrent cancel won).
+    """
+    released = (
+        update(Booking)
+        .where(Booking.id == booking_id, Booking.status == BookingStatus.ACTIVE)
+        .values(status=BookingStatus.CANCELLED, cancelled_at=func.now())
+        .returning(Booking.slot_id)
+        .cte("released")
+    )
+    result = await db.execute(
+        update(Slot)
+        .where(Slot.id == released.c.slot_id)
+        .values(current_participants=Slot.current_participants - 1)
+        .add_cte(released)
+        .returning(Slot.id)
+        .execution_options(synchronize_session=False)
+    )
+    return result.first() is not None
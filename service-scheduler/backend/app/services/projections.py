@@ -0,0 +1,111 @@
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased
+from pydantic import BaseModel
+from typing import Any, Dict, Iterable, List, Type, TypeVar
+from app.models.user import User
+from app.models.slot import Slot
+from app.models.booking import Booking, BookingStatus
+
+# List endpoints select only the columns their response schema reads, with the
+# derived fields computed in SQL, and build the response models straight from
+# the rows: no identity map, no ORM bookkeeping, no password_hash crossing the
+# wire. Joined columns are labelled "<key>__<field>"; other labels keep the
+# model attribute names, so next_cursor and weak_etag work on the rows directly.
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def slot_columns(prefix: str = "") -> List[Any]:
+    """Columns of SlotResponse, including its computed fields."""
+    return [
+        Slot.id.label(f"{prefix}id"),
+        Slot.title.label(f"{prefix}title"),
+        Slot.description.label(f"{prefix}description"),
+        Slot.start_time.label(f"{prefix}start_time"),
+        Slot.end_time.label(f"{prefix}end_time"),
+        Slot.max_participants.label(f"{prefix}max_participants"),
+        Slot.is_available.label(f"{prefix}is_available"),
+        Slot.current_participants.label(f"{prefix}current_participants"),
+        Slot.created_by.label(f"{prefix}created_by"),
+        Slot.created_at.label(f"{prefix}created_at"),
+        Slot.updated_at.label(f"{prefix}updated_at"),
+        (Slot.max_participants - Slot.current_participants).label(f"{prefix}available_spots"),
+        (Slot.current_participants >= Slot.max_participants).label(f"{prefix}is_full"),
+    ]
+
+
+def user_columns(user: Any, prefix: str = "") -> List[Any]:
+    """Columns of UserResponse for ``user`` (the User entity or an alias of it)."""
+    return [
+        user.id.label(f"{prefix}id"),
+        user.email.label(f"{prefix}email"),
+        user.first_name.label(f"{prefix}first_name"),
+        user.last_name.label(f"{prefix}last_name"),
+        user.role.label(f"{prefix}role"),
+        user.is_active.label(f"{prefix}is_active"),
+        user.created_at.label(f"{prefix}created_at"),
+        user.updated_at.label(f"{prefix}updated_at"),
+        (user.first_name + " " + user.last_name).label(f"{prefix}full_name"),
+    ]
+
+
+def booking_columns(prefix: str = "") -> List[Any]:
+    """Columns of BookingResponse, including its computed fields."""
+    return [
+        Booking.id.label(f"{prefix}id"),
+        Booking.slot_id.label(f"{prefix}slot_id"),
+        Booking.user_id.label(f"{prefix}user_id"),
+        Booking.status.label(f"{prefix}status"),
+        Booking.notes.label(f"{prefix}notes"),
+        Booking.booked_at.label(f"{prefix}booked_at"),
+        Booking.cancelled_at.label(f"{prefix}cancelled_at"),
+        (Booking.status == BookingStatus.ACTIVE).label(f"{prefix}is_active"),
+    ]
+
+
+def slot_with_creator_query() -> Select:
+    """Select SlotWithCreator rows: each slot joined to its creator."""
+    creator = aliased(User)
+    return (
+        select(*slot_columns(), *user_columns(creator, "creator__"))
+        .join(creator, creator.id == Slot.created_by)
+    )
+
+
+def booking_with_details_query() -> Select:
+    """Select BookingWithDetails rows: each booking with its slot and user."""
+    return (
+        select(*booking_columns(), *slot_columns("slot__"), *user_columns(User, "user__"))
+        .select_from(Booking)
+        .join(Slot, Slot.id == Booking.slot_id)
+        .join(User, User.id == Booking.user_id)
+    )
+
+
+def build_models(
+    model: Type[ModelT],
+    rows: Iterable[Row],
+    nested: Dict[str, Type[BaseModel]]
+) -> List[ModelT]:
+    """Build response models from projected rows without validating them again.
+
+    The values come from typed columns of our own tables, so validation would
+    only repeat checks the database already enforces (and EmailStr parsing
+    alone costs more than the query). ``nested`` maps each "<key>__" prefix
+    to the model its columns build.
+    """
+    models = []
+    for row in rows:
+        fields: Dict[str, Any] = {}
+        parts: Dict[str, Dict[str, Any]] = {key: {} for key in nested}
+        for key, value in row._mapping.items():
+            outer, separator, inner = key.partition("__")
+            if separator:
+                parts[outer][inner] = value
+            else:
+                fields[key] = value
+        for key, nested_model in nested.items():
+            fields[key] = nested_model.model_construct(**parts[key])
+        models.append(model.model_construct(**fields))
+    return models
@@ -0,0 +1,126 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, or_
+from sqlalchemy.sql import func
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.models.refresh_token import RefreshToken, RevocationReason
+import hashlib
+import logging
+import secrets
+
+logger = logging.getLogger(__name__)
+
+# A token presented again this soon after its rotation is taken for a
+# duplicate request (two tabs refreshing at once) rather than a stolen copy
+REUSE_GRACE = timedelta(seconds=30)
+
+
+def hash_refresh_token(token: str) -> str:
+    # Refresh tokens are 256 random bits, so a fast digest is enough; there
+    # is nothing for a slow hash like bcrypt to protect against
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def issue_refresh_token(db: AsyncSession, user_id: UUID) -> str:
+    """Create a refresh token for a user and return it (caller commits)."""
+    token = secrets.token_urlsafe(32)
+    db.add(RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.jwt_refresh_token_expire_days)
+    ))
+    return token
+
+
+async def purge_refresh_tokens(user_id: UUID) -> None:
+    """Delete a user's expired tokens and those revoked other than by rotation.
+
+    Rotated tokens are kept until they expire, so a reused copy is still
+    recognised as one; the table holds a user's active sessions plus the
+    tokens they rotated within the refresh token lifetime.
+
+    Runs on the post-commit queue after a token is issued, in its own
+    session, so login and refresh do not wait for it. Errors propagate so
+    the queue retries.
+    """
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            delete(RefreshToken).where(
+                RefreshToken.user_id == user_id,
+                or_(
+                    RefreshToken.expires_at < func.now(),
+                    RefreshToken.revoked_reason.in_(
+                        [RevocationReason.LOGGED_OUT, RevocationReason.REUSE_DETECTED]
+                    )
+                )
+            )
+        )
+        await db.commit()
+
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Optional[User]:
+    """Consume a refresh token and return its user, or None if it is not valid.
+
+    Revoking the token and loading the user is one statement on the unique
+    token_hash index, so two requests can never both consume the same token.
+    Presenting a token that was already rotated (outside ``REUSE_GRACE``)
+    revokes every session of its user, since one of the copies was stolen.
+    A token revoked by logout is just rejected. The caller commits either way.
+    """
+    token_hash = hash_refresh_token(token)
+    consumed = (
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > func.now()
+        )
+        .values(revoked_at=func.now(), revoked_reason=RevocationReason.ROTATED)
+        .returning(RefreshToken.user_id)
+        .cte("consumed")
+    )
+    result = await db.execute(
+        select(User).join(consumed, User.id == consumed.c.user_id)
+    )
+    user = result.scalar_one_or_none()
+    if user is not None:
+        return user
+
+    # Failure path only: was this token rotated before?
+    result = await db.execute(
+        select(RefreshToken.user_id).where(
+            RefreshToken.token_hash == token_hash,
+            RefreshToken.revoked_reason == RevocationReason.ROTATED,
+            RefreshToken.revoked_at < func.now() - REUSE_GRACE
+        )
+    )
+    reused_by = result.scalar_one_or_none()
+    if reused_by is not None:
+        logger.warning(f"Refresh token reuse for user {reused_by}; revoking all of their sessions")
+        await revoke_user_refresh_tokens(db, reused_by, RevocationReason.REUSE_DETECTED)
+    return None
+
+
+async def revoke_refresh_token(db: AsyncSession, token: str) -> None:
+    """Revoke one refresh token, e.g. on logout (caller commits)."""
+    await db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.token_hash == hash_refresh_token(token),
+            RefreshToken.revoked_at.is_(None)
+        )
+        .values(revoked_at=func.now(), revoked_reason=RevocationReason.LOGGED_OUT)
+    )
+
+
+async def revoke_user_refresh_tokens(db: AsyncSession, user_id: UUID, reason: RevocationReason) -> None:
+    """Revoke every active refresh token of a user (caller commits)."""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=func.now(), revoked_reason=reason)
+    )
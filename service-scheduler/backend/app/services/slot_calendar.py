@@ -0,0 +1,77 @@
+from sqlalchemy import select, and_, func, literal
+from sqlalchemy.sql import Select
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from app.models.slot import Slot
+from app.schemas.slot import CalendarGranularity
+
+# Widest range one calendar request may cover, which also bounds the buckets
+# returned: a year of days or a month of hours
+MAX_CALENDAR_RANGE = {
+    CalendarGranularity.DAY: timedelta(days=366),
+    CalendarGranularity.HOUR: timedelta(days=31),
+}
+
+
+class CalendarError(ValueError):
+    """Raised when a calendar range cannot be aggregated."""
+
+
+def calendar_query(
+    start: datetime,
+    end: datetime,
+    granularity: CalendarGranularity,
+    timezone: str = "UTC",
+    created_by: Optional[UUID] = None
+) -> Select:
+    """Aggregate slots starting in [start, end) into day or hour buckets.
+
+    Buckets follow the calendar of ``timezone`` (a day is local midnight to
+    midnight, across DST changes), and naive bounds are read in it too. Only
+    periods with at least one slot are returned, in order.
+    """
+    try:
+        zone = ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise CalendarError(f"Unknown time zone: {timezone}")
+
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=zone)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=zone)
+    if end <= start:
+        raise CalendarError("end_date must be after start_date")
+    if end - start > MAX_CALENDAR_RANGE[granularity]:
+        raise CalendarError(
+            f"A calendar by {granularity.value} may span at most {MAX_CALENDAR_RANGE[granularity].days} days"
+        )
+
+    bookable = and_(
+        Slot.is_available.is_(True),
+        Slot.current_participants < Slot.max_participants
+    )
+    period_start = func.date_trunc(
+        literal(granularity.value), Slot.start_time, literal(timezone)
+    ).label("period_start")
+
+    conditions = [Slot.start_time >= start, Slot.start_time < end]
+    if created_by is not None:
+        conditions.append(Slot.created_by == created_by)
+
+    # Group and order by the label so the bound date_trunc arguments are not
+    # rendered (and compared) twice
+    return (
+        select(
+            period_start,
+            func.count().label("slot_count"),
+            func.coalesce(
+                func.sum(Slot.max_participants - Slot.current_participants).filter(bookable), 0
+            ).label("free_spots"),
+            func.min(Slot.start_time).filter(bookable).label("first_available")
+        )
+        .where(and_(*conditions))
+        .group_by(period_start)
+        .order_by(period_start)
+    )
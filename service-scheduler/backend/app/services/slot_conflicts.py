@@ -0,0 +1,73 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY, TIMESTAMP
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+from typing import List, NamedTuple, Sequence, Tuple
+from uuid import UUID
+from app.models.slot import Slot
+
+# Must match the expression in no_overlapping_creator_slots so its GiST index is used
+SLOT_PERIOD = func.tstzrange(Slot.start_time, Slot.end_time)
+
+# SQLSTATE of an exclusion constraint violation
+EXCLUSION_VIOLATION = "23P01"
+
+
+class SlotConflict(NamedTuple):
+    index: int
+    slot_id: UUID
+    start_time: datetime
+    end_time: datetime
+
+
+async def find_conflicts(
+    db: AsyncSession,
+    created_by: UUID,
+    intervals: Sequence[Tuple[datetime, datetime]]
+) -> List[SlotConflict]:
+    """Find existing slots of ``created_by`` overlapping any of ``intervals``.
+
+    All intervals are checked in one query: they are unnested into a row set
+    and joined against the creator's slots with a range overlap (``&&``),
+    which the (created_by, tstzrange) GiST index answers directly. Ranges
+    are half-open, so back-to-back slots do not conflict.
+
+    Each conflict carries the position of the requested interval it hits.
+    The check gives callers a precise error; a slot written concurrently
+    is still caught by the no_overlapping_creator_slots constraint on commit
+    (see ``is_overlap_violation``).
+    """
+    if not intervals:
+        return []
+
+    starts, ends = zip(*intervals)
+    timestamps = ARRAY(TIMESTAMP(timezone=True))
+    requested = func.unnest(
+        bindparam("starts", list(starts), type_=timestamps),
+        bindparam("ends", list(ends), type_=timestamps)
+    ).table_valued("start_time", "end_time", with_ordinality="position").render_derived()
+
+    result = await db.execute(
+        select(
+            requested.c.position,
+            Slot.id,
+            Slot.start_time,
+            Slot.end_time
+        )
+        .join(
+            Slot,
+            (Slot.created_by == created_by)
+            & SLOT_PERIOD.op("&&")(func.tstzrange(requested.c.start_time, requested.c.end_time))
+        )
+        .order_by(requested.c.position, Slot.start_time)
+    )
+    return [
+        SlotConflict(index=position - 1, slot_id=slot_id, start_time=start, end_time=end)
+        for position, slot_id, start, end in result.all()
+    ]
+
+
+def is_overlap_violation(error: IntegrityError) -> bool:
+    """Whether a failed write broke the no_overlapping_creator_slots constraint."""
+    return getattr(error.orig, "sqlstate", None) == EXCLUSION_VIOLATION
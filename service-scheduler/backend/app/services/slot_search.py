@@ -0,0 +1,43 @@
+from sqlalchemy import func, false, literal, literal_column
+from sqlalchemy.sql import ColumnElement
+from app.models.slot import Slot
+import re
+
+# Words are matched by their English stem or, unstemmed, as a prefix, so
+# "yoga classes" finds "Yoga class" and "consulta" finds "Consultation"
+_ENGLISH = literal_column("'english'::regconfig")
+_SIMPLE = literal_column("'simple'::regconfig")
+
+# Letters and digits only, which also keeps tsquery operators out of the input
+_TERM_PATTERN = re.compile(r"\w+")
+
+# Terms beyond this are ignored; every term adds an AND to the query
+MAX_SEARCH_TERMS = 8
+
+
+def search_tsquery(search: str) -> ColumnElement:
+    """Build the tsquery for a search box input: every term must match."""
+    terms = _TERM_PATTERN.findall(search.lower())[:MAX_SEARCH_TERMS]
+    query = None
+    for term in terms:
+        term_query = func.to_tsquery(_ENGLISH, term).op("||")(
+            func.to_tsquery(_SIMPLE, f"{term}:*")
+        )
+        query = term_query if query is None else query.op("&&")(term_query)
+    return query
+
+
+def search_condition(search: str) -> ColumnElement:
+    """Match slots against a search; input without any words matches nothing."""
+    query = search_tsquery(search)
+    if query is None:
+        return false()
+    return Slot.search_vector.op("@@")(query)
+
+
+def search_rank(search: str) -> ColumnElement:
+    """Relevance of a slot to a search, title matches ranking above descriptions."""
+    query = search_tsquery(search)
+    if query is None:
+        return literal(0.0)
+    return func.ts_rank(Slot.search_vector, query)
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+from zoneinfo import ZoneInfo
+from app.schemas.slot import SlotSeriesCreate
+
+# Upper bound on the slots one series request may create (one multi-row INSERT)
+MAX_SERIES_SLOTS = 1000
+
+
+class SeriesError(ValueError):
+    """Raised when a recurrence rule cannot be turned into slots."""
+
+
+def expand_series(series: SlotSeriesCreate) -> List[Tuple[datetime, datetime]]:
+    """Expand a weekly recurrence into (start, end) intervals in UTC.
+
+    Dates and times are interpreted in the series' time zone, so a 09:00
+    slot stays at 09:00 local time across DST changes. Durations are added
+    in UTC so every slot is exactly ``duration_minutes`` long.
+    """
+    if series.count is not None and series.count > MAX_SERIES_SLOTS:
+        raise SeriesError(f"A series may create at most {MAX_SERIES_SLOTS} slots")
+
+    zone = ZoneInfo(series.timezone)
+    duration = timedelta(minutes=series.duration_minutes)
+    start_times = sorted(set(series.start_times))
+    weekdays = set(series.weekdays)
+
+    intervals: List[Tuple[datetime, datetime]] = []
+    day = series.starts_on
+    while series.until is None or day <= series.until:
+        if day.isoweekday() in weekdays:
+            for start_time in start_times:
+                start = datetime.combine(day, start_time, tzinfo=zone).astimezone(timezone.utc)
+                intervals.append((start, start + duration))
+                if series.count is not None and len(intervals) == series.count:
+                    return intervals
+        if len(intervals) > MAX_SERIES_SLOTS:
+            raise SeriesError(f"A series may create at most {MAX_SERIES_SLOTS} slots")
+        day += timedelta(days=1)
+
+    if not intervals:
+        raise SeriesError("The recurrence rule produces no slots")
+    return intervals
+
+
+def check_no_self_overlap(intervals: List[Tuple[datetime, datetime]]) -> None:
+    """Reject series whose own occurrences overlap (e.g. duration > gap)."""
+    ordered = sorted(intervals)
+    for (_, previous_end), (next_start, _) in zip(ordered, ordered[1:]):
+        if next_start < previous_end:
+            raise SeriesError(
+                f"Series occurrences overlap each other at {next_start.isoformat()}"
+            )
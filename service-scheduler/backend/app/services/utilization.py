@@ -0,0 +1,131 @@
+from sqlalchemy import select, and_, func, cast, Float, Date, text
+from sqlalchemy.sql import Select
+from datetime import date, timedelta
+from typing import Optional
+from uuid import UUID
+from app.config import settings
+from app.database import engine
+from app.models.stats import slot_utilization_daily as daily
+from app.schemas.stats import StatsGranularity
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Widest range one stats request may cover: a year of days or five of weeks.
+# Reads scan only the requested days, so their cost does not grow with history.
+MAX_STATS_RANGE = {
+    StatsGranularity.DAY: timedelta(days=366),
+    StatsGranularity.WEEK: timedelta(days=5 * 366),
+}
+
+# Advisory lock held while refreshing, so API replicas take turns instead of
+# queueing identical refreshes behind each other
+_REFRESH_LOCK_KEY = 0x5107_57A7
+
+
+class StatsError(ValueError):
+    """Raised when a stats range cannot be served."""
+
+
+def _ratio(numerator, denominator):
+    return func.coalesce(cast(numerator, Float) / func.nullif(denominator, 0), 0.0)
+
+
+def utilization_query(
+    start: date,
+    end: date,
+    granularity: StatsGranularity,
+    created_by: Optional[UUID] = None
+) -> Select:
+    """Sum the daily rows for [start, end) into day or week periods per creator.
+
+    Weeks start on Monday; a week cut by the range only counts its days
+    inside it.
+    """
+    if end <= start:
+        raise StatsError("end_date must be after start_date")
+    if end - start > MAX_STATS_RANGE[granularity]:
+        raise StatsError(
+            f"Stats by {granularity.value} may span at most {MAX_STATS_RANGE[granularity].days} days"
+        )
+
+    if granularity == StatsGranularity.WEEK:
+        period_start = cast(func.date_trunc("week", daily.c.day), Date)
+    else:
+        period_start = daily.c.day
+    period_start = period_start.label("period_start")
+
+    conditions = [daily.c.day >= start, daily.c.day < end]
+    if created_by is not None:
+        conditions.append(daily.c.created_by == created_by)
+
+    slots_offered = func.sum(daily.c.slots_offered)
+    spots_offered = func.sum(daily.c.spots_offered)
+    spots_filled = func.sum(daily.c.spots_filled)
+    bookings = func.sum(daily.c.bookings)
+    cancellations = func.sum(daily.c.cancellations)
+    return (
+        select(
+            daily.c.created_by,
+            period_start,
+            slots_offered.label("slots_offered"),
+            spots_offered.label("spots_offered"),
+            spots_filled.label("spots_filled"),
+            bookings.label("bookings"),
+            cancellations.label("cancellations"),
+            _ratio(spots_filled, spots_offered).label("fill_rate"),
+            _ratio(cancellations, bookings).label("cancellation_rate"),
+            _ratio(func.sum(daily.c.unavailable_slots), slots_offered).label("no_availability_ratio")
+        )
+        .where(and_(*conditions))
+        .group_by(daily.c.created_by, period_start)
+        .order_by(period_start, daily.c.created_by)
+    )
+
+
+async def refresh_utilization_stats() -> bool:
+    """Rebuild the daily stats without blocking readers.
+
+    Returns False if another process was already refreshing.
+    """
+    async with engine.begin() as conn:
+        locked = await conn.scalar(
+            select(func.pg_try_advisory_xact_lock(_REFRESH_LOCK_KEY))
+        )
+        if not locked:
+            return False
+        await conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY slot_utilization_daily"))
+    return True
+
+
+class UtilizationRefresher:
+    """Background task refreshing the stats every ``utilization_refresh_seconds``."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.utilization_refresh_seconds)
+            try:
+                if await refresh_utilization_stats():
+                    logger.info("Utilization stats refreshed")
+            except Exception as e:
+                logger.error(f"Utilization stats refresh failed: {e}")
+
+
+utilization_refresher = UtilizationRefresher()
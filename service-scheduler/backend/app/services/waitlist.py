@@ -0,0 +1,143 @@
+from sqlalchemy import select, update, case, func, tuple_
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+from typing import Optional
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.slot import Slot
+from app.models.waitlist import WaitlistEntry, WaitlistStatus
+from app.services.booking_claims import ClaimFailure, claim_slot, diagnose_claim_failure
+from app.cache.slots import invalidate_slot_cache
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def waitlist_entries_query() -> Select:
+    """Select waitlist entries with their 1-based queue position.
+
+    The position counts waiting entries of the same slot up to this one,
+    served by the partial (slot_id, created_at, id) index; entries that are
+    no longer waiting get None.
+    """
+    ahead = aliased(WaitlistEntry)
+    position = (
+        select(func.count())
+        .where(
+            ahead.slot_id == WaitlistEntry.slot_id,
+            ahead.status == WaitlistStatus.WAITING,
+            tuple_(ahead.created_at, ahead.id) <= tuple_(WaitlistEntry.created_at, WaitlistEntry.id)
+        )
+        .scalar_subquery()
+    )
+    return select(
+        *WaitlistEntry.__table__.columns,
+        case((WaitlistEntry.status == WaitlistStatus.WAITING, position)).label("position")
+    )
+
+
+async def promote_waitlist(batch_size: int) -> int:
+    """Book the oldest waiting entries on slots that have room again.
+
+    Entries are claimed with ``FOR UPDATE SKIP LOCKED``, so API replicas
+    running this at the same time work through disjoint batches. Each entry
+    is booked through ``claim_slot`` inside a savepoint: an entry whose slot
+    filled up in the meantime stays waiting, and one whose user already
+    holds a booking is dropped. Returns the number of entries examined.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(
+                select(WaitlistEntry.id, WaitlistEntry.slot_id, WaitlistEntry.user_id, WaitlistEntry.notes)
+                .join(Slot, Slot.id == WaitlistEntry.slot_id)
+                .where(
+                    WaitlistEntry.status == WaitlistStatus.WAITING,
+                    Slot.is_available.is_(True),
+                    Slot.current_participants < Slot.max_participants
+                )
+                .order_by(WaitlistEntry.created_at, WaitlistEntry.id)
+                .limit(batch_size)
+                .with_for_update(of=WaitlistEntry, skip_locked=True)
+            )
+            entries = result.all()
+            
+            promoted = 0
+            for entry in entries:
+                savepoint = await db.begin_nested()
+                booking = await claim_slot(db, entry.slot_id, entry.user_id, entry.notes)
+                if booking is None:
+                    # claim_slot may leave a counter bump behind on failure
+                    await savepoint.rollback()
+                    failure = await diagnose_claim_failure(db, entry.slot_id, entry.user_id)
+                    if failure == ClaimFailure.ALREADY_BOOKED:
+                        await db.execute(
+                            update(WaitlistEntry)
+                            .where(WaitlistEntry.id == entry.id)
+                            .values(status=WaitlistStatus.CANCELLED)
+                        )
+                    continue
+                await savepoint.commit()
+                
+                await db.execute(
+                    update(WaitlistEntry)
+                    .where(WaitlistEntry.id == entry.id)
+                    .values(status=WaitlistStatus.PROMOTED, promoted_at=func.now(), booking_id=booking.id)
+                )
+                promoted += 1
+            
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+    
+    if promoted:
+        await invalidate_slot_cache()
+        logger.info(f"Promoted {promoted} of {len(entries)} waitlist entries")
+    return len(entries)
+
+
+class WaitlistPromoter:
+    """Background task promoting waitlist entries when spots free up.
+
+    Cancellations on this replica wake it straight away; a poll every
+    ``waitlist_poll_seconds`` picks up spots freed elsewhere (other replicas,
+    Hasura).
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=settings.waitlist_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                # A full batch means more entries may be ready
+                while await promote_waitlist(settings.waitlist_batch_size) == settings.waitlist_batch_size:
+                    pass
+            except Exception as e:
+                logger.error(f"Waitlist promotion failed: {e}")
+
+
+waitlist_promoter = WaitlistPromoter()
@@ -0,0 +1,120 @@
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+from app.config import settings
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Job(NamedTuple):
+    name: str
+    func: Callable[..., Awaitable[Any]]
+    args: tuple
+    kwargs: dict
+
+
+class TaskQueueMetrics:
+    """Outcomes of post-commit jobs per job name."""
+
+    def __init__(self):
+        self.running = 0
+        self.completed: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.retries: Dict[str, int] = {}
+        # Jobs run in the request because the queue was full or stopped
+        self.inline: Dict[str, int] = {}
+
+    @staticmethod
+    def count(counter: Dict[str, int], name: str) -> None:
+        counter[name] = counter.get(name, 0) + 1
+
+
+class PostCommitQueue:
+    """Runs slow, non-critical side effects of committed writes after the response.
+
+    Handlers ``await post_commit.enqueue(func, *args)`` once their transaction
+    has committed, so response latency only covers the transaction. Anything
+    the client's next request depends on, such as retiring cached slot pages,
+    stays inline instead. A job is retried only if it raises. A few
+    workers drain a bounded queue and retry failing jobs with exponential
+    backoff. When the queue is full, or not running (e.g. before the lifespan
+    starts it), the job runs in the request instead. That slows the request
+    but never loses the job. On shutdown, queued jobs get
+    ``task_queue_drain_seconds`` to finish.
+    """
+
+    def __init__(self):
+        self.metrics = TaskQueueMetrics()
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(settings.task_queue_max_size)
+            self._workers = [
+                asyncio.create_task(self._work(self._queue)) for _ in range(settings.task_queue_workers)
+            ]
+
+    async def stop(self) -> None:
+        if self._queue is None:
+            return
+        queue, self._queue = self._queue, None
+        try:
+            await asyncio.wait_for(queue.join(), timeout=settings.task_queue_drain_seconds)
+        except asyncio.TimeoutError:
+            logger.warning(f"Post-commit queue not drained on shutdown, {queue.qsize()} jobs dropped")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def enqueue(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> None:
+        """Run ``func(*args, **kwargs)`` after the response; call only after commit."""
+        job = Job(getattr(func, "__qualname__", repr(func)), func, args, kwargs)
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(job)
+                return
+            except asyncio.QueueFull:
+                pass
+        TaskQueueMetrics.count(self.metrics.inline, job.name)
+        # One attempt: backing off here would hold the response
+        await self._run(job, attempts=1)
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        # Holds its own reference: stop() detaches the queue before draining it
+        while True:
+            job = await queue.get()
+            try:
+                await self._run(job, attempts=settings.task_queue_max_attempts)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: Job, attempts: int) -> None:
+        self.metrics.running += 1
+        try:
+            for attempt in range(1, attempts + 1):
+                try:
+                    await job.func(*job.args, **job.kwargs)
+                    TaskQueueMetrics.count(self.metrics.completed, job.name)
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if attempt == attempts:
+                        TaskQueueMetrics.count(self.metrics.failed, job.name)
+                        logger.error(f"Post-commit job {job.name} failed after {attempt} attempt(s): {e}")
+                        return
+                    delay = settings.task_queue_retry_base_seconds * 2 ** (attempt - 1)
+                    TaskQueueMetrics.count(self.metrics.retries, job.name)
+                    logger.warning(f"Post-commit job {job.name} failed, retrying in {delay:.1f}s: {e}")
+                    await asyncio.sleep(delay)
+        finally:
+            self.metrics.running -= 1
+
+
+post_commit = PostCommitQueue()
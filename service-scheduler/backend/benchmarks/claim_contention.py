@@ -0,0 +1,149 @@
+"""Benchmark booking claims on a single high-contention slot.
+
+Fires ``--claims`` concurrent claims from distinct users at one slot with
+``--capacity`` spots and reports claims per second, how many succeeded and
+whether the slot ended up overbooked. ``--mode legacy`` replays the old
+read-check-insert sequence for comparison.
+
+Usage (from the backend directory, against a disposable database):
+
+    uv run python -m benchmarks.claim_contention --claims 500 --capacity 50
+"""
+from sqlalchemy import select, func, delete
+import argparse
+import asyncio
+import time
+import uuid
+
+from app.database import AsyncSessionLocal, engine, init_db
+from app.models.user import User, UserRole
+from app.models.slot import Slot
+from app.models.booking import Booking, BookingStatus
+from app.services.booking_claims import claim_slot
+
+
+async def seed(claims: int, capacity: int):
+    """Create one slot and ``claims`` users to compete for it."""
+    run_id = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        admin = User(
+            email=f"bench-admin-{run_id}@example.com",
+            password_hash="x",
+            first_name="Bench",
+            last_name="Admin",
+            role=UserRole.ADMIN
+        )
+        users = [
+            User(
+                email=f"bench-{run_id}-{i}@example.com",
+                password_hash="x",
+                first_name="Bench",
+                last_name=str(i)
+            )
+            for i in range(claims)
+        ]
+        db.add(admin)
+        db.add_all(users)
+        await db.flush()
+        slot = Slot(
+            title=f"Contention benchmark {run_id}",
+            start_time=func.now(),
+            end_time=func.now() + func.make_interval(0, 0, 0, 0, 1),
+            max_participants=capacity,
+            created_by=admin.id
+        )
+        db.add(slot)
+        await db.commit()
+        return admin.id, slot.id, [user.id for user in users]
+
+
+async def atomic_claim(slot_id, user_id) -> bool:
+    async with AsyncSessionLocal() as db:
+        booking = await claim_slot(db, slot_id, user_id)
+        if booking is None:
+            await db.rollback()
+            return False
+        await db.commit()
+        return True
+
+
+async def legacy_claim(slot_id, user_id) -> bool:
+    """The pre-claim_slot sequence: read, check, insert, bump the counter."""
+    async with AsyncSessionLocal() as db:
+        slot = (await db.execute(select(Slot).where(Slot.id == slot_id))).scalar_one()
+        if not slot.is_available or slot.is_full:
+            return False
+        existing = await db.execute(
+            select(Booking).where(
+                Booking.slot_id == slot_id,
+                Booking.user_id == user_id,
+                Booking.status == BookingStatus.ACTIVE
+            )
+        )
+        if existing.scalar_one_or_none():
+            return False
+        booking = Booking(slot_id=slot_id, user_id=user_id)
+        db.add(booking)
+        slot.current_participants = slot.current_participants + 1
+        try:
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            return False
+        await db.refresh(booking)
+        return True
+
+
+async def run(args):
+    await init_db()
+    admin_id, slot_id, user_ids = await seed(args.claims, args.capacity)
+    claim = atomic_claim if args.mode == "atomic" else legacy_claim
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def bounded(user_id):
+        async with semaphore:
+            return await claim(slot_id, user_id)
+
+    try:
+        started = time.perf_counter()
+        outcomes = await asyncio.gather(*(bounded(u) for u in user_ids))
+        elapsed = time.perf_counter() - started
+
+        async with AsyncSessionLocal() as db:
+            booked = (await db.execute(
+                select(func.count()).select_from(Booking).where(
+                    Booking.slot_id == slot_id,
+                    Booking.status == BookingStatus.ACTIVE
+                )
+            )).scalar_one()
+            counter = (await db.execute(
+                select(Slot.current_participants).where(Slot.id == slot_id)
+            )).scalar_one()
+
+        print(f"mode:               {args.mode}")
+        print(f"claims attempted:   {len(outcomes)}")
+        print(f"claims succeeded:   {sum(outcomes)}")
+        print(f"capacity:           {args.capacity}")
+        print(f"active bookings:    {booked}")
+        print(f"slot counter:       {counter}")
+        print(f"overbooked:         {booked > args.capacity or booked != counter}")
+        print(f"elapsed:            {elapsed:.3f}s")
+        print(f"claims per second:  {len(outcomes) / elapsed:.1f}")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id.in_([admin_id, *user_ids])))
+            await db.commit()
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--claims", type=int, default=500, help="Concurrent claim attempts")
+    parser.add_argument("--capacity", type=int, default=50, help="Spots on the contended slot")
+    parser.add_argument("--concurrency", type=int, default=20, help="Claims in flight at once (<= pool size)")
+    parser.add_argument("--mode", choices=["atomic", "legacy"], default="atomic")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
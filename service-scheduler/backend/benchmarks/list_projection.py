@@ -0,0 +1,206 @@
+"""Benchmark list serialization: ORM hydration versus column projection.
+
+Seeds ``--rows`` slots (one booking each) and times building one page of
+``GET /slots`` and ``GET /bookings`` JSON both ways: the ORM path
+(``selectinload`` + ``model_validate`` via ``from_attributes``) and the
+projected path in ``app/services/projections.py``. Reports per-page latency,
+the speedup and the SQL statements each page costs.
+
+Usage (from the backend directory, against a disposable database):
+
+    uv run python -m benchmarks.list_projection --rows 100 --iterations 200
+"""
+from sqlalchemy import select, delete, event, func
+from sqlalchemy.orm import selectinload
+from pydantic import TypeAdapter
+from typing import List
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from app.database import AsyncSessionLocal, engine, init_db
+from app.models.user import User, UserRole
+from app.models.slot import Slot
+from app.models.booking import Booking
+from app.schemas.slot import SlotResponse, SlotWithCreator
+from app.schemas.user import UserResponse
+from app.schemas.booking import BookingWithDetails
+from app.services.projections import booking_with_details_query, build_models, slot_with_creator_query
+
+slot_list_adapter = TypeAdapter(List[SlotWithCreator])
+booking_list_adapter = TypeAdapter(List[BookingWithDetails])
+
+
+async def seed(rows: int):
+    """Create ``rows`` slots from one admin, each booked by its own user."""
+    run_id = uuid.uuid4().hex[:8]
+    async with AsyncSessionLocal() as db:
+        admin = User(
+            email=f"bench-admin-{run_id}@example.com",
+            password_hash="x" * 60,
+            first_name="Bench",
+            last_name="Admin",
+            role=UserRole.ADMIN
+        )
+        users = [
+            User(
+                email=f"bench-{run_id}-{i}@example.com",
+                password_hash="x" * 60,
+                first_name="Bench",
+                last_name=str(i)
+            )
+            for i in range(rows)
+        ]
+        db.add(admin)
+        db.add_all(users)
+        await db.flush()
+        slots = [
+            Slot(
+                title=f"Projection benchmark {run_id} #{i}",
+                description="Seeded by benchmarks.list_projection",
+                start_time=func.now() + func.make_interval(0, 0, 0, 0, i),
+                end_time=func.now() + func.make_interval(0, 0, 0, 0, i + 1),
+                max_participants=5,
+                current_participants=1,
+                created_by=admin.id
+            )
+            for i in range(rows)
+        ]
+        db.add_all(slots)
+        await db.flush()
+        db.add_all(Booking(slot_id=slot.id, user_id=user.id) for slot, user in zip(slots, users))
+        await db.commit()
+        return admin.id, [user.id for user in users]
+
+
+async def orm_slots(admin_id, rows: int) -> bytes:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Slot)
+            .options(selectinload(Slot.creator))
+            .where(Slot.created_by == admin_id)
+            .order_by(Slot.start_time, Slot.id)
+            .limit(rows)
+        )
+        slots = result.scalars().all()
+        return slot_list_adapter.dump_json([SlotWithCreator.model_validate(slot) for slot in slots])
+
+
+async def projected_slots(admin_id, rows: int) -> bytes:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            slot_with_creator_query()
+            .where(Slot.created_by == admin_id)
+            .order_by(Slot.start_time, Slot.id)
+            .limit(rows)
+        )
+        return slot_list_adapter.dump_json(
+            build_models(SlotWithCreator, result, {"creator": UserResponse})
+        )
+
+
+async def orm_bookings(admin_id, rows: int) -> bytes:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(Booking)
+            .options(
+                selectinload(Booking.slot).selectinload(Slot.creator),
+                selectinload(Booking.user)
+            )
+            .join(Booking.slot)
+            .where(Slot.created_by == admin_id)
+            .order_by(Booking.booked_at.desc(), Booking.id.desc())
+            .limit(rows)
+        )
+        bookings = result.scalars().all()
+        return booking_list_adapter.dump_json(
+            [BookingWithDetails.model_validate(booking) for booking in bookings]
+        )
+
+
+async def projected_bookings(admin_id, rows: int) -> bytes:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            booking_with_details_query()
+            .where(Slot.created_by == admin_id)
+            .order_by(Booking.booked_at.desc(), Booking.id.desc())
+            .limit(rows)
+        )
+        return booking_list_adapter.dump_json(
+            build_models(BookingWithDetails, result, {"slot": SlotResponse, "user": UserResponse})
+        )
+
+
+async def count_statements(build, admin_id, rows: int) -> int:
+    statements = 0
+
+    def count(*args):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        await build(admin_id, rows)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+    return statements
+
+
+async def measure(build, admin_id, rows: int, iterations: int) -> List[float]:
+    await build(admin_id, rows)  # warm up connections and statement caches
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await build(admin_id, rows)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def summarize(label: str, timings: List[float]) -> float:
+    ordered = sorted(timings)
+    p50 = statistics.median(ordered)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(f"{label:<22} mean {statistics.fmean(ordered):7.2f}ms  p50 {p50:7.2f}ms  p95 {p95:7.2f}ms")
+    return p50
+
+
+async def run(args):
+    await init_db()
+    admin_id, user_ids = await seed(args.rows)
+    try:
+        # Both paths must produce the same document before timing them
+        assert await orm_slots(admin_id, args.rows) == await projected_slots(admin_id, args.rows)
+        assert await orm_bookings(admin_id, args.rows) == await projected_bookings(admin_id, args.rows)
+
+        print(f"rows per page: {args.rows}, iterations: {args.iterations}")
+        for name, orm_path, projected_path in [
+            ("slots", orm_slots, projected_slots),
+            ("bookings", orm_bookings, projected_bookings),
+        ]:
+            orm_p50 = summarize(f"{name} (orm)", await measure(orm_path, admin_id, args.rows, args.iterations))
+            projected_p50 = summarize(
+                f"{name} (projected)", await measure(projected_path, admin_id, args.rows, args.iterations)
+            )
+            print(f"{name} speedup (p50):   {orm_p50 / projected_p50:.2f}x")
+            print(
+                f"{name} statements:      orm {await count_statements(orm_path, admin_id, args.rows)}, "
+                f"projected {await count_statements(projected_path, admin_id, args.rows)}"
+            )
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(User).where(User.id.in_([admin_id, *user_ids])))
+            await db.commit()
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100, help="Rows per page (the list endpoints cap this at 100)")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed pages per path")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Drive a running API with concurrent clients and report per-endpoint latency.
+
+Each of ``--clients`` virtual users logs in as a random user seeded by
+``benchmarks.seed_data``. It then repeats one round of list slots, book a
+slot and cancel that booking, ``--rounds-per-login`` times, and logs in
+again. This continues for ``--duration`` seconds. Listing starts at a random
+hour of the seeded range, so bookings spread over the table instead of
+piling onto the first page.
+
+The report is JSON: p50/p95/p99, mean and max latency in milliseconds,
+requests per second and status codes, per endpoint and in total. Keep it as a
+baseline and compare later runs with the same arguments against it.
+
+Usage (from the backend directory, with the API running):
+
+    uv run python -m benchmarks.load_test --clients 50 --duration 60 --output baseline.json
+"""
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import httpx
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+
+LOGIN = "POST /auth/login"
+LIST_SLOTS = "GET /slots"
+BOOK = "POST /bookings"
+CANCEL = "DELETE /bookings/{id}"
+
+
+class EndpointStats:
+    """Latencies and outcomes of every request to one endpoint."""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.status_codes: Counter = Counter()
+        self.transport_errors = 0
+
+    def summary(self, duration: float) -> dict:
+        ordered = sorted(self.latencies_ms)
+        requests = len(ordered) + self.transport_errors
+        failed = self.transport_errors + sum(
+            count for code, count in self.status_codes.items() if code >= 400
+        )
+        return {
+            "requests": requests,
+            "failed": failed,
+            "rps": round(requests / duration, 2) if duration else 0.0,
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+            "mean_ms": round(statistics.fmean(ordered), 2) if ordered else None,
+            "max_ms": round(ordered[-1], 2) if ordered else None,
+            "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+            "transport_errors": self.transport_errors,
+        }
+
+
+def percentile(ordered: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted sample."""
+    if not ordered:
+        return None
+    return round(ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)], 2)
+
+
+class LoadTest:
+    def __init__(self, args, client: httpx.AsyncClient):
+        self.args = args
+        self.client = client
+        self.stats: Dict[str, EndpointStats] = {
+            name: EndpointStats() for name in (LOGIN, LIST_SLOTS, BOOK, CANCEL)
+        }
+        self.first_slot_start = (
+            datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        )
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        stats = self.stats[endpoint]
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            stats.transport_errors += 1
+            return None
+        stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+        stats.status_codes[response.status_code] += 1
+        return response
+
+    async def login(self, rng: random.Random) -> Optional[dict]:
+        n = rng.randrange(self.args.admins, self.args.users)
+        response = await self.request(
+            LOGIN, "POST", "/api/v1/auth/login",
+            json={"email": f"{self.args.prefix}-{n}@example.com", "password": self.args.password}
+        )
+        if response is None or response.status_code != 200:
+            return None
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def round(self, rng: random.Random, headers: dict) -> None:
+        start_date = self.first_slot_start + timedelta(hours=rng.randrange(self.args.slot_hours))
+        response = await self.request(
+            LIST_SLOTS, "GET", "/api/v1/slots/",
+            params={"available_only": "true", "limit": self.args.page_size, "start_date": start_date.isoformat()},
+            headers=headers
+        )
+        if response is None or response.status_code != 200 or not response.json():
+            return
+
+        slot = rng.choice(response.json())
+        response = await self.request(
+            BOOK, "POST", "/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=headers
+        )
+        if response is None or response.status_code != 201:
+            return
+
+        await self.request(CANCEL, "DELETE", f"/api/v1/bookings/{response.json()['id']}", headers=headers)
+
+    async def virtual_user(self, client_id: int, deadline: float) -> None:
+        rng = random.Random(self.args.seed * 100_003 + client_id)
+        while time.perf_counter() < deadline:
+            headers = await self.login(rng)
+            if headers is None:
+                continue
+            for _ in range(self.args.rounds_per_login):
+                if time.perf_counter() >= deadline:
+                    return
+                await self.round(rng, headers)
+
+    async def run(self) -> dict:
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        deadline = started + self.args.duration
+        await asyncio.gather(*(self.virtual_user(i, deadline) for i in range(self.args.clients)))
+        duration = time.perf_counter() - started
+
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.latencies_ms.extend(stats.latencies_ms)
+            total.status_codes.update(stats.status_codes)
+            total.transport_errors += stats.transport_errors
+
+        return {
+            "started_at": started_at.isoformat(),
+            "duration_seconds": round(duration, 2),
+            "config": {
+                "base_url": self.args.base_url,
+                "clients": self.args.clients,
+                "rounds_per_login": self.args.rounds_per_login,
+                "page_size": self.args.page_size,
+                "users": self.args.users,
+                "slot_hours": self.args.slot_hours,
+                "seed": self.args.seed,
+            },
+            "host": {"python": platform.python_version(), "machine": platform.machine()},
+            "endpoints": {name: stats.summary(duration) for name, stats in self.stats.items()},
+            "total": total.summary(duration),
+        }
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        report = await LoadTest(args, client).run()
+
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(rendered + "\n")
+        print(f"Report written to {args.output}")
+    else:
+        print(rendered)
+
+    for name, summary in report["endpoints"].items():
+        print(
+            f"{name:<24} {summary['requests']:>7} req  {summary['rps']:>8.1f} rps  "
+            f"p50 {summary['p50_ms'] or 0:>7.1f}ms  p95 {summary['p95_ms'] or 0:>7.1f}ms  "
+            f"p99 {summary['p99_ms'] or 0:>7.1f}ms  failed {summary['failed']}",
+            file=sys.stderr
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000", help="API to load")
+    parser.add_argument("--clients", type=int, default=50, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds to keep starting requests")
+    parser.add_argument("--rounds-per-login", type=int, default=20, help="List/book/cancel rounds per login")
+    parser.add_argument("--page-size", type=int, default=20, help="Slots per GET /slots page")
+    parser.add_argument("--users", type=int, default=10_000, help="Users seeded, as passed to seed_data")
+    parser.add_argument("--admins", type=int, default=100, help="Admins seeded, as passed to seed_data")
+    parser.add_argument("--slot-hours", type=int, default=5_000,
+                        help="Hours covered by seeded slots (slots / admins with seed_data's layout)")
+    parser.add_argument("--prefix", default="load", help="Email prefix used by seed_data")
+    parser.add_argument("--password", default="loadtest-password", help="Password used by seed_data")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for user and slot choice")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
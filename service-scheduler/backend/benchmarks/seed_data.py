@@ -0,0 +1,223 @@
+"""Bulk-load a synthetic dataset for load testing.
+
+Streams ``--users`` users (the first ``--admins`` of them admins), ``--slots``
+slots spread over those admins and ``--bookings`` bookings into Postgres with
+COPY, in batches of ``--batch`` rows. Slot counters are written consistent
+with their bookings, so the participant and change-notification triggers are
+bypassed for the load instead of firing once per row.
+
+Every user gets the same ``--password`` (hashed once) and the email
+``<prefix>-<n>@example.com``, which is what ``benchmarks.load_test`` logs in
+with. Slots start tomorrow, one hour each, back to back per admin.
+
+Usage (from the backend directory, against a disposable database):
+
+    uv run python -m benchmarks.seed_data --users 10000 --slots 500000 --bookings 5000000
+"""
+from sqlalchemy.engine import make_url
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Tuple
+import argparse
+import asyncio
+import asyncpg
+import random
+import time
+import uuid
+
+from app.auth.security import get_password_hash
+from app.config import settings
+from app.database import engine, init_db
+
+SLOT_DURATION = timedelta(hours=1)
+CANCELLED_SHARE = 0.1
+
+
+def batched(rows: Iterator[tuple], size: int) -> Iterator[List[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def enum_labels(conn: asyncpg.Connection, table: str, column: str) -> Dict[str, str]:
+    """Map lower-cased enum values to the labels the column's type uses.
+
+    ``hasura/init.sql`` declares lower-case labels while ``create_all`` uses
+    the Python member names, so look them up rather than assume either.
+    """
+    rows = await conn.fetch(
+        """
+        SELECT e.enumlabel FROM pg_attribute a
+        JOIN pg_enum e ON e.enumtypid = a.atttypid
+        WHERE a.attrelid = $1::regclass AND a.attname = $2
+        """,
+        table, column
+    )
+    return {row["enumlabel"].lower(): row["enumlabel"] for row in rows}
+
+
+def user_rows(args, password_hash: str, roles: Dict[str, str], user_ids: List[uuid.UUID]) -> Iterator[tuple]:
+    for n, user_id in enumerate(user_ids):
+        role = roles["admin"] if n < args.admins else roles["user"]
+        yield (user_id, f"{args.prefix}-{n}@example.com", password_hash, "Load", f"User {n}", role, True)
+
+
+def plan_bookings(args) -> List[int]:
+    """Bookings per slot: ``--bookings`` spread as evenly as the slots allow."""
+    per_slot, remainder = divmod(args.bookings, args.slots)
+    return [per_slot + (1 if i < remainder else 0) for i in range(args.slots)]
+
+
+def slot_rows(
+    args,
+    rng: random.Random,
+    slot_ids: List[uuid.UUID],
+    admin_ids: List[uuid.UUID],
+    booked: List[int],
+    active: List[int]
+) -> Iterator[tuple]:
+    first_start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    for i, slot_id in enumerate(slot_ids):
+        start = first_start + SLOT_DURATION * (i // len(admin_ids))
+        # Room for the seeded bookings plus a few spots for the load test to claim
+        capacity = max(booked[i] + rng.randint(0, args.spare_capacity), 1)
+        yield (
+            slot_id,
+            f"Load slot {i}",
+            "Seeded by benchmarks.seed_data",
+            start,
+            start + SLOT_DURATION,
+            True,
+            capacity,
+            active[i],
+            admin_ids[i % len(admin_ids)],
+        )
+
+
+def booking_rows(
+    rng: random.Random,
+    slot_ids: List[uuid.UUID],
+    user_ids: List[uuid.UUID],
+    booked: List[int],
+    cancelled: List[List[bool]],
+    statuses: Dict[str, str]
+) -> Iterator[tuple]:
+    booked_at = datetime.now(timezone.utc)
+    for i, slot_id in enumerate(slot_ids):
+        # Consecutive users from a per-slot offset never repeat within a slot
+        offset = rng.randrange(len(user_ids))
+        for j in range(booked[i]):
+            is_cancelled = cancelled[i][j]
+            yield (
+                uuid.uuid4(),
+                slot_id,
+                user_ids[(offset + j) % len(user_ids)],
+                statuses["cancelled"] if is_cancelled else statuses["active"],
+                booked_at - timedelta(seconds=rng.randrange(30 * 24 * 3600)),
+                booked_at if is_cancelled else None,
+            )
+
+
+async def copy_rows(
+    conn: asyncpg.Connection,
+    table: str,
+    columns: Tuple[str, ...],
+    rows: Iterator[tuple],
+    total: int,
+    batch_size: int
+) -> None:
+    started = time.perf_counter()
+    loaded = 0
+    for batch in batched(rows, batch_size):
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+        loaded += len(batch)
+        print(f"\r{table}: {loaded}/{total}", end="", flush=True)
+    elapsed = time.perf_counter() - started
+    print(f"\r{table}: {loaded} rows in {elapsed:.1f}s ({loaded / elapsed if elapsed else 0:.0f} rows/s)")
+
+
+async def run(args):
+    if args.admins < 1 or args.admins > args.users:
+        raise SystemExit("--admins must be between 1 and --users")
+    if args.slots < 1:
+        raise SystemExit("--slots must be at least 1")
+    if args.bookings > args.slots * (args.users - args.admins):
+        raise SystemExit("--bookings exceeds one booking per slot and user")
+
+    await init_db()
+    await engine.dispose()
+
+    rng = random.Random(args.seed)
+    user_ids = [uuid.uuid4() for _ in range(args.users)]
+    slot_ids = [uuid.uuid4() for _ in range(args.slots)]
+    booked = plan_bookings(args)
+    cancelled = [[rng.random() < CANCELLED_SHARE for _ in range(count)] for count in booked]
+    active = [row.count(False) for row in cancelled]
+
+    dsn = make_url(settings.database_url).set(drivername="postgresql")
+    conn = await asyncpg.connect(dsn.render_as_string(hide_password=False))
+    try:
+        roles = await enum_labels(conn, "users", "role")
+        statuses = await enum_labels(conn, "bookings", "status")
+        password_hash = get_password_hash(args.password)
+
+        async with conn.transaction():
+            # The API's own flag: slot counters are written by this loader
+            await conn.execute("SET LOCAL scheduler.app_managed_counts = 'on'")
+            # One NOTIFY per seeded slot would flood every live event stream
+            notify_trigger = await conn.fetchval(
+                "SELECT 1 FROM pg_trigger WHERE tgname = 'notify_slot_change_trigger'"
+            )
+            if notify_trigger:
+                await conn.execute("ALTER TABLE slots DISABLE TRIGGER notify_slot_change_trigger")
+
+            await copy_rows(
+                conn, "users",
+                ("id", "email", "password_hash", "first_name", "last_name", "role", "is_active"),
+                user_rows(args, password_hash, roles, user_ids),
+                args.users, args.batch
+            )
+            await copy_rows(
+                conn, "slots",
+                ("id", "title", "description", "start_time", "end_time", "is_available",
+                 "max_participants", "current_participants", "created_by"),
+                slot_rows(args, rng, slot_ids, user_ids[:args.admins], booked, active),
+                args.slots, args.batch
+            )
+            await copy_rows(
+                conn, "bookings",
+                ("id", "slot_id", "user_id", "status", "booked_at", "cancelled_at"),
+                booking_rows(rng, slot_ids, user_ids[args.admins:], booked, cancelled, statuses),
+                args.bookings, args.batch
+            )
+
+            if notify_trigger:
+                await conn.execute("ALTER TABLE slots ENABLE TRIGGER notify_slot_change_trigger")
+
+        # Fresh statistics so the first queries plan against the real row counts
+        for table in ("users", "slots", "bookings"):
+            await conn.execute(f"ANALYZE {table}")
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10_000, help="Users to create, admins included")
+    parser.add_argument("--admins", type=int, default=100, help="How many of the users are admins owning the slots")
+    parser.add_argument("--slots", type=int, default=500_000, help="Slots to create")
+    parser.add_argument("--bookings", type=int, default=5_000_000, help="Bookings to create, about 10%% cancelled")
+    parser.add_argument("--spare-capacity", type=int, default=3, help="Extra spots per slot, at most, left for the load test")
+    parser.add_argument("--prefix", default="load", help="Email prefix; must be unique per load into the same database")
+    parser.add_argument("--password", default="loadtest-password", help="Password shared by every seeded user")
+    parser.add_argument("--batch", type=int, default=50_000, help="Rows per COPY")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for capacities and booking users")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
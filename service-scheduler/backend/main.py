@@ -1,15 +1,27 @@
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 import logging
 import time
 import uuid
 
 from app.config import settings
-from app.database import init_db
-from app.api import auth, slots, bookings
+from app.database import init_db, replica_engine
+from app.cache.recent_writes import mark_recent_write
+from app.idempotency import IdempotencyMiddleware, REPLAYED_HEADER
+from app.instrumentation import start_request_timing
+from app.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, http_metrics, render_metrics
+from app.cache.redis import close_redis
+from app.realtime import slot_events
+from app.tasks import post_commit
+from app.services.utilization import utilization_refresher
+from app.services.waitlist import waitlist_promoter
+from app.auth.user_cache import USER_CHANNEL, on_user_change, user_cache
+from app.auth.token_cache import token_cache
+from app.auth.security import hash_metrics
+from app.api import auth, slots, bookings, waitlist, exports, stats
 
 # Configure logging
 logging.basicConfig(
@@ -18,6 +30,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Methods that never write; any other successful request may have
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -31,10 +46,23 @@ async def lifespan(app: FastAPI):
         logger.error(f"Database initialization failed: {e}")
         raise
     
+    post_commit.start()
+    # Other processes' user changes arrive over the slot listener's connection
+    slot_events.listen(USER_CHANNEL, on_user_change, user_cache.clear)
+    slot_events.start()
+    utilization_refresher.start()
+    waitlist_promoter.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Service Scheduler API...")
+    await slot_events.stop()
+    await utilization_refresher.stop()
+    await waitlist_promoter.stop()
+    # Drain queued side effects while Redis and the database are still up
+    await post_commit.stop()
+    await close_redis()
 
 
 # Create FastAPI application
@@ -47,6 +75,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Idempotency-Key replays; added first so it runs innermost, inside request
+# tracking and CORS, and a replay still gets their headers
+app.add_middleware(IdempotencyMiddleware)
+
 # Security middleware
 app.add_middleware(
     TrustedHostMiddleware, 
@@ -60,6 +92,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing", REPLAYED_HEADER],
 )
 
 
@@ -70,16 +103,35 @@ async def add_request_id(request: Request, call_next):
     request_id = str(uuid.uuid4())
     request.state.request_id = request_id
     
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+    timing = start_request_timing()
+    http_metrics.request_started(request)
+    status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        http_metrics.request_finished(request, status_code, timing.elapsed())
+    
+    # Pin the user's next reads to the primary before they see this response
+    user_id = getattr(request.state, "user_id", None)
+    if (
+        replica_engine is not None
+        and user_id is not None
+        and request.method not in SAFE_METHODS
+        and status_code < 400
+    ):
+        await mark_recent_write(user_id)
+    
+    process_time = timing.elapsed()
     
     response.headers["X-Request-ID"] = request_id
     response.headers["X-Process-Time"] = str(process_time)
+    response.headers["Server-Timing"] = timing.server_timing(process_time)
     
     logger.info(
         f"Request {request_id}: {request.method} {request.url.path} "
-        f"completed in {process_time:.4f}s with status {response.status_code}"
+        f"completed in {process_time:.4f}s with status {response.status_code} "
+        f"({timing.log_summary()})"
     )
     
     return response
@@ -109,14 +161,30 @@ async def health_check():
         "status": "healthy",
         "service": "Service Scheduler API",
         "version": "1.0.0",
-        "timestamp": time.time()
+        "timestamp": time.time(),
+        "caches": {
+            "users": user_cache.stats(),
+            "tokens": token_cache.stats()
+        },
+        "password_hashing": hash_metrics.stats(),
+        "slot_event_subscribers": slot_events.subscriber_count,
+        "post_commit_queue_depth": post_commit.depth
     }
 
 
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics():
+    """Prometheus metrics for this process."""
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+
 # API Routes
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(slots.router, prefix="/api/v1")
 app.include_router(bookings.router, prefix="/api/v1")
+app.include_router(waitlist.router, prefix="/api/v1")
+app.include_router(exports.router, prefix="/api/v1")
+app.include_router(stats.router, prefix="/api/v1")
 
 
 # Root endpoint
@@ -0,0 +1,136 @@
+"""Concurrent claims never overbook a slot or double-book a user."""
+import asyncio
+import uuid
+
+from sqlalchemy import func, select
+
+from app.database import AsyncSessionLocal
+from app.models.booking import Booking, BookingStatus
+from app.models.slot import Slot
+from app.models.user import User
+from app.cache.slots import get_slot_cache_version
+from app.services.booking_claims import ClaimFailure, claim_slot, claim_slots, release_booking
+from conftest import create_slot
+
+
+async def make_users(count: int) -> list:
+    async with AsyncSessionLocal() as session:
+        users = [
+            User(email=f"claimer-{n}@example.com", password_hash="x", first_name="C", last_name=str(n))
+            for n in range(count)
+        ]
+        session.add_all(users)
+        await session.commit()
+        return [u.id for u in users]
+
+
+async def claim(slot_id, user_id):
+    async with AsyncSessionLocal() as session:
+        booking = await claim_slot(session, slot_id, user_id)
+        if booking is None:
+            await session.rollback()
+            return None
+        await session.commit()
+        return booking.id
+
+
+async def slot_state(slot_id):
+    async with AsyncSessionLocal() as session:
+        slot = await session.get(Slot, slot_id)
+        active = await session.scalar(
+            select(func.count()).where(Booking.slot_id == slot_id, Booking.status == BookingStatus.ACTIVE)
+        )
+        return slot, active
+
+
+async def test_concurrent_claims_fill_exactly_to_capacity(client, admin):
+    slot_id = uuid.UUID((await create_slot(client, admin, max_participants=3))["id"])
+    user_ids = await make_users(10)
+
+    results = await asyncio.gather(*(claim(slot_id, user_id) for user_id in user_ids))
+
+    assert sum(r is not None for r in results) == 3
+    slot, active = await slot_state(slot_id)
+    assert slot.current_participants == active == 3
+    assert slot.is_full
+
+
+async def test_concurrent_claims_by_one_user_book_once(client, admin):
+    slot_id = uuid.UUID((await create_slot(client, admin, max_participants=5))["id"])
+    (user_id,) = await make_users(1)
+
+    results = await asyncio.gather(*(claim(slot_id, user_id) for _ in range(5)))
+
+    assert sum(r is not None for r in results) == 1
+    slot, active = await slot_state(slot_id)
+    assert slot.current_participants == active == 1
+
+
+async def test_release_frees_the_spot_for_the_next_claim(client, admin):
+    slot_id = uuid.UUID((await create_slot(client, admin, max_participants=1))["id"])
+    first, second = await make_users(2)
+    booking_id = await claim(slot_id, first)
+    assert await claim(slot_id, second) is None
+
+    async with AsyncSessionLocal() as session:
+        assert await release_booking(session, booking_id)
+        assert not await release_booking(session, booking_id)
+        await session.commit()
+
+    assert await claim(slot_id, second) is not None
+    slot, active = await slot_state(slot_id)
+    assert slot.current_participants == active == 1
+
+
+async def test_bulk_claim_all_or_nothing_writes_nothing_on_failure(client, admin):
+    free = uuid.UUID((await create_slot(client, admin, max_participants=2))["id"])
+    full = uuid.UUID((await create_slot(
+        client, admin, start_time="2031-07-02T10:00:00Z", end_time="2031-07-02T11:00:00Z"
+    ))["id"])
+    first, second = await make_users(2)
+    await claim(full, first)
+
+    async with AsyncSessionLocal() as session:
+        outcomes = await claim_slots(session, [free, full], second, all_or_nothing=True)
+        await session.commit()
+
+    assert outcomes == {full: ClaimFailure.SLOT_UNAVAILABLE}
+    slot, active = await slot_state(free)
+    assert slot.current_participants == active == 0
+
+
+async def test_filling_a_slot_leaves_the_admin_flag_alone(client, admin, user):
+    slot = await create_slot(client, admin)
+    response = await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=user)
+    assert response.status_code == 201
+
+    slot, _ = await slot_state(uuid.UUID(slot["id"]))
+    assert slot.is_available and slot.is_full
+    response = await client.get("/api/v1/slots/", params={"available_only": "true"}, headers=user)
+    assert response.json() == []
+
+
+async def test_releasing_a_spot_keeps_an_admin_closed_slot_closed(client, admin, user):
+    slot = await create_slot(client, admin)
+    booking = (await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=user)).json()
+    response = await client.put(f"/api/v1/slots/{slot['id']}", json={"is_available": False}, headers=admin)
+    assert response.status_code == 200
+
+    await client.delete(f"/api/v1/bookings/{booking['id']}", headers=user)
+
+    closed, active = await slot_state(uuid.UUID(slot["id"]))
+    assert not closed.is_available and active == 0
+    response = await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=user)
+    assert response.status_code == 400
+
+
+async def test_bulk_claim_that_books_nothing_keeps_cached_pages(client, admin, user, fake_redis):
+    slot = await create_slot(client, admin)
+    await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=admin)
+    version = await get_slot_cache_version()
+
+    response = await client.post("/api/v1/bookings/bulk", json={"slot_ids": [slot["id"]]}, headers=user)
+
+    assert response.status_code == 200
+    assert not response.json()["results"][0]["booked"]
+    assert await get_slot_cache_version() == version
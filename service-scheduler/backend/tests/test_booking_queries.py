@@ -0,0 +1,50 @@
+"""Booking detail endpoints load bookings with slot and user in one query."""
+from conftest import create_slot, query_count
+
+
+async def book(client, headers, slot_id):
+    response = await client.post("/api/v1/bookings/", json={"slot_id": slot_id}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def test_my_bookings_is_one_query(client, admin, user):
+    for hour in range(10, 13):
+        slot = await create_slot(
+            client, admin, start_time=f"2031-07-01T{hour}:00:00Z", end_time=f"2031-07-01T{hour}:30:00Z"
+        )
+        await book(client, user, slot["id"])
+
+    # The first request also loads the user into the user cache
+    await client.get("/api/v1/bookings/my", headers=user)
+    response = await client.get("/api/v1/bookings/my", headers=user)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+    assert all(b["slot"]["title"] and b["user"]["email"] for b in response.json())
+    assert query_count(response) == 1
+
+
+async def test_all_bookings_is_one_query(client, admin, user):
+    slot = await create_slot(client, admin, max_participants=5)
+    await book(client, user, slot["id"])
+    await book(client, admin, slot["id"])
+
+    await client.get("/api/v1/bookings/", headers=admin)
+    response = await client.get("/api/v1/bookings/", headers=admin)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert query_count(response) == 1
+
+
+async def test_booking_detail_is_one_query(client, admin, user):
+    slot = await create_slot(client, admin)
+    booking = await book(client, user, slot["id"])
+
+    await client.get(f"/api/v1/bookings/{booking['id']}", headers=user)
+    response = await client.get(f"/api/v1/bookings/{booking['id']}", headers=user)
+
+    assert response.status_code == 200
+    assert response.json()["slot"]["id"] == slot["id"]
+    assert query_count(response) == 1
@@ -0,0 +1,50 @@
+import csv
+import io
+
+from app.api import exports
+from app.auth.user_cache import user_cache
+from app.database import engine
+from conftest import create_slot
+
+
+async def test_csv_export_escapes_formulas(client, admin):
+    await create_slot(client, admin, title='=HYPERLINK("http://evil.example","x")', description="-2+3")
+
+    response = await client.get("/api/v1/exports/slots", params={"format": "csv"}, headers=admin)
+
+    assert response.status_code == 200
+    header, row = list(csv.reader(io.StringIO(response.text)))
+    assert row[header.index("title")] == '\'=HYPERLINK("http://evil.example","x")'
+    assert row[header.index("description")] == "'-2+3"
+
+
+async def test_export_holds_no_connection_besides_its_cursor(client, admin, monkeypatch):
+    await create_slot(client, admin)
+    # Authentication must go to the database, not the cache
+    user_cache.clear()
+    checked_out = []
+    encode = exports._encode_ndjson
+
+    def recording_encode(columns, rows):
+        checked_out.append(engine.pool.checkedout())
+        return encode(columns, rows)
+
+    monkeypatch.setattr(exports, "_encode_ndjson", recording_encode)
+    response = await client.get("/api/v1/exports/slots", headers=admin)
+
+    assert response.status_code == 200
+    assert checked_out == [1]
+
+
+async def test_export_requires_admin(client, user):
+    response = await client.get("/api/v1/exports/slots", headers=user)
+
+    assert response.status_code == 403
+
+
+async def test_export_refuses_a_token_in_the_query_string(client, admin):
+    token = admin["Authorization"].removeprefix("Bearer ")
+
+    response = await client.get("/api/v1/exports/slots", params={"access_token": token})
+
+    assert response.status_code == 403
@@ -0,0 +1,62 @@
+from conftest import create_slot
+
+SLOT = {"title": "Yoga class", "start_time": "2031-07-01T10:00:00Z", "end_time": "2031-07-01T11:00:00Z"}
+
+
+def keyed(headers: dict, key: str = "key-1") -> dict:
+    return {**headers, "Idempotency-Key": key}
+
+
+async def stored_keys(fake_redis) -> list:
+    return [key async for key in fake_redis.scan_iter("idempotency:*")]
+
+
+async def test_success_is_replayed(client, admin, fake_redis):
+    first = await client.post("/api/v1/slots/", json=SLOT, headers=keyed(admin))
+    second = await client.post("/api/v1/slots/", json=SLOT, headers=keyed(admin))
+
+    assert first.status_code == second.status_code == 201
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json()["id"] == first.json()["id"]
+
+
+async def test_validation_error_is_replayed(client, admin, fake_redis):
+    body = {**SLOT, "max_participants": 0}
+
+    await client.post("/api/v1/slots/", json=body, headers=keyed(admin))
+    response = await client.post("/api/v1/slots/", json=body, headers=keyed(admin))
+
+    assert response.status_code == 422
+    assert response.headers["Idempotent-Replayed"] == "true"
+
+
+async def test_conflict_releases_the_key(client, admin, fake_redis):
+    existing = await create_slot(client, admin)
+    response = await client.post("/api/v1/slots/", json=SLOT, headers=keyed(admin))
+    assert response.status_code == 409
+    await client.delete(f"/api/v1/slots/{existing['id']}", headers=admin)
+
+    response = await client.post("/api/v1/slots/", json=SLOT, headers=keyed(admin))
+
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
+
+
+async def test_forbidden_releases_the_key(client, user, fake_redis):
+    response = await client.post("/api/v1/slots/", json=SLOT, headers=keyed(user))
+
+    assert response.status_code == 403
+    assert await stored_keys(fake_redis) == []
+
+
+async def test_full_slot_releases_the_key(client, admin, user, fake_redis):
+    slot = await create_slot(client, admin)
+    booking = (await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=admin)).json()
+    response = await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=keyed(user))
+    assert response.status_code == 400
+    await client.delete(f"/api/v1/bookings/{booking['id']}", headers=admin)
+
+    response = await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=keyed(user))
+
+    assert response.status_code == 201
+    assert "Idempotent-Replayed" not in response.headers
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.database import AsyncSessionLocal
+from app.models.booking import Booking
+from app.models.slot import Slot
+from app.models.user import User, UserRole
+from app.pagination import NEXT_CURSOR_HEADER
+from conftest import auth_headers, register
+
+ROWS = 7
+START = datetime(2031, 7, 1, 10, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+async def tied_rows(client):
+    """Slots sharing one start_time, and bookings sharing one booked_at."""
+    login = await register(client, "user@example.com")
+    async with AsyncSessionLocal() as session:
+        # One creator per slot, so the overlap constraint allows the tie
+        creators = [
+            User(email=f"admin-{n}@example.com", password_hash="x", first_name="Test", last_name="Admin",
+                 role=UserRole.ADMIN)
+            for n in range(ROWS)
+        ]
+        session.add_all(creators)
+        await session.flush()
+        slots = [
+            Slot(title=f"Slot {n}", start_time=START, end_time=START.replace(hour=11),
+                 max_participants=1, created_by=creator.id)
+            for n, creator in enumerate(creators)
+        ]
+        session.add_all(slots)
+        await session.flush()
+        session.add_all(
+            Booking(slot_id=slot.id, user_id=login["user"]["id"], booked_at=START) for slot in slots
+        )
+        await session.commit()
+    return auth_headers(login)
+
+
+async def walk(client, url: str, headers: dict, limit: int = 3) -> list:
+    """Follow X-Next-Cursor to the end; returns the ids of every page."""
+    pages = []
+    params = {"limit": limit}
+    while True:
+        response = await client.get(url, params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        pages.append([row["id"] for row in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return pages
+        params = {"limit": limit, "cursor": cursor}
+
+
+async def test_slot_pages_have_no_gaps_or_duplicates_on_ties(client, tied_rows):
+    pages = await walk(client, "/api/v1/slots/", tied_rows)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    ids = [row_id for page in pages for row_id in page]
+    everything = await client.get("/api/v1/slots/", headers=tied_rows)
+    assert ids == [row["id"] for row in everything.json()]
+    assert len(set(ids)) == ROWS
+
+
+async def test_booking_pages_have_no_gaps_or_duplicates_on_ties(client, tied_rows):
+    pages = await walk(client, "/api/v1/bookings/my", tied_rows)
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    ids = [row_id for page in pages for row_id in page]
+    everything = await client.get("/api/v1/bookings/my", headers=tied_rows)
+    assert ids == [row["id"] for row in everything.json()]
+    assert len(set(ids)) == ROWS
+
+
+async def test_last_page_has_no_next_cursor(client, tied_rows):
+    response = await client.get("/api/v1/slots/", params={"limit": ROWS + 1}, headers=tied_rows)
+
+    assert len(response.json()) == ROWS
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+@pytest.mark.parametrize("url", ["/api/v1/slots/", "/api/v1/bookings/my"])
+async def test_malformed_cursor_is_rejected(client, user, url):
+    response = await client.get(url, params={"cursor": "not-a-cursor"}, headers=user)
+
+    assert response.status_code == 400
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import time
+
+from app.auth import security
+from app.auth.security import get_password_hash_async, hash_metrics, verify_password_async
+from app.config import settings
+
+
+async def test_hashing_runs_on_the_bounded_pool(monkeypatch):
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    threads = set()
+
+    def slow_hash(password: str) -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+            threads.add(threading.current_thread().name)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return f"hashed-{password}"
+
+    monkeypatch.setattr(security, "get_password_hash", slow_hash)
+    completed = hash_metrics.completed
+    jobs = settings.password_hash_concurrency * 3
+
+    hashes = await asyncio.gather(*(get_password_hash_async(f"pw{n}") for n in range(jobs)))
+
+    assert hashes == [f"hashed-pw{n}" for n in range(jobs)]
+    assert peak == settings.password_hash_concurrency
+    assert all(name.startswith("password-hash") for name in threads)
+    assert hash_metrics.completed == completed + jobs
+    assert hash_metrics.waiting == hash_metrics.running == 0
+    # Later jobs queued behind the semaphore
+    assert hash_metrics.queue_seconds_max >= 0.05
+
+
+async def test_verify_password_async_checks_real_hashes():
+    hashed = security.get_password_hash("password123")
+
+    assert await verify_password_async("password123", hashed)
+    assert not await verify_password_async("wrong", hashed)
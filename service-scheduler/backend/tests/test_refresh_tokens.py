@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from app.database import AsyncSessionLocal
+from app.models.refresh_token import RefreshToken
+from app.services import refresh_tokens
+from conftest import PASSWORD, register
+
+
+async def login(client) -> str:
+    response = await client.post("/api/v1/auth/login", json={"email": "user@example.com", "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return response.json()["refresh_token"]
+
+
+async def refresh(client, token: str):
+    return await client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+
+
+async def token_rows() -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(RefreshToken))
+
+
+async def test_reused_rotated_token_revokes_all_sessions(client, monkeypatch):
+    monkeypatch.setattr(refresh_tokens, "REUSE_GRACE", timedelta(0))
+    first = (await register(client, "user@example.com"))["refresh_token"]
+    other_session = await login(client)
+
+    rotated = await refresh(client, first)
+    assert rotated.status_code == 200
+
+    assert (await refresh(client, first)).status_code == 401
+    assert (await refresh(client, rotated.json()["refresh_token"])).status_code == 401
+    assert (await refresh(client, other_session)).status_code == 401
+
+
+async def test_logged_out_token_is_refused_without_revoking_other_sessions(client, monkeypatch):
+    monkeypatch.setattr(refresh_tokens, "REUSE_GRACE", timedelta(0))
+    logged_out = (await register(client, "user@example.com"))["refresh_token"]
+    other_session = await login(client)
+
+    response = await client.post("/api/v1/auth/logout", json={"refresh_token": logged_out})
+    assert response.status_code == 204
+
+    assert (await refresh(client, logged_out)).status_code == 401
+    assert (await refresh(client, other_session)).status_code == 200
+
+
+async def test_logged_out_tokens_are_purged_and_rotated_ones_kept(client):
+    logged_out = (await register(client, "user@example.com"))["refresh_token"]
+    await client.post("/api/v1/auth/logout", json={"refresh_token": logged_out})
+    assert await token_rows() == 1
+
+    # Rotating purges the logged-out token, and keeps the rotated one
+    second = await login(client)
+    assert await token_rows() == 1
+    assert (await refresh(client, second)).status_code == 200
+    assert await token_rows() == 2
@@ -0,0 +1,55 @@
+import pytest
+
+import main
+from app.auth import dependencies
+from app.cache.slots import CachedPage, get_slot_cache_version, store_slot_page
+from app.database import engine
+from conftest import create_slot
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    # The primary stands in for the replica; what matters is which one is chosen
+    monkeypatch.setattr(dependencies, "replica_engine", engine)
+    monkeypatch.setattr(main, "replica_engine", engine)
+
+
+async def cached_pages(fake_redis) -> list:
+    return [key async for key in fake_redis.scan_iter("slots:list:*")]
+
+
+async def test_replica_pages_are_cached(client, admin, user, fake_redis, replica):
+    await create_slot(client, admin)
+
+    response = await client.get("/api/v1/slots/", headers=user)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert len(await cached_pages(fake_redis)) == 1
+
+
+async def test_pages_read_after_own_write_are_not_cached(client, admin, fake_redis, replica):
+    await create_slot(client, admin)
+
+    response = await client.get("/api/v1/slots/", headers=admin)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert await cached_pages(fake_redis) == []
+
+
+async def test_pinned_reads_skip_cached_pages(client, admin, user, fake_redis, replica):
+    await create_slot(client, admin)
+    # A page another user read from a replica that had not seen the slot yet
+    stale = CachedPage(body=b"[]", next_cursor=None, etag='W/"stale"')
+    default_filters = {
+        "skip": 0, "limit": 100, "cursor": None, "available_only": False,
+        "start_date": None, "end_date": None, "search": None,
+    }
+    await store_slot_page(await get_slot_cache_version(), default_filters, stale)
+
+    assert (await client.get("/api/v1/slots/", headers=user)).json() == []
+    response = await client.get("/api/v1/slots/", headers=admin)
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
@@ -0,0 +1,49 @@
+from app.api import slots
+from conftest import create_slot
+
+
+async def test_overlapping_slot_is_a_conflict(client, admin):
+    await create_slot(client, admin)
+
+    response = await client.post("/api/v1/slots/", json={
+        "title": "Overlap", "start_time": "2031-07-01T10:30:00Z", "end_time": "2031-07-01T11:30:00Z"
+    }, headers=admin)
+
+    assert response.status_code == 409
+
+
+async def test_back_to_back_slots_do_not_conflict(client, admin):
+    await create_slot(client, admin)
+
+    await create_slot(client, admin, start_time="2031-07-01T11:00:00Z", end_time="2031-07-01T12:00:00Z")
+
+
+async def test_overlap_missed_by_the_check_is_a_conflict(client, admin, monkeypatch):
+    await create_slot(client, admin)
+
+    # As if the other slot committed between the check and this insert
+    async def no_conflicts(*args):
+        return []
+
+    monkeypatch.setattr(slots, "find_conflicts", no_conflicts)
+    body = {"title": "Race", "start_time": "2031-07-01T10:30:00Z", "end_time": "2031-07-01T11:30:00Z"}
+    response = await client.post("/api/v1/slots/", json=body, headers=admin)
+    assert response.status_code == 409
+
+    series = {
+        "title": "Race", "weekdays": [2], "start_times": ["10:30"], "duration_minutes": 60,
+        "starts_on": "2031-07-01", "count": 1
+    }
+    response = await client.post("/api/v1/slots/series", json=series, headers=admin)
+    assert response.status_code == 409
+
+
+async def test_moving_a_slot_onto_another_is_a_conflict(client, admin):
+    await create_slot(client, admin)
+    later = await create_slot(client, admin, start_time="2031-07-01T12:00:00Z", end_time="2031-07-01T13:00:00Z")
+
+    response = await client.put(f"/api/v1/slots/{later['id']}", json={
+        "start_time": "2031-07-01T10:30:00Z"
+    }, headers=admin)
+
+    assert response.status_code == 409
@@ -0,0 +1,32 @@
+from app.auth.dependencies import get_current_event_stream_user
+
+
+async def stream_token(client, headers) -> str:
+    response = await client.post("/api/v1/slots/events/token", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["token"]
+
+
+async def test_stream_token_authenticates_the_event_stream(client, user):
+    token = await stream_token(client, user)
+
+    # The stream itself never ends, so check its dependency directly
+    current_user = await get_current_event_stream_user(token=token, credentials=None)
+
+    assert current_user.email == "user@example.com"
+
+
+async def test_access_token_is_refused_in_the_query_string(client, user):
+    access_token = user["Authorization"].removeprefix("Bearer ")
+
+    response = await client.get("/api/v1/slots/events", params={"token": access_token})
+
+    assert response.status_code == 401
+
+
+async def test_stream_token_is_not_a_bearer_token(client, user):
+    token = await stream_token(client, user)
+
+    response = await client.get("/api/v1/bookings/my", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 401
@@ -0,0 +1,21 @@
+SERIES = {
+    "title": "Weekly yoga", "weekdays": [2], "start_times": ["09:00"], "duration_minutes": 60,
+    "starts_on": "2031-07-01", "count": 2, "timezone": "Europe/Berlin"
+}
+
+
+async def test_series_times_are_local_to_its_time_zone(client, admin):
+    response = await client.post("/api/v1/slots/series", json=SERIES, headers=admin)
+
+    assert response.status_code == 201
+    assert [slot["start_time"] for slot in response.json()] == [
+        "2031-07-01T07:00:00Z", "2031-07-08T07:00:00Z"
+    ]
+
+
+async def test_start_time_with_an_offset_is_rejected(client, admin):
+    response = await client.post(
+        "/api/v1/slots/series", json={**SERIES, "start_times": ["09:00+02:00"]}, headers=admin
+    )
+
+    assert response.status_code == 422
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.tasks import PostCommitQueue
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    monkeypatch.setattr(settings, "task_queue_max_size", 1)
+    monkeypatch.setattr(settings, "task_queue_workers", 1)
+    monkeypatch.setattr(settings, "task_queue_max_attempts", 3)
+    monkeypatch.setattr(settings, "task_queue_retry_base_seconds", 0.01)
+    monkeypatch.setattr(settings, "task_queue_drain_seconds", 1.0)
+    return PostCommitQueue()
+
+
+async def test_failing_job_is_retried(queue):
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError("not yet")
+
+    queue.start()
+    await queue.enqueue(flaky)
+    await queue.stop()
+
+    assert len(calls) == 3
+    assert sum(queue.metrics.retries.values()) == 2
+    assert sum(queue.metrics.completed.values()) == 1
+
+
+async def test_job_failing_every_attempt_is_counted(queue):
+    async def broken():
+        raise RuntimeError("always")
+
+    queue.start()
+    await queue.enqueue(broken)
+    await queue.stop()
+
+    assert sum(queue.metrics.failed.values()) == 1
+    assert sum(queue.metrics.retries.values()) == settings.task_queue_max_attempts - 1
+
+
+async def test_full_queue_runs_the_job_inline(queue):
+    release = asyncio.Event()
+    ran = []
+
+    async def blocking():
+        await release.wait()
+
+    async def job(name):
+        ran.append(name)
+
+    queue.start()
+    await queue.enqueue(blocking)
+    await asyncio.sleep(0)  # The worker picks it up
+    await queue.enqueue(job, "queued")
+    await queue.enqueue(job, "inline")
+
+    # The queue's one place is taken, so the last job already ran here
+    assert ran == ["inline"]
+    assert sum(queue.metrics.inline.values()) == 1
+
+    release.set()
+    await queue.stop()
+    assert ran == ["inline", "queued"]
+
+
+async def test_stop_drains_queued_jobs(queue, monkeypatch):
+    monkeypatch.setattr(settings, "task_queue_max_size", 10)
+    ran = []
+
+    async def job(n):
+        await asyncio.sleep(0.01)
+        ran.append(n)
+
+    queue.start()
+    for n in range(5):
+        await queue.enqueue(job, n)
+    await queue.stop()
+
+    assert ran == [0, 1, 2, 3, 4]
+    assert queue.depth == 0
+
+
+async def test_stop_gives_up_after_the_drain_timeout(queue, monkeypatch):
+    monkeypatch.setattr(settings, "task_queue_drain_seconds", 0.05)
+
+    async def stuck():
+        await asyncio.Event().wait()
+
+    queue.start()
+    await queue.enqueue(stuck)
+    await asyncio.wait_for(queue.stop(), timeout=1)
+
+    assert queue.metrics.running == 0
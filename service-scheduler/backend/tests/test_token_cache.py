@@ -0,0 +1,66 @@
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+
+from app.auth import security
+from app.auth.security import create_access_token, create_token_payload, verify_token
+from app.auth.token_cache import get_verified_token, token_cache
+from app.config import settings
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+def access_token(expires_in: timedelta = timedelta(minutes=5)) -> str:
+    payload = create_token_payload(user_id=str(uuid.uuid4()), email="user@example.com", role="user")
+    return create_access_token(data=payload, expires_delta=expires_in)
+
+
+def test_verified_token_is_served_from_the_cache(monkeypatch):
+    token = access_token()
+    token_data = verify_token(token)
+
+    def no_decode(*args, **kwargs):
+        raise AssertionError("token decoded again")
+
+    monkeypatch.setattr(security.jwt, "decode", no_decode)
+    assert verify_token(token) == token_data
+
+
+def test_cached_token_expires_with_its_exp(monkeypatch):
+    token = access_token(timedelta(seconds=10))
+    verify_token(token)
+    assert get_verified_token(token) is not None
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+    # Well within the cache's own TTL, but past the token's exp
+    assert 11 < token_cache.ttl
+    assert get_verified_token(token) is None
+
+
+def test_cache_key_depends_on_the_secret(monkeypatch):
+    token = access_token()
+    verify_token(token)
+
+    monkeypatch.setattr(settings, "jwt_secret_key", "a-rotated-secret-of-sufficient-length")
+
+    assert get_verified_token(token) is None
+    assert verify_token(token) is None
+
+
+def test_cache_key_depends_on_the_algorithm(monkeypatch):
+    token = access_token()
+    verify_token(token)
+
+    monkeypatch.setattr(settings, "jwt_algorithm", "HS512")
+
+    assert get_verified_token(token) is None
+    assert verify_token(token) is None
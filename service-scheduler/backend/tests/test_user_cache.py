@@ -0,0 +1,29 @@
+import asyncio
+
+from sqlalchemy import update
+
+from app.auth.user_cache import USER_CHANNEL, on_user_change, user_cache
+from app.database import AsyncSessionLocal
+from app.models.user import User
+from app.realtime import slot_events
+
+
+async def test_core_update_from_elsewhere_drops_the_cached_user(client, user, monkeypatch):
+    monkeypatch.setattr(slot_events, "_channels", {})
+    slot_events.listen(USER_CHANNEL, on_user_change, user_cache.clear)
+    slot_events.start()
+    try:
+        # Let the listener connect
+        await asyncio.sleep(0.5)
+        assert (await client.get("/api/v1/bookings/my", headers=user)).status_code == 200
+
+        # A Core statement, as another process or Hasura would write it
+        async with AsyncSessionLocal() as session:
+            await session.execute(update(User).values(is_active=False))
+            await session.commit()
+        await asyncio.sleep(0.2)
+
+        response = await client.get("/api/v1/bookings/my", headers=user)
+        assert response.status_code == 401
+    finally:
+        await slot_events.stop()
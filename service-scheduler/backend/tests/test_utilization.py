@@ -0,0 +1,26 @@
+"""The stats refresh takes turns across processes through an advisory lock."""
+from sqlalchemy import func, select, text
+
+from app.database import engine
+from app.services.utilization import _REFRESH_LOCK_KEY, refresh_utilization_stats
+from conftest import create_slot
+
+
+async def test_refresh_skips_while_another_process_refreshes(db):
+    async with engine.connect() as other:
+        async with other.begin():
+            await other.execute(select(func.pg_advisory_xact_lock(_REFRESH_LOCK_KEY)))
+            assert await refresh_utilization_stats() is False
+    assert await refresh_utilization_stats() is True
+
+
+async def test_refresh_sees_new_bookings(client, admin, user):
+    slot = await create_slot(client, admin, max_participants=2)
+    await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=user)
+
+    assert await refresh_utilization_stats()
+    async with engine.connect() as conn:
+        row = (await conn.execute(text(
+            "SELECT spots_offered, spots_filled, bookings FROM slot_utilization_daily"
+        ))).one()
+    assert tuple(row) == (2, 1, 1)
@@ -0,0 +1,125 @@
+"""Waitlist promotion under concurrent workers."""
+import asyncio
+
+from sqlalchemy import select, update
+
+from app.database import AsyncSessionLocal
+from app.models.booking import Booking, BookingStatus
+from app.models.slot import Slot
+from app.models.waitlist import WaitlistEntry, WaitlistStatus
+from app.services.waitlist import promote_waitlist, waitlist_promoter
+from conftest import auth_headers, create_slot, register
+
+
+async def join(client, headers, slot_id):
+    response = await client.post("/api/v1/waitlist/", json={"slot_id": slot_id}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+async def full_slot_with_waiters(client, admin, waiters: int, capacity: int = 1):
+    slot = await create_slot(client, admin, max_participants=capacity)
+    for n in range(capacity):
+        holder = auth_headers(await register(client, f"holder-{n}@example.com"))
+        response = await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=holder)
+        assert response.status_code == 201
+    headers = [auth_headers(await register(client, f"waiter-{n}@example.com")) for n in range(waiters)]
+    entries = [await join(client, h, slot["id"]) for h in headers]
+    return slot, headers, entries
+
+
+async def statuses():
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(WaitlistEntry).order_by(WaitlistEntry.created_at))
+        return [entry.status for entry in result.scalars()]
+
+
+async def test_positions_follow_join_order(client, admin):
+    _, headers, entries = await full_slot_with_waiters(client, admin, waiters=3)
+
+    assert [e["position"] for e in entries] == [1, 2, 3]
+    await client.delete(f"/api/v1/waitlist/{entries[0]['id']}", headers=headers[0])
+    response = await client.get("/api/v1/waitlist/my", headers=headers[2])
+    assert response.json()[0]["position"] == 2
+
+
+async def test_cancellation_promotes_oldest_waiter(client, admin, user):
+    slot = await create_slot(client, admin)
+    booking = (await client.post("/api/v1/bookings/", json={"slot_id": slot["id"]}, headers=user)).json()
+    waiters = [auth_headers(await register(client, f"waiter-{n}@example.com")) for n in range(2)]
+    for headers in waiters:
+        await join(client, headers, slot["id"])
+
+    await client.delete(f"/api/v1/bookings/{booking['id']}", headers=user)
+    await promote_waitlist(50)
+
+    assert await statuses() == [WaitlistStatus.PROMOTED, WaitlistStatus.WAITING]
+    response = await client.get("/api/v1/bookings/my", headers=waiters[0])
+    assert [b["slot_id"] for b in response.json()] == [slot["id"]]
+
+
+async def test_concurrent_promoters_never_overbook(client, admin):
+    await full_slot_with_waiters(client, admin, waiters=6, capacity=2)
+    # Free both spots at once, bypassing the API so nothing promotes early
+    async with AsyncSessionLocal() as session:
+        await session.execute(update(Booking).values(status=BookingStatus.CANCELLED))
+        await session.execute(update(Slot).values(current_participants=0))
+        await session.commit()
+
+    await asyncio.gather(*(promote_waitlist(1) for _ in range(6)))
+
+    # Each promoter locks a different entry, so which two win is a race
+    outcome = await statuses()
+    assert outcome.count(WaitlistStatus.PROMOTED) == 2
+    assert outcome.count(WaitlistStatus.WAITING) == 4
+    async with AsyncSessionLocal() as session:
+        active = (await session.execute(
+            select(Booking).where(Booking.status == BookingStatus.ACTIVE)
+        )).scalars().all()
+    assert len(active) == 2
+
+
+async def promoted_after(seconds: float = 0.5):
+    """Let the running promoter handle its wake-up, then read the entries."""
+    await asyncio.sleep(seconds)
+    return await statuses()
+
+
+async def test_raising_capacity_promotes_waiters(client, admin):
+    slot, _, _ = await full_slot_with_waiters(client, admin, waiters=3)
+
+    waitlist_promoter.start()
+    try:
+        response = await client.put(
+            f"/api/v1/slots/{slot['id']}", json={"max_participants": 3}, headers=admin
+        )
+        assert response.status_code == 200
+        assert await promoted_after() == [WaitlistStatus.PROMOTED] * 2 + [WaitlistStatus.WAITING]
+    finally:
+        await waitlist_promoter.stop()
+
+    response = await client.get(f"/api/v1/slots/{slot['id']}", headers=admin)
+    assert response.json()["current_participants"] == 3
+    assert response.json()["is_full"]
+
+
+async def test_reopening_a_closed_slot_promotes_waiters(client, admin):
+    slot = await create_slot(client, admin, max_participants=2)
+    await client.put(f"/api/v1/slots/{slot['id']}", json={"is_available": False}, headers=admin)
+    waiter = auth_headers(await register(client, "waiter@example.com"))
+    await join(client, waiter, slot["id"])
+
+    waitlist_promoter.start()
+    try:
+        await client.put(f"/api/v1/slots/{slot['id']}", json={"is_available": True}, headers=admin)
+        assert await promoted_after() == [WaitlistStatus.PROMOTED]
+    finally:
+        await waitlist_promoter.stop()
+
+
+async def test_capacity_cannot_drop_below_participants(client, admin):
+    slot, _, _ = await full_slot_with_waiters(client, admin, waiters=0, capacity=2)
+
+    response = await client.put(f"/api/v1/slots/{slot['id']}", json={"max_participants": 1}, headers=admin)
+
+    assert response.status_code == 400
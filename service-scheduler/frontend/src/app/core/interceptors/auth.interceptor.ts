@@ -1,36 +1,44 @@
 import { Injectable } from '@angular/core';
 import { HttpRequest, HttpHandler, HttpEvent, HttpInterceptorFn, HttpErrorResponse } from '@angular/common/http';
 import { Observable, throwError } from 'rxjs';
-import { catchError } from 'rxjs/operators';
+import { catchError, switchMap } from 'rxjs/operators';
 import { inject } from '@angular/core';
 import { AuthService } from '../services/auth.service';
 
 export const authInterceptor: HttpInterceptorFn = (req, next) => {
   const authService = inject(AuthService);
   
-  // Get the auth token
-  const token = authService.getToken();
-  
   // Clone the request and add authorization header if token exists
-  let request = req;
-  if (token) {
-    request = req.clone({
-      setHeaders: {
-        Authorization: `Bearer ${token}`,
-        'Content-Type': 'application/json'
-      }
-    });
-  }
+  const withToken = (token: string | null) => token
+    ? req.clone({
+        setHeaders: {
+          Authorization: `Bearer ${token}`,
+          'Content-Type': 'application/json'
+        }
+      })
+    : req;
 
   // Handle the request and catch errors
-  return next(request).pipe(
+  return next(withToken(authService.getToken())).pipe(
     catchError((error: HttpErrorResponse) => {
-      // If 401 Unauthorized, logout user
-      if (error.status === 401) {
+      if (error.status !== 401) {
+        return throwError(() => error);
+      }
+
+      // Login and refresh failures mean the credentials themselves are bad
+      if (req.url.includes('/auth/') || !authService.getRefreshToken()) {
         authService.logout();
+        return throwError(() => error);
       }
-      
-      return throwError(() => error);
+
+      // Access token expired: refresh once and replay the request
+      return authService.refreshToken().pipe(
+        switchMap(response => next(withToken(response.access_token))),
+        catchError(refreshError => {
+          authService.logout();
+          return throwError(() => refreshError);
+        })
+      );
     })
   );
 };
@@ -16,6 +16,25 @@ export interface BookingCreate {
   notes?: string;
 }
 
+export interface BulkBookingCreate {
+  slot_ids: string[];
+  notes?: string;
+  all_or_nothing?: boolean;
+}
+
+export interface BulkBookingItem {
+  slot_id: string;
+  booked: boolean;
+  booking?: Booking;
+  detail?: string;
+}
+
+export interface BulkBookingResult {
+  booked: number;
+  failed: number;
+  results: BulkBookingItem[];
+}
+
 export interface BookingUpdate {
   notes?: string;
   status?: BookingStatus;
@@ -26,7 +45,31 @@ export enum BookingStatus {
   CANCELLED = 'cancelled'
 }
 
+export enum WaitlistStatus {
+  WAITING = 'waiting',
+  PROMOTED = 'promoted',
+  CANCELLED = 'cancelled'
+}
+
+export interface WaitlistJoin {
+  slot_id: string;
+  notes?: string;
+}
+
+export interface WaitlistEntry {
+  id: string;
+  slot_id: string;
+  user_id: string;
+  status: WaitlistStatus;
+  notes?: string;
+  created_at: string;
+  promoted_at?: string;
+  booking_id?: string;
+  position?: number; // 1-based, while waiting
+}
+
 export interface BookingFilters {
   skip?: number;
   limit?: number;
+  cursor?: string;
 }
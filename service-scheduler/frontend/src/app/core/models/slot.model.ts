@@ -23,6 +23,19 @@ export interface SlotCreate {
   max_participants: number;
 }
 
+export interface SlotSeriesCreate {
+  title: string;
+  description?: string;
+  max_participants: number;
+  weekdays: number[]; // ISO weekdays, 1 = Monday ... 7 = Sunday
+  start_times: string[]; // local times, e.g. '09:00'
+  duration_minutes: number;
+  starts_on: string; // YYYY-MM-DD
+  until?: string;
+  count?: number;
+  timezone?: string;
+}
+
 export interface SlotUpdate {
   title?: string;
   description?: string;
@@ -35,7 +48,47 @@ export interface SlotUpdate {
 export interface SlotFilters {
   skip?: number;
   limit?: number;
+  cursor?: string;
   available_only?: boolean;
   start_date?: string;
   end_date?: string;
+  search?: string; // ranked full-text match; page with skip, not cursor
+}
+
+export interface SlotPage {
+  items: Slot[];
+  nextCursor: string | null;
+}
+
+export interface SlotCalendarQuery {
+  start_date: string;
+  end_date: string; // exclusive
+  granularity?: 'day' | 'hour';
+  timezone?: string; // IANA name, e.g. 'Europe/Berlin'
+  created_by?: string;
+}
+
+// Periods without slots are omitted
+export interface SlotCalendarBucket {
+  period_start: string;
+  slot_count: number;
+  free_spots: number;
+  first_available: string | null;
+}
+
+export interface SlotChange {
+  op: 'insert' | 'update' | 'delete';
+  id: string;
+  is_available: boolean;
+  current_participants: number;
+  max_participants: number;
+}
+
+// 'resync' means changes may have been missed; refetch the slots on screen
+export type SlotEvent = SlotChange | { op: 'resync' };
+
+// Short-lived token that only opens the slot event stream
+export interface StreamToken {
+  token: string;
+  expires_in: number;
 }
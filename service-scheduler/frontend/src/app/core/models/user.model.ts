@@ -27,6 +27,7 @@ export interface AuthToken {
   access_token: string;
   token_type: string;
   expires_in: number;
+  refresh_token?: string; // single use; every refresh returns a new one
   user: User;
 }
 
@@ -1,7 +1,7 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpErrorResponse } from '@angular/common/http';
 import { BehaviorSubject, Observable, throwError } from 'rxjs';
-import { map, tap, catchError } from 'rxjs/operators';
+import { map, tap, catchError, finalize, shareReplay } from 'rxjs/operators';
 import { Router } from '@angular/router';
 import { User, UserLogin, UserCreate, AuthToken, UserRole } from '../models';
 import { environment } from '../../../environments/environment';
@@ -12,6 +12,10 @@ import { environment } from '../../../environments/environment';
 export class AuthService {
   private readonly TOKEN_KEY = 'service_scheduler_token';
   private readonly USER_KEY = 'service_scheduler_user';
+  private readonly REFRESH_TOKEN_KEY = 'service_scheduler_refresh_token';
+  
+  // Refresh tokens are single use, so concurrent 401s share one refresh
+  private refreshInFlight$: Observable<AuthToken> | null = null;
   
   private currentUserSubject = new BehaviorSubject<User | null>(null);
   public currentUser$ = this.currentUserSubject.asObservable();
@@ -47,10 +51,36 @@ export class AuthService {
       );
   }
 
+  /**
+   * Exchange the stored refresh token for a new access token (no password needed)
+   */
+  refreshToken(): Observable<AuthToken> {
+    const refreshToken = this.getRefreshToken();
+    if (!refreshToken) {
+      return throwError(() => new Error('No refresh token'));
+    }
+
+    if (!this.refreshInFlight$) {
+      this.refreshInFlight$ = this.http.post<AuthToken>(`${environment.apiUrl}/auth/refresh`, { refresh_token: refreshToken })
+        .pipe(
+          tap(response => this.setSession(response)),
+          finalize(() => this.refreshInFlight$ = null),
+          shareReplay(1)
+        );
+    }
+    return this.refreshInFlight$;
+  }
+
   /**
    * Logout user
    */
   logout(): void {
+    const refreshToken = this.getRefreshToken();
+    if (refreshToken) {
+      // Revoke the session server-side; the local session is cleared regardless
+      this.http.post(`${environment.apiUrl}/auth/logout`, { refresh_token: refreshToken })
+        .subscribe({ error: () => undefined });
+    }
     this.clearSession();
     this.router.navigate(['/login']);
   }
@@ -75,7 +105,8 @@ export class AuthService {
     try {
       const payload = JSON.parse(atob(token.split('.')[1]));
       const currentTime = Math.floor(Date.now() / 1000);
-      return payload.exp > currentTime;
+      // An expired access token is fine while a refresh token can replace it
+      return payload.exp > currentTime || this.getRefreshToken() !== null;
     } catch {
       return false;
     }
@@ -96,11 +127,21 @@ export class AuthService {
     return localStorage.getItem(this.TOKEN_KEY);
   }
 
+  /**
+   * Get refresh token from storage
+   */
+  getRefreshToken(): string | null {
+    return localStorage.getItem(this.REFRESH_TOKEN_KEY);
+  }
+
   /**
    * Set authentication session
    */
   private setSession(authToken: AuthToken): void {
     localStorage.setItem(this.TOKEN_KEY, authToken.access_token);
+    if (authToken.refresh_token) {
+      localStorage.setItem(this.REFRESH_TOKEN_KEY, authToken.refresh_token);
+    }
     localStorage.setItem(this.USER_KEY, JSON.stringify(authToken.user));
     this.currentUserSubject.next(authToken.user);
     this.isAuthenticatedSubject.next(true);
@@ -112,6 +153,7 @@ export class AuthService {
   private clearSession(): void {
     localStorage.removeItem(this.TOKEN_KEY);
     localStorage.removeItem(this.USER_KEY);
+    localStorage.removeItem(this.REFRESH_TOKEN_KEY);
     this.currentUserSubject.next(null);
     this.isAuthenticatedSubject.next(false);
   }
@@ -2,7 +2,9 @@ import { Injectable } from '@angular/core';
 import { HttpClient, HttpParams, HttpErrorResponse } from '@angular/common/http';
 import { Observable, throwError } from 'rxjs';
 import { catchError } from 'rxjs/operators';
-import { Booking, BookingCreate, BookingFilters } from '../models';
+import {
+  Booking, BookingCreate, BookingFilters, BulkBookingCreate, BulkBookingResult, WaitlistEntry, WaitlistJoin
+} from '../models';
 import { environment } from '../../../environments/environment';
 
 @Injectable({
@@ -10,6 +12,7 @@ import { environment } from '../../../environments/environment';
 })
 export class BookingService {
   private readonly baseUrl = `${environment.apiUrl}/bookings`;
+  private readonly waitlistUrl = `${environment.apiUrl}/waitlist`;
 
   constructor(private http: HttpClient) {}
 
@@ -21,6 +24,14 @@ export class BookingService {
       .pipe(catchError(this.handleError));
   }
 
+  /**
+   * Book several slots at once (e.g. a whole course)
+   */
+  createBookingsBulk(bookingData: BulkBookingCreate): Observable<BulkBookingResult> {
+    return this.http.post<BulkBookingResult>(`${this.baseUrl}/bulk`, bookingData)
+      .pipe(catchError(this.handleError));
+  }
+
   /**
    * Get current user's bookings
    */
@@ -34,6 +45,9 @@ export class BookingService {
       if (filters.limit !== undefined) {
         params = params.set('limit', filters.limit.toString());
       }
+      if (filters.cursor) {
+        params = params.set('cursor', filters.cursor);
+      }
     }
 
     return this.http.get<Booking[]>(`${this.baseUrl}/my`, { params })
@@ -53,6 +67,9 @@ export class BookingService {
       if (filters.limit !== undefined) {
         params = params.set('limit', filters.limit.toString());
       }
+      if (filters.cursor) {
+        params = params.set('cursor', filters.cursor);
+      }
     }
 
     return this.http.get<Booking[]>(this.baseUrl, { params })
@@ -75,6 +92,30 @@ export class BookingService {
       .pipe(catchError(this.handleError));
   }
 
+  /**
+   * Join the waitlist of a full slot; the entry is booked when a spot frees up
+   */
+  joinWaitlist(entry: WaitlistJoin): Observable<WaitlistEntry> {
+    return this.http.post<WaitlistEntry>(this.waitlistUrl, entry)
+      .pipe(catchError(this.handleError));
+  }
+
+  /**
+   * Get current user's waitlist entries with their queue positions
+   */
+  getMyWaitlist(): Observable<WaitlistEntry[]> {
+    return this.http.get<WaitlistEntry[]>(`${this.waitlistUrl}/my`)
+      .pipe(catchError(this.handleError));
+  }
+
+  /**
+   * Leave a waitlist
+   */
+  leaveWaitlist(id: string): Observable<void> {
+    return this.http.delete<void>(`${this.waitlistUrl}/${id}`)
+      .pipe(catchError(this.handleError));
+  }
+
   /**
    * Get active bookings for current user
    */
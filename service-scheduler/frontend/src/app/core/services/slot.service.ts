@@ -1,8 +1,11 @@
 import { Injectable } from '@angular/core';
 import { HttpClient, HttpParams, HttpErrorResponse } from '@angular/common/http';
 import { Observable, throwError } from 'rxjs';
-import { catchError } from 'rxjs/operators';
-import { Slot, SlotCreate, SlotUpdate, SlotFilters } from '../models';
+import { catchError, map } from 'rxjs/operators';
+import {
+  Slot, SlotCreate, SlotSeriesCreate, SlotUpdate, SlotFilters, SlotPage, SlotEvent, SlotCalendarQuery, SlotCalendarBucket,
+  StreamToken
+} from '../models';
 import { environment } from '../../../environments/environment';
 
 @Injectable({
@@ -17,6 +20,50 @@ export class SlotService {
    * Get all slots with optional filters
    */
   getSlots(filters?: SlotFilters): Observable<Slot[]> {
+    return this.http.get<Slot[]>(this.baseUrl, { params: this.buildParams(filters) })
+      .pipe(catchError(this.handleError));
+  }
+
+  /**
+   * Get one page of slots together with the cursor for the next page
+   */
+  getSlotsPage(filters?: SlotFilters): Observable<SlotPage> {
+    return this.http.get<Slot[]>(this.baseUrl, { params: this.buildParams(filters), observe: 'response' })
+      .pipe(
+        map(response => ({
+          items: response.body ?? [],
+          nextCursor: response.headers.get('X-Next-Cursor')
+        })),
+        catchError(this.handleError)
+      );
+  }
+
+  /**
+   * Get per-day or per-hour occupancy for a date range, aggregated on the server
+   */
+  getCalendar(query: SlotCalendarQuery): Observable<SlotCalendarBucket[]> {
+    let params = new HttpParams()
+      .set('start_date', query.start_date)
+      .set('end_date', query.end_date);
+
+    if (query.granularity) {
+      params = params.set('granularity', query.granularity);
+    }
+    if (query.timezone) {
+      params = params.set('timezone', query.timezone);
+    }
+    if (query.created_by) {
+      params = params.set('created_by', query.created_by);
+    }
+
+    return this.http.get<SlotCalendarBucket[]>(`${this.baseUrl}/calendar`, { params })
+      .pipe(catchError(this.handleError));
+  }
+
+  /**
+   * Build query params from slot filters
+   */
+  private buildParams(filters?: SlotFilters): HttpParams {
     let params = new HttpParams();
     
     if (filters) {
@@ -35,10 +82,15 @@ export class SlotService {
       if (filters.end_date) {
         params = params.set('end_date', filters.end_date);
       }
+      if (filters.cursor) {
+        params = params.set('cursor', filters.cursor);
+      }
+      if (filters.search) {
+        params = params.set('search', filters.search);
+      }
     }
 
-    return this.http.get<Slot[]>(this.baseUrl, { params })
-      .pipe(catchError(this.handleError));
+    return params;
   }
 
   /**
@@ -56,6 +108,59 @@ export class SlotService {
       .pipe(catchError(this.handleError));
   }
 
+  /**
+   * Watch slot changes pushed by the server instead of polling.
+   * EventSource cannot send headers, so the stream is opened with a
+   * short-lived stream token in the query string rather than the access
+   * token. The browser reconnects on its own while that token is valid;
+   * once a reconnect is refused, a fresh token is fetched and the stream
+   * reopened. A 'resync' event follows any gap.
+   */
+  watchSlots(): Observable<SlotEvent> {
+    return new Observable<SlotEvent>(subscriber => {
+      let source: EventSource | null = null;
+      let closed = false;
+      // Changes made while the browser was reconnecting were not delivered
+      let reconnecting = false;
+
+      const open = () => {
+        this.http.post<StreamToken>(`${this.baseUrl}/events/token`, {}).subscribe({
+          next: ({ token }) => {
+            if (closed) {
+              return;
+            }
+            source = new EventSource(`${this.baseUrl}/events?token=${encodeURIComponent(token)}`);
+            source.addEventListener('slot', event => {
+              subscriber.next(JSON.parse((event as MessageEvent).data));
+            });
+            source.addEventListener('resync', () => subscriber.next({ op: 'resync' }));
+            source.onerror = () => {
+              reconnecting = true;
+              if (source?.readyState === EventSource.CLOSED) {
+                // The stream token expired; get a new one
+                source.close();
+                setTimeout(open, 3000);
+              }
+            };
+            source.onopen = () => {
+              if (reconnecting) {
+                reconnecting = false;
+                subscriber.next({ op: 'resync' });
+              }
+            };
+          },
+          error: error => subscriber.error(error)
+        });
+      };
+
+      open();
+      return () => {
+        closed = true;
+        source?.close();
+      };
+    });
+  }
+
   /**
    * Create new slot (Admin only)
    */
@@ -64,6 +169,14 @@ export class SlotService {
       .pipe(catchError(this.handleError));
   }
 
+  /**
+   * Create a recurring series of slots (Admin only)
+   */
+  createSlotSeries(seriesData: SlotSeriesCreate): Observable<Slot[]> {
+    return this.http.post<Slot[]>(`${this.baseUrl}/series`, seriesData)
+      .pipe(catchError(this.handleError));
+  }
+
   /**
    * Update slot (Admin only)
    */
@@ -1,10 +1,13 @@
 -- Initialize database with extensions and basic setup
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "pgcrypto";
+CREATE EXTENSION IF NOT EXISTS "btree_gist";
 
 -- Create enum types
 CREATE TYPE user_role AS ENUM ('admin', 'user');
 CREATE TYPE booking_status AS ENUM ('active', 'cancelled');
+CREATE TYPE waitlist_status AS ENUM ('waiting', 'promoted', 'cancelled');
+CREATE TYPE revocation_reason AS ENUM ('rotated', 'logged_out', 'reuse_detected');
 
 -- Users table
 CREATE TABLE users (
@@ -32,8 +35,17 @@ CREATE TABLE slots (
     created_by UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    -- Full-text search document: stemmed title (A) and description (B), plus
+    -- unstemmed words for prefix (type-ahead) matching
+    search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B') ||
+        to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))
+    ) STORED,
     CONSTRAINT valid_time_range CHECK (end_time > start_time),
-    CONSTRAINT valid_participants CHECK (current_participants <= max_participants)
+    CONSTRAINT valid_participants CHECK (current_participants <= max_participants),
+    -- No two slots of one creator overlap; the index also serves overlap checks
+    CONSTRAINT no_overlapping_creator_slots EXCLUDE USING gist (created_by WITH =, tstzrange(start_time, end_time) WITH &&)
 );
 
 -- Bookings table
@@ -48,6 +60,29 @@ CREATE TABLE bookings (
     UNIQUE(slot_id, user_id) -- Prevent duplicate bookings
 );
 
+-- Refresh tokens, stored as SHA-256 digests; rotated on every use
+CREATE TABLE refresh_tokens (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    token_hash VARCHAR(64) UNIQUE NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    revoked_at TIMESTAMP WITH TIME ZONE,
+    revoked_reason revocation_reason
+);
+
+-- Waitlist for full slots; entries are promoted to bookings in FIFO order
+CREATE TABLE waitlist_entries (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    slot_id UUID NOT NULL REFERENCES slots(id) ON DELETE CASCADE,
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    status waitlist_status DEFAULT 'waiting' NOT NULL,
+    notes TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    promoted_at TIMESTAMP WITH TIME ZONE,
+    booking_id UUID REFERENCES bookings(id) ON DELETE SET NULL
+);
+
 -- Create indexes for better performance
 CREATE INDEX idx_users_email ON users(email);
 CREATE INDEX idx_users_role ON users(role);
@@ -57,6 +92,20 @@ CREATE INDEX idx_slots_created_by ON slots(created_by);
 CREATE INDEX idx_bookings_slot_id ON bookings(slot_id);
 CREATE INDEX idx_bookings_user_id ON bookings(user_id);
 CREATE INDEX idx_bookings_status ON bookings(status);
+CREATE INDEX idx_refresh_tokens_user_id ON refresh_tokens(user_id);
+CREATE INDEX ix_waitlist_entries_user_id ON waitlist_entries(user_id);
+
+-- Composite indexes backing keyset (cursor) pagination
+CREATE INDEX idx_slots_start_time_id ON slots(start_time, id);
+CREATE INDEX idx_bookings_booked_at_id ON bookings(booked_at, id);
+CREATE INDEX idx_bookings_user_booked_at_id ON bookings(user_id, booked_at, id);
+
+-- Full-text search over slot titles and descriptions
+CREATE INDEX idx_slots_search_vector ON slots USING gin (search_vector);
+
+-- Waiting entries only: one per user and slot, and queue order per slot
+CREATE UNIQUE INDEX unique_waiting_slot_user ON waitlist_entries(slot_id, user_id) WHERE status = 'waiting';
+CREATE INDEX idx_waitlist_waiting_slot_created ON waitlist_entries(slot_id, created_at, id) WHERE status = 'waiting';
 
 -- Create updated_at trigger function
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -78,17 +127,20 @@ CREATE TRIGGER update_slots_updated_at BEFORE UPDATE ON slots
 CREATE OR REPLACE FUNCTION update_slot_participants()
 RETURNS TRIGGER AS $$
 BEGIN
+    -- The API updates counters in the same statement that claims or releases
+    -- a booking and flags its connections, so only count writes from other
+    -- clients (e.g. Hasura) here. is_available is left alone: it is the
+    -- admin's open/closed flag, and fullness is current vs max participants.
+    IF current_setting('scheduler.app_managed_counts', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
     IF TG_OP = 'INSERT' THEN
         -- Increase participant count
         UPDATE slots 
         SET current_participants = current_participants + 1
         WHERE id = NEW.slot_id;
         
-        -- Mark slot as unavailable if at capacity
-        UPDATE slots 
-        SET is_available = false
-        WHERE id = NEW.slot_id AND current_participants >= max_participants;
-        
         RETURN NEW;
     ELSIF TG_OP = 'DELETE' THEN
         -- Decrease participant count
@@ -96,11 +148,6 @@ BEGIN
         SET current_participants = current_participants - 1
         WHERE id = OLD.slot_id;
         
-        -- Mark slot as available if under capacity
-        UPDATE slots 
-        SET is_available = true
-        WHERE id = OLD.slot_id AND current_participants < max_participants;
-        
         RETURN OLD;
     END IF;
     RETURN NULL;
@@ -112,6 +159,77 @@ CREATE TRIGGER update_slot_participants_trigger
     AFTER INSERT OR DELETE ON bookings
     FOR EACH ROW EXECUTE FUNCTION update_slot_participants();
 
+-- Publish slot changes (bookings, edits, deletions) to the API's live event
+-- stream; delivered to LISTENers when the writing transaction commits
+CREATE OR REPLACE FUNCTION notify_slot_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed RECORD;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := OLD;
+    ELSE
+        changed := NEW;
+    END IF;
+
+    PERFORM pg_notify('slot_changes', json_build_object(
+        'op', lower(TG_OP),
+        'id', changed.id,
+        'is_available', changed.is_available,
+        'current_participants', changed.current_participants,
+        'max_participants', changed.max_participants
+    )::text);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER notify_slot_change_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON slots
+    FOR EACH ROW EXECUTE FUNCTION notify_slot_change();
+
+-- Publish the ids of changed users so every API process drops them from its
+-- user cache (app/auth/user_cache.py), whoever made the change
+CREATE OR REPLACE FUNCTION notify_user_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('user_changes', OLD.id::text);
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER notify_user_change_trigger
+    AFTER UPDATE OR DELETE ON users
+    FOR EACH ROW EXECUTE FUNCTION notify_user_change();
+
+-- Per-creator, per-day utilization for the admin stats endpoint. Days are UTC;
+-- the API refreshes it concurrently on a schedule (UTILIZATION_REFRESH_SECONDS)
+CREATE MATERIALIZED VIEW slot_utilization_daily AS
+SELECT
+    s.created_by,
+    (s.start_time AT TIME ZONE 'UTC')::date AS day,
+    count(*) AS slots_offered,
+    sum(s.max_participants) AS spots_offered,
+    sum(s.current_participants) AS spots_filled,
+    count(*) FILTER (
+        WHERE NOT s.is_available OR s.current_participants >= s.max_participants
+    ) AS unavailable_slots,
+    coalesce(sum(b.bookings), 0) AS bookings,
+    coalesce(sum(b.cancellations), 0) AS cancellations
+FROM slots s
+LEFT JOIN (
+    SELECT
+        slot_id,
+        count(*) AS bookings,
+        count(*) FILTER (WHERE lower(status::text) = 'cancelled') AS cancellations
+    FROM bookings
+    GROUP BY slot_id
+) b ON b.slot_id = s.id
+GROUP BY s.created_by, (s.start_time AT TIME ZONE 'UTC')::date;
+
+-- The unique index is what allows REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX idx_slot_utilization_daily_creator_day ON slot_utilization_daily (created_by, day);
+CREATE INDEX idx_slot_utilization_daily_day ON slot_utilization_daily (day);
+
 -- Insert default admin user
 INSERT INTO users (email, password_hash, first_name, last_name, role) VALUES 
 ('admin@example.com', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/lewdBpwkXhMvjNJdG', 'Admin', 'User', 'admin');